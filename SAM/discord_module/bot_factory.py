@@ -2,6 +2,11 @@ import discord
 from discord.ext import commands
 from discord_module.config import get_config
 from discord_module.events import register_events
+from discord_module.message_filters import COMMAND_PREFIXES
+from discord_module.utilities.attachments.discord_attachments_manager import close_attachment_session
+from discord_module.utilities.attachments.image_processing import shutdown_image_pool
+from llm_module.ollama_client import close_ollama_clients
+from message_logs.log_message import close_interaction_log
 
 
 # set discord_functions intents
@@ -18,15 +23,18 @@ class MyBot(commands.Bot):
         # Load cogs here
         cogs = [
             "discord_module.discord_functions.cogs.bot_commands",
+            "discord_module.discord_functions.cogs.slash_commands.access",
             "discord_module.discord_functions.cogs.slash_commands.analyze",
             "discord_module.discord_functions.cogs.slash_commands.cache",
             "discord_module.discord_functions.cogs.slash_commands.delete",
             "discord_module.discord_functions.cogs.slash_commands.help",
+            "discord_module.discord_functions.cogs.slash_commands.memory",
             "discord_module.discord_functions.cogs.slash_commands.neuralize",
             "discord_module.discord_functions.cogs.slash_commands.parrot",
             "discord_module.discord_functions.cogs.slash_commands.search",
             "discord_module.discord_functions.cogs.slash_commands.status",
             "discord_module.discord_functions.cogs.slash_commands.tts",
+            "discord_module.discord_functions.cogs.slash_commands.vision_cache",
             "discord_module.discord_functions.cogs.slash_commands.weather"
         ]
         for cog in cogs:
@@ -40,10 +48,18 @@ class MyBot(commands.Bot):
         # Global (takes time to propagate)
         await self.tree.sync()
 
+    async def close(self):
+        # release pooled connections before the loop goes away
+        await close_ollama_clients()
+        await close_attachment_session()
+        shutdown_image_pool()
+        await close_interaction_log()
+        await super().close()
+
 
 def create_bot():
     bot = MyBot(
-        command_prefix=["$s "],
+        command_prefix=COMMAND_PREFIXES,
         intents=intents,
         status=discord.Status.online
     )
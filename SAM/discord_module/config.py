@@ -18,6 +18,11 @@ config_dict = {
         "DM_CHANNEL_ID": os.getenv("DM_CHANNEL_ID"),
     },
     "MASTER_USER_ID": os.getenv("MASTER_USER_ID"),
+    "DISPATCH": {
+        # how many messages may be routed at once across all channels,
+        # generation itself is capped by the LLM scheduler
+        "MAX_CONCURRENT_MESSAGES": int(os.getenv("MAX_CONCURRENT_MESSAGES", 8)),
+    },
 }
 
 CONFIG = namespace(config_dict)
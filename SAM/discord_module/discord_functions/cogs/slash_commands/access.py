@@ -0,0 +1,43 @@
+import os
+from dotenv import load_dotenv
+
+from discord import app_commands
+from discord.ext import commands
+
+from discord_module.utilities.access_control import get_access_control
+from utility_scripts.namespace_utility import namespace
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# Load Env
+load_dotenv()
+
+config_dict = {
+    "MASTER_USER_ID": os.getenv("MASTER_USER_ID"),
+}
+CONFIG = namespace(config_dict)
+
+
+class Access(commands.Cog):
+    def __init__(self, client):
+        self.client = client
+
+    @app_commands.command(name="reload_access", description="Reloads the channel and bot access lists")
+    async def ReloadAccess(self, interaction):
+        logger.debug(f'Command issued: reload_access by {interaction.user}')
+
+        if interaction.user.id != int(CONFIG.MASTER_USER_ID):
+            msg = await interaction.response.send_message("This is an Admin only command.",
+                                                          delete_after=6)
+            return
+
+        counts = get_access_control().reload()
+        summary = "\n".join(f"{name}: {count}" for name, count in counts.items())
+
+        await interaction.response.send_message(f"Access lists reloaded\n```\n{summary}\n```", ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Access(bot))
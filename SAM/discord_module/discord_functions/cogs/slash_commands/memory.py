@@ -0,0 +1,57 @@
+import os
+from dotenv import load_dotenv
+
+from discord import app_commands
+from discord.ext import commands
+
+from memory_module.message_history import get_channel_cache_stats
+from utility_scripts.namespace_utility import namespace
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# Load Env
+load_dotenv()
+
+config_dict = {
+    "MASTER_USER_ID": os.getenv("MASTER_USER_ID"),
+}
+CONFIG = namespace(config_dict)
+
+
+def format_cache_stats(stats: dict) -> str:
+    return (
+        "```\n"
+        f"Channels:   {stats['channels']} / {stats['max_channels']}\n"
+        f"Resident:   {stats['resident_bytes'] / 1024:.1f} KiB / {stats['max_bytes'] / 1024 / 1024:.0f} MiB\n"
+        f"Hits:       {stats['hits']}\n"
+        f"Misses:     {stats['misses']}\n"
+        f"Hit Rate:   {stats['hit_rate']:.1%}\n"
+        f"Evictions:  {stats['evictions']}\n"
+        f"Expired:    {stats['expirations']}\n"
+        "```"
+    )
+
+
+class Memory(commands.Cog):
+    def __init__(self, client):
+        self.client = client
+
+    @app_commands.command(name="memory", description="Shows conversation cache stats")
+    async def Memory(self, interaction):
+        logger.debug(f'Command issued: memory by {interaction.user}')
+
+        if interaction.user.id != int(CONFIG.MASTER_USER_ID):
+            msg = await interaction.response.send_message("This is an Admin only command.",
+                                                          delete_after=6)
+            return
+
+        stats = get_channel_cache_stats()
+        logger.info(f"Channel cache stats: {stats}")
+
+        await interaction.response.send_message(format_cache_stats(stats), ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Memory(bot))
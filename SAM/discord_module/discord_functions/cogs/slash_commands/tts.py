@@ -1,18 +1,15 @@
-import os
 import random
 
-import discord
 from discord import app_commands
 from discord.ext import commands
 
-from llm_module.tools.text_to_speech.elevenlabs_voice import text_to_speech
+from llm_module.tools.text_to_speech.tts_message_helpers import audio_file
+from llm_module.tools.text_to_speech.tts_service import text_to_speech
 from utility_scripts.system_logging import setup_logger
 
 # configure logging
 logger = setup_logger(__name__)
 
-# todo -- split message down by sentence by sentence, generate by sentence then stitch them back together
-
 
 class TTS(commands.Cog):
     def __init__(self, client):
@@ -58,8 +55,8 @@ class TTS(commands.Cog):
 
         selected_voice = voice.value if voice else "default"
 
-        tts_file = await text_to_speech(text, file_name=text, voice=selected_voice)
-        if not tts_file:
+        tts_audio = await text_to_speech(text, file_name=text, voice=selected_voice)
+        if not tts_audio:
             logger.error('TTS Error')
 
             # 🎲 Easter Egg: 1 in 100 chance to drop gag
@@ -70,8 +67,7 @@ class TTS(commands.Cog):
                 await interaction.followup.send('Error making TTS. Probably out of cash.')
             return
 
-        await interaction.followup.send(file=discord.File(tts_file))
-        os.remove(tts_file)
+        await interaction.followup.send(file=audio_file(tts_audio))
 
 
 async def setup(bot: commands.Bot):
@@ -0,0 +1,47 @@
+import os
+from dotenv import load_dotenv
+
+from discord import app_commands
+from discord.ext import commands
+
+from llm_module.generators.vision.vision_result_cache import get_vision_result_cache
+from utility_scripts.namespace_utility import namespace
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# Load Env
+load_dotenv()
+
+config_dict = {
+    "MASTER_USER_ID": os.getenv("MASTER_USER_ID"),
+}
+CONFIG = namespace(config_dict)
+
+
+class VisionCache(commands.Cog):
+    def __init__(self, client):
+        self.client = client
+
+    @app_commands.command(name="purge_vision_cache", description="Clears cached image descriptions")
+    async def PurgeVisionCache(self, interaction):
+        logger.debug(f'Command issued: purge_vision_cache by {interaction.user}')
+
+        if interaction.user.id != int(CONFIG.MASTER_USER_ID):
+            msg = await interaction.response.send_message("This is an Admin only command.",
+                                                          delete_after=6)
+            return
+
+        cache = get_vision_result_cache()
+        hits, misses = cache.hits, cache.misses
+        purged = cache.purge()
+
+        await interaction.response.send_message(
+            f"Purged {purged} cached vision results (hits: {hits}, misses: {misses})",
+            ephemeral=True
+        )
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(VisionCache(bot))
@@ -1,5 +1,4 @@
-import asyncio
-
+from discord_module.message_dispatcher import dispatch_message
 from discord_module.message_router import route_message
 
 from utility_scripts.system_logging import setup_logger
@@ -9,10 +8,6 @@ from utility_scripts.system_logging import setup_logger
 logger = setup_logger(__name__)
 
 
-# Create a lock
-lock = asyncio.Lock()
-
-
 def register_events(bot):
     @bot.event
     async def on_ready():
@@ -28,5 +23,5 @@ def register_events(bot):
 
     @bot.event
     async def on_message(message):
-        async with lock:
-            await route_message(bot, message)
+        # serialized per channel, different channels run in parallel
+        await dispatch_message(route_message, bot, message)
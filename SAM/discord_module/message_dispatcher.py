@@ -0,0 +1,69 @@
+import asyncio
+
+from discord_module.config import get_config
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+CONFIG = get_config()
+
+
+class ChannelDispatcher:
+    """
+    Runs message handlers one at a time per channel, while letting
+    different channels (and DMs) run in parallel.
+
+    A global semaphore caps how many handlers run at once across every
+    channel so a burst of active channels can't overload the backend.
+    """
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max(1, max_concurrent)
+        self._semaphore = None
+
+        # channel_id -> [lock, number of handlers holding or waiting on it]
+        self._channel_locks = {}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    def _acquire_entry(self, channel_id):
+        entry = self._channel_locks.get(channel_id)
+        if entry is None:
+            entry = [asyncio.Lock(), 0]
+            self._channel_locks[channel_id] = entry
+        entry[1] += 1
+        return entry
+
+    def _release_entry(self, channel_id, entry):
+        entry[1] -= 1
+        # drop idle channels so the lock table doesn't grow forever
+        if entry[1] == 0 and self._channel_locks.get(channel_id) is entry:
+            del self._channel_locks[channel_id]
+
+    def active_channels(self) -> int:
+        return len(self._channel_locks)
+
+    async def dispatch(self, channel_id, handler, *args):
+        """
+        Await handler(*args) once every earlier handler for the same
+        channel has finished and a global slot is free.
+        """
+        entry = self._acquire_entry(channel_id)
+        try:
+            async with entry[0]:
+                async with self._get_semaphore():
+                    return await handler(*args)
+        finally:
+            self._release_entry(channel_id, entry)
+
+
+dispatcher = ChannelDispatcher(CONFIG.DISPATCH.MAX_CONCURRENT_MESSAGES)
+
+
+async def dispatch_message(handler, bot, message):
+    await dispatcher.dispatch(message.channel.id, handler, bot, message)
@@ -1,44 +1,54 @@
-import os
+import re
 import discord
 
-from utility_scripts.namespace_utility import namespace
+from discord_module.utilities.access_control import access_control
+from discord_module.utilities.message_references import get_referenced, known_referenced
 from utility_scripts.system_logging import setup_logger
-from dotenv import load_dotenv
 
 # configure logging
 logger = setup_logger(__name__)
 
 
-# Load Env
-load_dotenv()
+COMMAND_PREFIXES = ["$s "]
 
-config_dict = {
-    "THREADS_ALLOW": {
-        "GMCD_CHANNEL_ID": os.getenv("GMCD_CHANNEL_ID"),
-        "TEST_CHANNEL_ID": os.getenv("TEST_CHANNEL_ID")
-    },
-    "BOTS": {
-        "SCUNGEONMASTER": os.getenv("BOT_ID_SCUNGE"),
-        "FOOTNOTE": os.getenv("BOT_ID_FOOTNOTE")
-    }
-}
-CONFIG = namespace(config_dict)
-bots_blacklist = [int(b) for b in CONFIG.BOTS.__dict__.values()]
-channels_whitelist = [int(t) for t in CONFIG.THREADS_ALLOW.__dict__.values()]
+
+def is_keyword_trigger(message_content: str) -> bool:
+    if re.search(r"\bsam[\s,.?!]", message_content, re.IGNORECASE):
+        return True
+    if message_content.lower().endswith("sam"):
+        return True
+    return False
 
 
 async def should_ignore_message(client, message):
+    """
+    Tiered so most messages never cost an API call:
+    1. in-memory checks on the message itself
+    2. messages that can't lead to a reply or command are dropped
+    3. only then checks that may need to fetch from Discord
+    """
+    if ignored_by_rules(client, message):
+        return True
+
+    if not could_trigger(client, message):
+        return True
+
+    if await message_is_slash_reply(message):
+        return True
+
+    return False
+
+
+def ignored_by_rules(client, message) -> bool:
     if message.guild is not None:
-        if message.channel.id not in channels_whitelist:
+        if message.channel.id not in access_control.channels_whitelist:
             return True
 
     if message.content == "" and len(message.embeds) == 0:
         # ignores empty messages
         return True
 
-    if await message_is_slash_reply(message):
-        return True
-    if message.author.id in bots_blacklist:
+    if message.author.id in access_control.bots_blacklist:
         return True
     if message.type == discord.MessageType.chat_input_command:
         # slash command messages
@@ -51,22 +61,34 @@ async def should_ignore_message(client, message):
     return False
 
 
+def is_known_reply_to_bot(client, message) -> bool:
+    # only what Discord sent along or the cache already has, never a fetch
+    known, referenced = known_referenced(message)
+    return known and referenced is not None and referenced.author == client.user
+
+
+def could_trigger(client, message) -> bool:
+    # DM, mention, reply to the bot, keyword or command -- everything the router acts on
+    if isinstance(message.channel, discord.DMChannel):
+        return True
+    if is_known_reply_to_bot(client, message):
+        return True
+    if client.user.mentioned_in(message):
+        return True
+    if any(message.content.startswith(prefix) for prefix in COMMAND_PREFIXES):
+        return True
+
+    return is_keyword_trigger(message.clean_content)
+
+
 async def message_is_slash_reply(message):
     if message.type == discord.MessageType.reply and message.reference:
-        try:
-            referenced = await message.channel.fetch_message(message.reference.message_id)
-        except discord.NotFound:
-            referenced = None  # message was deleted
-        except discord.Forbidden:
-            referenced = None  # missing permissions
-        except discord.HTTPException:
-            referenced = None  # network or other fetch error
-
-        if referenced is None:
-            return False
-
-        if referenced.interaction_metadata is not None:
-            # This message is a reply to a slash command response
-            return True
+        referenced = await get_referenced(message)
+        return is_slash_command_response(referenced)
 
     return False
+
+
+def is_slash_command_response(referenced) -> bool:
+    # This message is a reply to a slash command response
+    return referenced is not None and referenced.interaction_metadata is not None
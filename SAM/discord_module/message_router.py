@@ -1,25 +1,17 @@
-import re
 import discord
 
 
-from discord_module.message_filters import should_ignore_message
-from llm_module.llm_pipeline import llm_chat
-
-COMMAND_PREFIXES = ["$s "]
-
-
-def is_keyword_trigger(message_content: str) -> bool:
-    if re.search(r"\bsam[\s,.?!]", message_content, re.IGNORECASE):
-        return True
-    if message_content.lower().endswith("sam"):
-        return True
-    return False
+from discord_module.message_filters import COMMAND_PREFIXES, is_keyword_trigger, should_ignore_message
+from discord_module.utilities.message_references import get_referenced, known_referenced
+from llm_module.llm_pipeline import schedule_llm_chat
+from llm_module.llm_scheduler import PRIORITY_DIRECT, PRIORITY_KEYWORD
 
 
 async def route_message(bot, message):
     """
     Central message routing logic.
-    Determines whether a message should be handled by the LLM layer.
+    Determines whether a message should be handled by the LLM layer,
+    and at which priority it gets queued.
     """
 
     # ---------------------------------
@@ -52,7 +44,7 @@ async def route_message(bot, message):
     # Direct Message
     # ---------------------------------
     if isinstance(message.channel, discord.DMChannel):
-        await llm_chat(bot, message)
+        await schedule_llm_chat(bot, message, PRIORITY_DIRECT)
         return
 
     # ---------------------------------
@@ -60,28 +52,23 @@ async def route_message(bot, message):
     # ---------------------------------
     # todo -- Supply copy of referenced message to keep context
     if message.reference and message.type != discord.MessageType.thread_created:
-        try:
-            # Use resolved message if already provided
-            referenced = message.reference.resolved
-
-            # Fallback to API fetch if not cached
-            if referenced is None:
-                referenced = await message.channel.fetch_message(
-                    message.reference.message_id
-                )
-
-            if referenced and referenced.author == bot.user:
-                await llm_chat(bot, message)
-                return
+        # shared with the ignore check, so this is normally a cache hit
+        referenced = await get_referenced(message)
 
-        except discord.NotFound:
+        if referenced is None:
+            # replies to a deleted message are ignored, even with a mention or keyword
+            known, _ = known_referenced(message)
+            if known:
+                return
+        elif referenced.author == bot.user:
+            await schedule_llm_chat(bot, message, PRIORITY_DIRECT)
             return
 
     # ---------------------------------
     # Bot mention
     # ---------------------------------
     if bot.user.mentioned_in(message):
-        await llm_chat(bot, message)
+        await schedule_llm_chat(bot, message, PRIORITY_DIRECT)
         return
 
     # ---------------------------------
@@ -90,5 +77,5 @@ async def route_message(bot, message):
     message_content = message.clean_content
 
     if is_keyword_trigger(message_content):
-        await llm_chat(bot, message)
+        await schedule_llm_chat(bot, message, PRIORITY_KEYWORD)
 
@@ -0,0 +1,51 @@
+from discord_module.utilities import access_control as access_control_module
+from discord_module.utilities.access_control import AccessControl
+
+
+def test_reload_swaps_in_frozensets_and_skips_unset(monkeypatch):
+    monkeypatch.setattr(access_control_module, "dotenv_values", lambda: {})
+    monkeypatch.setattr(access_control_module, "ACCESS_LISTS", {
+        "channels_whitelist": ["TEST_ALLOW_A", "TEST_ALLOW_B"],
+        "bots_blacklist": ["TEST_DENY"],
+        "attachment_bots_blacklist": [],
+    })
+    monkeypatch.setenv("TEST_ALLOW_A", "1")
+    monkeypatch.delenv("TEST_ALLOW_B", raising=False)
+    monkeypatch.setenv("TEST_DENY", "not an id")
+
+    access = AccessControl()
+    counts = access.reload()
+
+    assert access.channels_whitelist == frozenset({1})
+    assert access.bots_blacklist == frozenset()
+    assert counts == {"channels_whitelist": 1, "bots_blacklist": 0, "attachment_bots_blacklist": 0}
+
+    monkeypatch.setenv("TEST_ALLOW_B", "2")
+    access.reload()
+
+    assert access.channels_whitelist == frozenset({1, 2})
+
+
+def test_reload_reads_dotenv_without_overriding_the_environment(monkeypatch):
+    dotenv = {"TEST_ALLOW_A": "1", "TEST_ALLOW_B": "2"}
+    monkeypatch.setattr(access_control_module, "dotenv_values", lambda: dict(dotenv))
+    monkeypatch.setattr(access_control_module, "STARTUP_DOTENV", {"TEST_ALLOW_A": "1"})
+    monkeypatch.setattr(access_control_module, "ACCESS_LISTS", {
+        "channels_whitelist": ["TEST_ALLOW_A", "TEST_ALLOW_B"],
+        "bots_blacklist": [],
+        "attachment_bots_blacklist": [],
+    })
+    # A came from .env at startup, B is set in the real environment
+    monkeypatch.setenv("TEST_ALLOW_A", "1")
+    monkeypatch.setenv("TEST_ALLOW_B", "20")
+
+    access = AccessControl()
+    access.reload()
+    assert access.channels_whitelist == frozenset({1, 20})
+
+    # an edited .env is picked up for A, the real environment still wins for B
+    dotenv.update({"TEST_ALLOW_A": "10", "TEST_ALLOW_B": "3"})
+    access.reload()
+
+    assert access.channels_whitelist == frozenset({10, 20})
+    assert access_control_module.os.environ["TEST_ALLOW_A"] == "1"
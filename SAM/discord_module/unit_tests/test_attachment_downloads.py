@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from aiohttp import web
+
+from discord_module.utilities.attachments import attachment_cache
+from discord_module.utilities.attachments import discord_attachments_manager as manager
+from utility_scripts.disk_lru_cache import DiskLRUCache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch, tmp_path):
+    cache = DiskLRUCache(tmp_path / "attachments", 1024 * 1024)
+    monkeypatch.setattr(attachment_cache, "attachment_cache", cache)
+    return cache
+
+
+def run_downloads(files: dict, attachments: list, delay=0.0, requests=None):
+    async def handler(request):
+        if requests is not None:
+            requests.append(request.match_info["name"])
+        await asyncio.sleep(delay)
+        return web.Response(body=files[request.match_info["name"]])
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/{name}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+
+        for attachment in attachments:
+            attachment["attachment_url"] = f"http://127.0.0.1:{port}/{attachment['filename']}"
+
+        try:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            gathered = await manager.download_attachments(attachments)
+            return gathered, loop.time() - started
+        finally:
+            await manager.close_attachment_session()
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def attachment(attachment_id, name, size):
+    return {"id": attachment_id, "type": "text/plain", "filename": name, "size": size}
+
+
+def filenames(gathered):
+    return sorted(data["filename"] for data in gathered.values())
+
+
+def test_attachments_download_concurrently():
+    files = {f"file{i}.txt": f"file {i}".encode() for i in range(3)}
+    gathered, elapsed = run_downloads(
+        files, [attachment(i, name, 6) for i, name in enumerate(files)], delay=0.2
+    )
+
+    assert filenames(gathered) == sorted(files)
+    assert all(data["data"] == files[data["filename"]] for data in gathered.values())
+    assert elapsed < 0.5
+
+
+def test_same_filename_is_kept_per_attachment():
+    files = {"image.txt": b"same name"}
+    gathered, _ = run_downloads(files, [attachment(1, "image.txt", 9), attachment(2, "image.txt", 9)])
+
+    assert sorted(gathered) == [1, 2]
+
+    digested = asyncio.run(manager.digest_attachments(gathered))
+    assert len(digested["text"]) == 2
+
+
+def test_per_file_limit(monkeypatch):
+    monkeypatch.setattr(manager, "MAX_ATTACHMENT_BYTES", 150)
+
+    files = {
+        "ok.txt": b"a" * 100,
+        "declared_big.txt": b"b" * 10,
+        "lied_about_size.txt": b"c" * 200,
+    }
+    gathered, _ = run_downloads(files, [
+        attachment(1, "ok.txt", 100),
+        attachment(2, "declared_big.txt", 200),
+        attachment(3, "lied_about_size.txt", 10),
+    ])
+
+    assert filenames(gathered) == ["ok.txt"]
+
+
+def test_per_message_limit(monkeypatch):
+    monkeypatch.setattr(manager, "MAX_MESSAGE_ATTACHMENT_BYTES", 250)
+
+    files = {name: b"x" * 100 for name in ("a.txt", "b.txt", "c.txt")}
+    gathered, _ = run_downloads(files, [attachment(i, name, 100) for i, name in enumerate(files)])
+
+    assert filenames(gathered) == ["a.txt", "b.txt"]
+
+
+def test_repeated_attachments_come_from_the_cache():
+    files = {"meme.txt": b"same bytes", "repost.txt": b"same bytes"}
+    requests = []
+
+    first, _ = run_downloads(files, [attachment(1, "meme.txt", 10)], requests=requests)
+    again, _ = run_downloads(files, [attachment(1, "meme.txt", 10)], requests=requests)
+    repost, _ = run_downloads(files, [attachment(2, "repost.txt", 10)], requests=requests)
+
+    # the known id skips the download, a new id with the same bytes is still fetched
+    assert requests == ["meme.txt", "repost.txt"]
+    assert first[1]["sha256"] == again[1]["sha256"] == repost[2]["sha256"]
+    assert again[1]["data"] == b"same bytes"
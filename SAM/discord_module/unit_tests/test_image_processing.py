@@ -0,0 +1,118 @@
+import asyncio
+import io
+import struct
+import time
+import zlib
+
+import pytest
+
+from PIL import Image
+
+from discord_module.utilities.attachments import image_processing
+from discord_module.utilities.attachments.image_processing import probe_image_size, process_image
+
+
+def make_image(width, height, image_format="JPEG") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def png_header(width, height) -> bytes:
+    """
+    A PNG with a header but no pixel data, enough for PIL to read its size.
+    """
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", b"") + chunk(b"IEND", b"")
+
+
+def run(data):
+    async def main():
+        try:
+            return await process_image(data, "test")
+        finally:
+            image_processing.shutdown_image_pool()
+
+    return asyncio.run(main())
+
+
+def test_small_images_pass_through_untouched():
+    data = make_image(640, 480)
+    assert run(data) is data
+
+
+def test_large_jpeg_is_resized_in_the_pool():
+    resized = run(make_image(3000, 2000))
+
+    with Image.open(io.BytesIO(resized)) as img:
+        assert img.format == "JPEG"
+        assert max(img.size) == 1024
+        assert img.size == (1024, 683)
+
+
+def test_large_png_keeps_its_format():
+    resized = run(make_image(2048, 512, "PNG"))
+    assert probe_image_size(resized) == (1024, 256)
+
+
+def test_pixel_ceiling_refuses_before_decoding(monkeypatch):
+    monkeypatch.setattr(image_processing, "MAX_IMAGE_PIXELS", 2000 * 2000)
+    assert run(make_image(3000, 2000)) is None
+
+
+def test_unreadable_data_is_dropped():
+    data = b"definitely not an image"
+    assert probe_image_size(data) is None
+    assert run(data) is None
+
+
+def test_header_over_twice_the_pil_limit_is_refused():
+    # a tiny file that claims 20000x20000, PIL refuses it while opening
+    data = png_header(20000, 20000)
+
+    with pytest.raises(image_processing.ImageRejected):
+        probe_image_size(data)
+    assert run(data) is None
+
+
+def hang(*args):
+    time.sleep(60)
+
+
+def fail(*args):
+    raise OSError("broken image data")
+
+
+def test_failed_resize_falls_back_to_the_original(monkeypatch):
+    monkeypatch.setattr(image_processing, "resize_image", fail)
+    data = make_image(2048, 512, "PNG")
+
+    assert run(data) is data
+
+    monkeypatch.setattr(image_processing, "MAX_PASSTHROUGH_BYTES", len(data) - 1)
+    assert run(data) is None
+
+
+def test_timed_out_resize_stops_its_worker(monkeypatch):
+    monkeypatch.setattr(image_processing, "resize_image", hang)
+    monkeypatch.setattr(image_processing, "IMAGE_TIMEOUT", 0.5)
+    data = make_image(2048, 512, "PNG")
+
+    async def main():
+        pool = image_processing.get_image_pool()
+        task = asyncio.create_task(process_image(data, "test"))
+        await asyncio.sleep(0.2)
+        workers = list(pool._processes.values())
+        return await task, pool, workers
+
+    result, pool, workers = asyncio.run(main())
+
+    assert result is data
+    assert image_processing._pool is not pool
+    assert workers
+    for worker in workers:
+        worker.join(timeout=5)
+        assert not worker.is_alive()
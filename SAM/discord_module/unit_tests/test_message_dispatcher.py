@@ -0,0 +1,49 @@
+import asyncio
+
+from discord_module.message_dispatcher import ChannelDispatcher
+
+
+def run_handlers(dispatcher, jobs):
+    log = []
+    running = {"now": 0, "peak": 0}
+
+    async def handler(channel_id, label):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        log.append(("start", channel_id, label))
+        await asyncio.sleep(0.01)
+        log.append(("end", channel_id, label))
+        running["now"] -= 1
+
+    async def main():
+        await asyncio.gather(*(
+            dispatcher.dispatch(channel_id, handler, channel_id, label)
+            for channel_id, label in jobs
+        ))
+
+    asyncio.run(main())
+    return log, running["peak"]
+
+
+def test_same_channel_is_serialized_in_order():
+    dispatcher = ChannelDispatcher(max_concurrent=4)
+    log, peak = run_handlers(dispatcher, [(1, "a"), (1, "b"), (1, "c")])
+
+    assert peak == 1
+    assert [entry[2] for entry in log if entry[0] == "start"] == ["a", "b", "c"]
+    assert dispatcher.active_channels() == 0
+
+
+def test_different_channels_run_in_parallel():
+    dispatcher = ChannelDispatcher(max_concurrent=4)
+    log, peak = run_handlers(dispatcher, [(1, "a"), (2, "b"), (3, "c")])
+
+    assert peak == 3
+
+
+def test_global_cap_limits_parallel_channels():
+    dispatcher = ChannelDispatcher(max_concurrent=2)
+    log, peak = run_handlers(dispatcher, [(channel, "x") for channel in range(6)])
+
+    assert peak == 2
+    assert len(log) == 12
@@ -0,0 +1,109 @@
+import asyncio
+
+from types import SimpleNamespace
+
+import discord
+
+from discord_module import message_filters
+from discord_module.message_filters import could_trigger, ignored_by_rules, should_ignore_message
+from discord_module.utilities import message_references
+from discord_module.utilities.access_control import AccessControl
+from discord_module.utilities.message_references import ReferencedMessageCache
+
+CHANNEL_ID = 10
+BLOCKED_BOT_ID = 66
+
+
+class FakeUser:
+    def __init__(self, user_id, mentioned=False):
+        self.id = user_id
+        self.mentioned = mentioned
+
+    def mentioned_in(self, message):
+        return self.mentioned
+
+
+BOT = FakeUser(1)
+HUMAN = FakeUser(2)
+OTHER_HUMAN = FakeUser(3)
+
+
+def make_message(content="hello there", author=HUMAN, reply_to=None):
+    reference = None
+    if reply_to is not None:
+        reference = SimpleNamespace(message_id=reply_to, resolved=None)
+    return SimpleNamespace(
+        content=content,
+        clean_content=content,
+        embeds=[],
+        author=author,
+        guild=object(),
+        channel=SimpleNamespace(id=CHANNEL_ID),
+        type=discord.MessageType.reply if reply_to is not None else discord.MessageType.default,
+        mention_everyone=False,
+        reference=reference,
+    )
+
+
+def setup(monkeypatch):
+    access = AccessControl()
+    access.channels_whitelist = frozenset({CHANNEL_ID})
+    access.bots_blacklist = frozenset({BLOCKED_BOT_ID})
+    monkeypatch.setattr(message_filters, "access_control", access)
+
+    cache = ReferencedMessageCache(16, 60)
+    monkeypatch.setattr(message_references, "referenced_cache", cache)
+
+    # the cheap tiers must decide without going to Discord
+    async def no_fetch(message):
+        raise AssertionError("referenced message was fetched")
+
+    monkeypatch.setattr(message_filters, "get_referenced", no_fetch)
+    return SimpleNamespace(user=BOT), cache
+
+
+def ignored(client, message) -> bool:
+    return asyncio.run(should_ignore_message(client, message))
+
+
+def test_own_messages_are_ignored_by_rules(monkeypatch):
+    client, _ = setup(monkeypatch)
+    assert ignored_by_rules(client, make_message("hey sam", author=BOT))
+
+
+def test_blocked_bots_are_ignored_by_rules(monkeypatch):
+    client, _ = setup(monkeypatch)
+    assert ignored_by_rules(client, make_message("hey sam", author=FakeUser(BLOCKED_BOT_ID)))
+
+
+def test_command_prefix_can_trigger(monkeypatch):
+    client, _ = setup(monkeypatch)
+    message = make_message("$s help")
+
+    assert could_trigger(client, message)
+    assert not ignored(client, message)
+
+
+def test_plain_message_is_dropped_before_any_lookup(monkeypatch):
+    client, _ = setup(monkeypatch)
+    message = make_message("just chatting")
+
+    assert not ignored_by_rules(client, message)
+    assert not could_trigger(client, message)
+    assert ignored(client, message)
+
+
+def test_reply_between_humans_is_dropped_without_a_fetch(monkeypatch):
+    client, cache = setup(monkeypatch)
+    cache.store(50, SimpleNamespace(author=OTHER_HUMAN))
+
+    assert ignored(client, make_message("sounds good", reply_to=50))
+    # not resolved or cached, not worth a fetch either
+    assert ignored(client, make_message("sounds good", reply_to=51))
+
+
+def test_reply_to_the_bot_can_trigger(monkeypatch):
+    client, cache = setup(monkeypatch)
+    cache.store(50, SimpleNamespace(author=BOT))
+
+    assert could_trigger(client, make_message("thanks", reply_to=50))
@@ -0,0 +1,105 @@
+import asyncio
+
+from types import SimpleNamespace
+
+import discord
+
+from discord_module.utilities import message_references
+from discord_module.utilities.message_references import ReferencedMessageCache, resolve_references
+
+
+class FakeChannel:
+    def __init__(self, messages):
+        self.messages = {m.id: m for m in messages}
+        self.fetches = []
+
+    async def fetch_message(self, message_id):
+        self.fetches.append(message_id)
+        await asyncio.sleep(0)
+        return self.messages[message_id]
+
+
+def make_message(message_id, channel, reply_to=None):
+    reference = None
+    if reply_to is not None:
+        reference = SimpleNamespace(message_id=reply_to, resolved=None)
+    return SimpleNamespace(id=message_id, channel=channel, reference=reference)
+
+
+def test_only_true_misses_are_fetched_once(monkeypatch):
+    monkeypatch.setattr(message_references, "referenced_cache", ReferencedMessageCache(16, 60))
+
+    channel = FakeChannel([])
+    old = make_message(1, channel)
+    cached = make_message(2, channel)
+    channel.messages = {1: old, 2: cached}
+
+    in_batch = make_message(10, channel)
+    history = [
+        make_message(13, channel, reply_to=10),  # reply inside the page
+        make_message(12, channel, reply_to=2),   # in the client cache
+        make_message(11, channel, reply_to=1),   # needs a fetch
+        make_message(14, channel, reply_to=1),   # same target again
+        in_batch,
+    ]
+    bot = SimpleNamespace(cached_messages=[cached])
+
+    references = asyncio.run(resolve_references(bot, history))
+
+    assert references == {10: in_batch, 2: cached, 1: old}
+    assert channel.fetches == [1]
+
+
+def test_concurrent_lookups_share_one_fetch():
+    target = SimpleNamespace(id=1)
+    channel = FakeChannel([target])
+    cache = ReferencedMessageCache(max_size=16, ttl_seconds=60)
+
+    async def main():
+        return await asyncio.gather(*(cache.fetch(channel, 1) for _ in range(5)))
+
+    assert asyncio.run(main()) == [target] * 5
+    assert channel.fetches == [1]
+
+    # later lookups are served from the cache
+    assert asyncio.run(cache.fetch(channel, 1)) is target
+    assert channel.fetches == [1]
+
+
+def test_entries_expire_and_stay_bounded():
+    cache = ReferencedMessageCache(max_size=2, ttl_seconds=0)
+    cache.store(1, "a")
+    assert cache.lookup(1) == (False, None)
+
+    cache.ttl_seconds = 60
+    for message_id in (1, 2, 3):
+        cache.store(message_id, str(message_id))
+
+    assert len(cache) == 2
+    assert cache.lookup(1) == (False, None)
+    assert cache.lookup(3) == (True, "3")
+
+
+def test_deleted_messages_are_cached_but_errors_are_not():
+    class FailingChannel:
+        def __init__(self, error):
+            self.error = error
+            self.calls = 0
+
+        async def fetch_message(self, message_id):
+            self.calls += 1
+            raise self.error
+
+    response = SimpleNamespace(status=404, reason="Not Found")
+    cache = ReferencedMessageCache(max_size=16, ttl_seconds=60)
+
+    deleted = FailingChannel(discord.NotFound(response, "Unknown Message"))
+    assert asyncio.run(cache.fetch(deleted, 1)) is None
+    assert asyncio.run(cache.fetch(deleted, 1)) is None
+    assert deleted.calls == 1
+
+    response = SimpleNamespace(status=500, reason="Server Error")
+    failing = FailingChannel(discord.HTTPException(response, "oops"))
+    assert asyncio.run(cache.fetch(failing, 2)) is None
+    assert asyncio.run(cache.fetch(failing, 2)) is None
+    assert failing.calls == 2
@@ -0,0 +1,70 @@
+import asyncio
+
+from types import SimpleNamespace
+
+import discord
+
+from discord_module import message_router
+from discord_module.utilities import message_references
+from discord_module.utilities.message_references import ReferencedMessageCache
+
+
+class FakeUser:
+    def __init__(self, user_id, mentioned=False):
+        self.id = user_id
+        self.mentioned = mentioned
+
+    def mentioned_in(self, message):
+        return self.mentioned
+
+
+async def no_commands(message):
+    pass
+
+
+def route(monkeypatch, message, bot_user):
+    scheduled = []
+
+    async def fake_schedule(bot, message, priority):
+        scheduled.append(priority)
+
+    async def never_ignore(bot, message):
+        return False
+
+    monkeypatch.setattr(message_router, "schedule_llm_chat", fake_schedule)
+    monkeypatch.setattr(message_router, "should_ignore_message", never_ignore)
+
+    bot = SimpleNamespace(user=bot_user, process_commands=no_commands)
+    asyncio.run(message_router.route_message(bot, message))
+    return scheduled
+
+
+def reply_message(reply_to):
+    return SimpleNamespace(
+        content="hey sam",
+        clean_content="hey sam",
+        embeds=[],
+        type=discord.MessageType.reply,
+        channel=SimpleNamespace(id=1),
+        reference=SimpleNamespace(message_id=reply_to, resolved=None),
+    )
+
+
+def test_reply_to_a_deleted_message_is_ignored(monkeypatch):
+    cache = ReferencedMessageCache(16, 60)
+    cache.store(99, None)
+    monkeypatch.setattr(message_references, "referenced_cache", cache)
+
+    # mentions the bot and has the keyword, still ignored like before
+    scheduled = route(monkeypatch, reply_message(99), FakeUser(7, mentioned=True))
+    assert scheduled == []
+
+
+def test_reply_to_the_bot_is_direct(monkeypatch):
+    bot_user = FakeUser(7)
+    cache = ReferencedMessageCache(16, 60)
+    cache.store(99, SimpleNamespace(author=bot_user))
+    monkeypatch.setattr(message_references, "referenced_cache", cache)
+
+    scheduled = route(monkeypatch, reply_message(99), bot_user)
+    assert scheduled == [message_router.PRIORITY_DIRECT]
@@ -0,0 +1,78 @@
+import os
+
+from dotenv import dotenv_values
+
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# list name -> env vars holding the ids in it
+ACCESS_LISTS = {
+    "channels_whitelist": ["GMCD_CHANNEL_ID", "TEST_CHANNEL_ID"],
+    "bots_blacklist": ["BOT_ID_SCUNGE", "BOT_ID_FOOTNOTE"],
+    "attachment_bots_blacklist": ["BOT_ID_FOOTNOTE", "BOT_ID_MYURI", "BOT_ID_DANNY"],
+}
+
+
+# what .env held at startup, os.environ entries still equal to it were put there by load_dotenv
+STARTUP_DOTENV = dotenv_values()
+
+
+def read_env() -> dict:
+    """
+    The current .env layered under the real environment, without touching os.environ.
+    Variables that only came from .env at startup take the file's current value.
+    """
+    values = {name: value for name, value in dotenv_values().items() if value is not None}
+    for name, value in os.environ.items():
+        if STARTUP_DOTENV.get(name) != value:
+            values[name] = value
+    return values
+
+
+def ids_from_env(names: list, env: dict) -> frozenset:
+    ids = set()
+    for name in names:
+        value = env.get(name)
+        if not value:
+            continue
+        try:
+            ids.add(int(value))
+        except ValueError:
+            logger.warning(f"Ignoring {name}, not an id: {value!r}")
+    return frozenset(ids)
+
+
+class AccessControl:
+    """
+    The channel allow list and bot deny lists as frozensets.
+
+    reload() rereads .env (real environment variables still win)
+    and swaps every list in one go,
+    so checks in flight see either the old lists or the new ones.
+    Always read the lists off the instance, never keep a copy.
+    """
+
+    def __init__(self):
+        self.channels_whitelist = frozenset()
+        self.bots_blacklist = frozenset()
+        self.attachment_bots_blacklist = frozenset()
+
+    def reload(self) -> dict:
+        env = read_env()
+
+        lists = {name: ids_from_env(env_names, env) for name, env_names in ACCESS_LISTS.items()}
+        self.__dict__.update(lists)
+
+        counts = {name: len(ids) for name, ids in lists.items()}
+        logger.info(f"Access lists loaded: {counts}")
+        return counts
+
+
+access_control = AccessControl()
+access_control.reload()
+
+
+def get_access_control() -> AccessControl:
+    return access_control
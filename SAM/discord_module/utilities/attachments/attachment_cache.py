@@ -0,0 +1,67 @@
+import asyncio
+import hashlib
+import os
+
+from pathlib import Path
+
+from utility_scripts.disk_lru_cache import DiskLRUCache
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / "attachment_cache"
+ATTACHMENT_CACHE_MAX_BYTES = int(os.getenv("ATTACHMENT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Two kinds of entries share the cache:
+#   "content:<sha256 of the downloaded bytes>" -> the processed attachment
+#   "attachment:<discord attachment id>"      -> that sha256, so a known attachment skips the download
+attachment_cache = DiskLRUCache(os.getenv("ATTACHMENT_CACHE_DIR", DEFAULT_CACHE_DIR), ATTACHMENT_CACHE_MAX_BYTES)
+
+
+def get_attachment_cache() -> DiskLRUCache:
+    return attachment_cache
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+async def _get(key: str) -> bytes | None:
+    try:
+        return await asyncio.to_thread(attachment_cache.get, key)
+    except OSError as e:
+        logger.warning(f"Attachment cache read failed: {e}")
+        return None
+
+
+async def _put(key: str, data: bytes):
+    try:
+        await asyncio.to_thread(attachment_cache.put, key, data)
+    except OSError as e:
+        logger.warning(f"Attachment cache write failed: {e}")
+
+
+async def load_attachment(attachment_id):
+    """
+    (sha256, processed bytes) for an attachment seen before, else None.
+    """
+    digest = await _get(f"attachment:{attachment_id}")
+    if digest is None:
+        return None
+
+    digest = digest.decode("ascii")
+    data = await load_content(digest)
+    if data is None:
+        return None
+
+    return digest, data
+
+
+async def load_content(digest: str) -> bytes | None:
+    return await _get(f"content:{digest}")
+
+
+async def store_attachment(attachment_id, digest: str, data: bytes):
+    await _put(f"content:{digest}", data)
+    await _put(f"attachment:{attachment_id}", digest.encode("ascii"))
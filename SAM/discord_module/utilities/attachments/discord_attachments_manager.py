@@ -1,12 +1,15 @@
+import asyncio
 import os
-import requests
 
-from pathlib import Path
-from PIL import Image
+import aiohttp
+
 from dotenv import load_dotenv
 
+from discord_module.utilities.attachments.attachment_cache import content_hash, load_attachment, load_content, store_attachment
 from discord_module.utilities.attachments.bot_user_attachment_ignore_list import ignore_bot_attachment
+from discord_module.utilities.attachments.image_processing import process_image
 from discord_module.utilities.attachments.mimetype_handler import parse_mime_type
+from llm_module.attachment_processing.text_ingestion import ingest_text
 from utility_scripts.system_logging import setup_logger
 
 # configure logging
@@ -21,12 +24,6 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.5"
 }
 
-# temp dir for attachments
-parent_dir = Path(__file__).resolve().parent
-temp_path = parent_dir / 'attachments_temp'
-temp_path.mkdir(exist_ok=True)
-
-
 def get_message_attachments(message):
     message_attachments = None
     if message.attachments:
@@ -45,123 +42,218 @@ def get_message_attachments(message):
             # Unhandled formats will give  (status code: 500) from the bot
             # currently only looks at one image if there are multiple
             message_attachments.append({
+                "id": media.id,
                 "type": content_type,
                 "filename": media.filename,
+                "size": media.size,
                 "attachment_url": media.url
             })
     return message_attachments
 
 
-# set max image size
-MAX_WIDTH = 1024
-MAX_HEIGHT = 1024
+# download limits
+MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024
+MAX_MESSAGE_ATTACHMENT_BYTES = 50 * 1024 * 1024
+MAX_CONCURRENT_DOWNLOADS = 4
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = 60
+KEEPALIVE_TIMEOUT = 30
+
+# shared so every download reuses the open connections to the CDN
+_session = None
+
+
+class AttachmentTooLarge(Exception):
+    pass
+
+
+def get_attachment_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            headers={k: v for k, v in HEADERS.items() if v is not None},
+            timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT),
+            connector=aiohttp.TCPConnector(
+                limit=MAX_CONCURRENT_DOWNLOADS,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+        )
+    return _session
+
+
+async def close_attachment_session():
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+def within_size_limits(message_attachments: list) -> list:
+    """
+    Drops attachments Discord already tells us are over the per-file
+    limit or don't fit in what is left of the per-message limit.
+    """
+    allowed = []
+    total = 0
+    for attachment in message_attachments:
+        size = attachment.get("size") or 0
+        if size > MAX_ATTACHMENT_BYTES or total + size > MAX_MESSAGE_ATTACHMENT_BYTES:
+            logger.warning(f"{attachment['filename']} || Skipped, {size} bytes is over the size limit")
+            continue
+        total += size
+        allowed.append(attachment)
+    return allowed
+
+
+async def download_attachment(session, attachment: dict, received: dict):
+    file_name = attachment["filename"]
+    media_type, media_subtype, params = parse_mime_type(attachment["type"])
+
+    attachment_data = {
+        "filename": file_name,
+        "mediatype": media_type,
+        "mediasubtype": media_subtype,
+        "params": params
+    }
+
+    # seen this exact attachment before, no download needed
+    cached = await load_attachment(attachment["id"])
+    if cached is not None:
+        logger.debug(f"{file_name} || Attachment cache hit")
+        attachment_data["sha256"], attachment_data["data"] = cached
+        return attachment_data
+
+    # kept in memory, nothing is written to disk
+    buffer = bytearray()
+
+    try:
+        async with session.get(attachment["attachment_url"]) as response:
+            response.raise_for_status()
+
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                received["bytes"] += len(chunk)
+                buffer += chunk
+
+                if len(buffer) > MAX_ATTACHMENT_BYTES or received["bytes"] > MAX_MESSAGE_ATTACHMENT_BYTES:
+                    raise AttachmentTooLarge(f"over the size limit after {len(buffer)} bytes")
 
+    except (aiohttp.ClientError, asyncio.TimeoutError, AttachmentTooLarge) as e:
+        logger.error(f"{file_name} || Download failed: {e}")
+        # a dropped file doesn't use up the rest of the message's limit
+        received["bytes"] -= len(buffer)
+        return None
 
-def download_attachments(message_attachments: list) -> dict:
+    data = bytes(buffer)
+    digest = content_hash(data)
+
+    # same bytes reposted as a new attachment, reuse the processed copy
+    processed = await load_content(digest)
+
+    if processed is None:
+        processed = data
+
+        # resize stage for images
+        if media_type == "image":
+            processed = await process_image(data, file_name)
+            if processed is None:
+                return None
+    else:
+        logger.debug(f"{file_name} || Content cache hit")
+
+    await store_attachment(attachment["id"], digest, processed)
+
+    attachment_data["sha256"] = digest
+    attachment_data["data"] = processed
+    return attachment_data
+
+
+async def download_attachments(message_attachments: list) -> dict:
+    """
+    Downloads all of a message's attachments at once over the shared session,
+    so a message takes as long as its slowest file instead of the sum.
+    """
     if not message_attachments:
         return {}
 
-    gathered_attachments = {}
+    message_attachments = within_size_limits(message_attachments)
+    session = get_attachment_session()
 
-    for attachment in message_attachments:
-        file_name = attachment["filename"]
-        media_type, media_subtype, params = parse_mime_type(attachment["type"])
-        attach_url = attachment["attachment_url"]
-
-        try:
-            with requests.get(attach_url, headers=HEADERS, stream=True) as response:
-                response.raise_for_status()
-
-                # setup temp path for attachment
-                file_path = temp_path / file_name
-
-                with file_path.open("wb") as file:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            file.write(chunk)
-
-                # Todo -- Handle DecompressionBombWarning
-                # resize stage for images
-                if media_type == "image":
-                    try:
-                        with Image.open(file_path) as img:
-                            width, height = img.size
-
-                            if width > MAX_WIDTH or height > MAX_HEIGHT:
-                                logger.info(f"Resizing {file_name}: {width}x{height}")
-                                # already handles keeping aspect ratio, resizes to fit into specified box
-                                img.thumbnail((MAX_WIDTH, MAX_HEIGHT))
-                                img.save(file_path, format=img.format)
-
-                    except Exception as e:
-                        logger.error(f"{file_name} || Image resize failed: {e}")
-
-                attachment_data = {
-                    "filepath": file_path,
-                    "mediatype": media_type,
-                    "mediasubtype": media_subtype,
-                    "params": params
-                }
-
-                gathered_attachments[str(file_name)] = attachment_data
-
-        except requests.RequestException as e:
-            logger.error(f"{file_name} || Request failed: {e}")
-            pass
+    # bytes received across the whole message
+    received = {"bytes": 0}
+
+    results = await asyncio.gather(*(
+        download_attachment(session, attachment, received) for attachment in message_attachments
+    ))
+
+    # keyed by attachment id, filenames can repeat within a message
+    gathered_attachments = {}
+    for attachment, attachment_data in zip(message_attachments, results):
+        if attachment_data is not None:
+            gathered_attachments[attachment["id"]] = attachment_data
 
     # END
     return gathered_attachments
 
 
-async def digest_attachments(message_attachments):
+# default token budget for a message's text attachments
+TEXT_ATTACHMENT_TOKENS = 4096
+# the "--- File: name ---" fence around each one
+FILE_HEADER_TOKENS = 16
+
+
+async def digest_attachments(message_attachments, question: str = "", text_token_budget: int = TEXT_ATTACHMENT_TOKENS):
+    """
+    Splits attachments into text, images and audio for the prompt.
+    text_token_budget is shared by all text files of the message,
+    the parts of a file cut down are picked to match question.
+    """
     text_data = []
     image_data = []
+    # sha256 of each image's download, in the same order
+    image_hashes = []
     audio_text = []
 
-    for filename, attachment in message_attachments.items():
-        file_path = attachment["filepath"]
+    text_files = sum(1 for a in message_attachments.values() if a["mediatype"] == "text")
+    file_token_budget = max(text_token_budget // max(text_files, 1) - FILE_HEADER_TOKENS, 0)
+
+    for attachment in message_attachments.values():
+        filename = attachment["filename"]
+        data = attachment["data"]
         media_type = attachment["mediatype"]
         media_subtype = attachment["mediasubtype"]
         params = attachment["params"]
 
-        # allowed images
+        # allowed images, handed to ollama as raw bytes
         if media_type == "image" and media_subtype in ("png", "jpg", "jpeg", "webp"):
-            image_data.append(file_path)
+            image_data.append(data)
+            image_hashes.append(attachment.get("sha256") or content_hash(data))
             continue
 
         # allowed text
         if media_type == "text":
             charset = params.get("charset", "utf-8")
 
-            text_string = f"\n\n```--- File: {filename} ---\n"
-
-            with file_path.open("r", encoding=charset, errors="replace") as f:
-                content = f.read()
+            # decoding and picking chunks of a large file is real work, keep it off the loop
+            content = await asyncio.to_thread(ingest_text, data, charset, file_token_budget, question)
+            if content is None:
+                logger.warning(f"{filename} || Looks binary, skipped")
+                continue
 
+            text_string = f"\n\n```--- File: {filename} ---\n"
             text_string += (content + "\n```")
             text_data.append(text_string)
-
-            # clean up text file
-            os.remove(file_path)
             continue
 
         # allowed audio
         # if media_type == "audio":
-         #   transcribed_text = await whisper_transcribe(file_path)
+         #   transcribed_text = await whisper_transcribe(data)
          #   audio_text.append(transcribed_text)
 
-        # fallback: anything else gets deleted
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            continue
+        # fallback: anything else is dropped
 
     return {
         "text": text_data,
         "image": image_data,
+        "image_hashes": image_hashes,
         "audio": audio_text
     }
-
-
-def cleanup_image_file(image_list):
-    for image in image_list:
-        os.remove(image)
@@ -0,0 +1,171 @@
+import asyncio
+import io
+import warnings
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PIL import Image
+
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# set max image size
+MAX_WIDTH = 1024
+MAX_HEIGHT = 1024
+
+# images over this many pixels are refused before decoding (~ 8K x 6K)
+MAX_IMAGE_PIXELS = 50_000_000
+
+IMAGE_WORKERS = 2
+IMAGE_TIMEOUT = 15
+
+# an image that can't be resized is still sent as it is up to this size
+MAX_PASSTHROUGH_BYTES = 10 * 1024 * 1024
+
+_pool = None
+
+
+class ImageRejected(Exception):
+    pass
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return _pool
+
+
+def shutdown_image_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def recycle_image_pool(pool: ProcessPoolExecutor):
+    """
+    Stops pool's workers and lets the next image start a fresh pool.
+    shutdown() alone leaves a hung decode running and holding its worker,
+    so the processes are terminated. Other resizes in flight fail and
+    fall back to their original image.
+    """
+    global _pool
+    # another resize may have replaced it already
+    if _pool is pool:
+        _pool = None
+
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def probe_image_size(data: bytes):
+    """
+    (width, height) from the image header, without decoding any pixels.
+    None when PIL can't tell what it is. Raises ImageRejected for headers
+    PIL already flags as a decompression bomb.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(io.BytesIO(data)) as img:
+                return img.size
+    except (Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+        raise ImageRejected(str(e)) from e
+    except Exception:
+        return None
+
+
+def resize_image(data: bytes, max_width: int, max_height: int, max_pixels: int) -> bytes:
+    """
+    Runs in the image pool. Shrinks an image to fit max_width x max_height,
+    keeping the format and aspect ratio.
+    """
+    with warnings.catch_warnings():
+        # a decompression bomb is an error here, never just a warning
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+        Image.MAX_IMAGE_PIXELS = max_pixels
+
+        with Image.open(io.BytesIO(data)) as img:
+            width, height = img.size
+            if width * height > max_pixels:
+                raise ImageRejected(f"{width}x{height} is over {max_pixels} pixels")
+
+            image_format = img.format
+
+            # JPEGs can decode straight at 1/2, 1/4 or 1/8 scale
+            if image_format == "JPEG":
+                img.draft("RGB", (max_width, max_height))
+
+            # already handles keeping aspect ratio, resizes to fit into specified box
+            img.thumbnail((max_width, max_height))
+
+            buffer = io.BytesIO()
+            img.save(buffer, format=image_format)
+            return buffer.getvalue()
+
+
+def passthrough(data: bytes, file_name):
+    if len(data) <= MAX_PASSTHROUGH_BYTES:
+        logger.warning(f"{file_name} || Sending the original image instead")
+        return data
+
+    logger.warning(f"{file_name} || Dropped, {len(data)} bytes is too large to send unresized")
+    return None
+
+
+async def process_image(data: bytes, file_name):
+    """
+    Returns the image ready for the vision model, or None if it is refused.
+
+    The header is probed first, small images are passed through as they are
+    and only images that need resizing are decoded, in a separate process
+    so the work never holds the event loop's GIL. If the resize fails or
+    times out the original is sent when it is small enough.
+    """
+    try:
+        size = probe_image_size(data)
+    except ImageRejected as e:
+        logger.warning(f"{file_name} || Refused, {e}")
+        return None
+
+    if size is None:
+        logger.warning(f"{file_name} || Not a readable image, dropped")
+        return None
+
+    width, height = size
+    if width <= MAX_WIDTH and height <= MAX_HEIGHT:
+        return data
+
+    if width * height > MAX_IMAGE_PIXELS:
+        logger.warning(f"{file_name} || Refused, {width}x{height} is over {MAX_IMAGE_PIXELS} pixels")
+        return None
+
+    logger.info(f"Resizing {file_name}: {width}x{height}")
+    loop = asyncio.get_running_loop()
+    pool = get_image_pool()
+
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(pool, resize_image, data, MAX_WIDTH, MAX_HEIGHT, MAX_IMAGE_PIXELS),
+            timeout=IMAGE_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        logger.error(f"{file_name} || Image resize timed out after {IMAGE_TIMEOUT}s, restarting the pool")
+        recycle_image_pool(pool)
+    except BrokenProcessPool:
+        logger.error(f"{file_name} || Image worker died, restarting the pool")
+        recycle_image_pool(pool)
+    except (ImageRejected, Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+        logger.warning(f"{file_name} || Refused, {e}")
+        return None
+    except Exception as e:
+        logger.error(f"{file_name} || Image resize failed: {e}")
+
+    return passthrough(data, file_name)
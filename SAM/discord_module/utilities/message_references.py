@@ -0,0 +1,204 @@
+import asyncio
+import time
+
+from collections import OrderedDict
+
+import discord
+
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# concurrent fetch_message calls when hydrating a batch of history
+MAX_CONCURRENT_FETCHES = 4
+
+# referenced messages kept around so the filters, the router and
+# the history all share one lookup per reply
+REFERENCE_CACHE_SIZE = 1024
+REFERENCE_CACHE_TTL = 300
+
+
+def reference_id(message):
+    if message.reference is None:
+        return None
+    return message.reference.message_id
+
+
+def _already_resolved(message):
+    """
+    (known, referenced) from what Discord sent along with the message.
+    """
+    resolved = message.reference.resolved
+    if isinstance(resolved, discord.Message):
+        return True, resolved
+    if isinstance(resolved, discord.DeletedReferencedMessage):
+        return True, None
+    return False, None
+
+
+class ReferencedMessageCache:
+    """
+    Per-process TTL cache of messages that replies point to.
+
+    - Bounded to max_size entries, least recently used go first
+    - Deleted messages are remembered as None, failed fetches are not cached
+    - Concurrent lookups of the same message share one fetch_message call
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        # message_id -> [message or None, expires at]
+        self._entries = OrderedDict()
+        # message_id -> task fetching it
+        self._in_flight = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, message_id):
+        """
+        (known, message) without going to the API.
+        """
+        entry = self._entries.get(message_id)
+        if entry is None:
+            return False, None
+
+        if entry[1] < time.monotonic():
+            del self._entries[message_id]
+            return False, None
+
+        self._entries.move_to_end(message_id)
+        return True, entry[0]
+
+    def store(self, message_id, message):
+        self._entries[message_id] = [message, time.monotonic() + self.ttl_seconds]
+        self._entries.move_to_end(message_id)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def fetch(self, channel, message_id):
+        known, message = self.lookup(message_id)
+        if known:
+            self.hits += 1
+            return message
+
+        task = self._in_flight.get(message_id)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch(channel, message_id))
+            self._in_flight[message_id] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(message_id, None))
+        else:
+            self.hits += 1
+
+        # one caller being cancelled must not cancel the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, channel, message_id):
+        try:
+            message = await channel.fetch_message(message_id)
+        except discord.NotFound:
+            message = None  # message was deleted
+        except discord.Forbidden:
+            return None  # missing permissions
+        except discord.HTTPException:
+            return None  # network or other fetch error
+
+        self.store(message_id, message)
+        return message
+
+    def __len__(self):
+        return len(self._entries)
+
+
+referenced_cache = ReferencedMessageCache(REFERENCE_CACHE_SIZE, REFERENCE_CACHE_TTL)
+
+
+def known_referenced(message):
+    """
+    (known, referenced) from the payload or the referenced message cache,
+    never from the API. Known with None means the message was deleted.
+    """
+    if message.reference is None:
+        return False, None
+
+    known, resolved = _already_resolved(message)
+    if known:
+        return known, resolved
+    return referenced_cache.lookup(message.reference.message_id)
+
+
+async def get_referenced(message):
+    """
+    The message this one replies to, or None if it isn't a reply
+    or the referenced message is gone.
+    """
+    if message.reference is None:
+        return None
+
+    message_id = message.reference.message_id
+    known, resolved = _already_resolved(message)
+    if known:
+        referenced_cache.store(message_id, resolved)
+        return resolved
+
+    return await referenced_cache.fetch(message.channel, message_id)
+
+
+async def resolve_references(bot, messages: list) -> dict:
+    """
+    Resolves the messages replied to by a batch of messages.
+
+    Looks in this order, only going to the API for true misses:
+    1. the reference Discord already resolved in the payload
+    2. the batch itself (replies to messages in the same history page)
+    3. the referenced message cache and the client's message cache
+    4. concurrent fetch_message calls, at most MAX_CONCURRENT_FETCHES at once,
+       which also fill the referenced message cache
+
+    Returns {referenced message id: Message or None if it can't be fetched}.
+    """
+    referenced = {}
+    batch = {m.id: m for m in messages}
+    client_cache = None
+    misses = {}
+
+    for message in messages:
+        message_id = reference_id(message)
+        if message_id is None or message_id in referenced:
+            continue
+
+        known, resolved = _already_resolved(message)
+        if not known:
+            known, resolved = referenced_cache.lookup(message_id)
+        if known:
+            referenced[message_id] = resolved
+            continue
+
+        if message_id in batch:
+            referenced[message_id] = batch[message_id]
+            continue
+
+        if client_cache is None:
+            client_cache = {m.id: m for m in bot.cached_messages}
+        if message_id in client_cache:
+            referenced[message_id] = client_cache[message_id]
+            continue
+
+        misses[message_id] = message.channel
+
+    if misses:
+        logger.debug(f"Fetching {len(misses)} referenced messages")
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+        async def _fetch(message_id, channel):
+            async with semaphore:
+                referenced[message_id] = await referenced_cache.fetch(channel, message_id)
+
+        await asyncio.gather(*(_fetch(message_id, channel) for message_id, channel in misses.items()))
+
+    return referenced
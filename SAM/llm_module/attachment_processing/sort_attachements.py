@@ -1,18 +1,23 @@
 from discord_module.utilities.attachments.discord_attachments_manager import digest_attachments
+from llm_module.llm_create import LLM_CONFIG
 
+CONFIG = LLM_CONFIG.SAM
 
-async def sort_attachments(attachments):
+
+async def sort_attachments(attachments, question: str = ""):
     text_data = None
     text_data_string = None
     image_data = None
+    image_hashes = None
     audio_data = None
     audio_data_string = None
 
     if attachments:
-        attachment_data = await digest_attachments(attachments)
+        attachment_data = await digest_attachments(attachments, question, CONFIG.ATTACHMENT_TOKEN_BUDGET)
 
         text_data = attachment_data["text"]
         image_data = attachment_data["image"]
+        image_hashes = attachment_data["image_hashes"]
         audio_data = attachment_data["audio"]
 
     if text_data is not None:
@@ -24,6 +29,7 @@ async def sort_attachments(attachments):
     return {
         "text": text_data_string,
         "image": image_data,
+        "image_hashes": image_hashes,
         "audio": audio_data_string
     }
 
@@ -0,0 +1,222 @@
+import codecs
+import heapq
+import re
+
+from collections import deque
+
+from llm_module.token_counter import count_tokens, keep_last_tokens, truncate_to_tokens
+
+# bytes looked at to decide if a file is text at all
+BINARY_SNIFF_BYTES = 8192
+# share of control bytes above which a file is treated as binary
+BINARY_CONTROL_RATIO = 0.3
+
+# bytes decoded per step
+DECODE_STEP = 64 * 1024
+# text per chunk, cut at a line break where possible
+CHUNK_CHARS = 2048
+
+# share of the budget kept for the start and the end of a file cut down
+HEAD_SHARE = 0.25
+TAIL_SHARE = 0.25
+
+SKIPPED_MARKER = "\n[...]\n"
+
+KEYWORD_PATTERN = re.compile(r"\w{4,}")
+MAX_KEYWORDS = 20
+STOP_WORDS = frozenset({
+    "about", "after", "also", "been", "could", "does", "file", "from", "have", "here",
+    "just", "like", "look", "more", "please", "should", "some", "than", "that", "their",
+    "them", "then", "there", "these", "they", "this", "what", "when", "where", "which",
+    "while", "will", "with", "would", "your",
+})
+
+# bytes that show up in ordinary text files
+TEXT_CONTROL_BYTES = frozenset(b"\t\n\r\f\b\x1b")
+
+
+def looks_binary(sample: bytes, charset: str = "utf-8") -> bool:
+    if not sample:
+        return False
+
+    # NUL bytes are normal in utf-16/32, and a sure sign of binary otherwise
+    if charset.lower().startswith(("utf-16", "utf-32")):
+        sample = sample.replace(b"\x00", b"")
+    elif b"\x00" in sample:
+        return True
+
+    if not sample:
+        return False
+
+    control = sum(1 for byte in sample if (byte < 32 or byte == 127) and byte not in TEXT_CONTROL_BYTES)
+    return control / len(sample) > BINARY_CONTROL_RATIO
+
+
+def extract_keywords(question: str) -> list:
+    keywords = []
+    for word in KEYWORD_PATTERN.findall(question.lower()):
+        if word not in STOP_WORDS and word not in keywords:
+            keywords.append(word)
+    return keywords[:MAX_KEYWORDS]
+
+
+def decode_chunks(data: bytes, charset: str, chunk_chars: int = CHUNK_CHARS):
+    """
+    Yields the decoded text in chunks of about chunk_chars,
+    decoding DECODE_STEP bytes at a time.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    view = memoryview(data)
+    pending = ""
+
+    for start in range(0, len(view), DECODE_STEP):
+        pending += decoder.decode(view[start:start + DECODE_STEP])
+
+        while len(pending) >= chunk_chars:
+            cut = pending.rfind("\n", 0, chunk_chars) + 1 or chunk_chars
+            yield pending[:cut]
+            pending = pending[cut:]
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def score_chunk(chunk: str, keywords: list) -> int:
+    lowered = chunk.lower()
+    return sum(lowered.count(keyword) for keyword in keywords)
+
+
+def focus_chunk(chunk: str, keywords: list, max_tokens: int) -> str:
+    """
+    The lines around the first keyword hit in chunk, at most max_tokens.
+    """
+    lines = chunk.splitlines(keepends=True)
+    hit = next((i for i, line in enumerate(lines) if score_chunk(line, keywords)), 0)
+
+    first = last = hit
+    used = count_tokens(lines[hit])
+    if used > max_tokens:
+        return truncate_to_tokens(lines[hit], max_tokens, marker="")
+
+    # grow around the hit, one line on each side in turn
+    grown = True
+    while grown:
+        grown = False
+        for candidate in (first - 1, last + 1):
+            if 0 <= candidate < len(lines):
+                tokens = count_tokens(lines[candidate])
+                if used + tokens <= max_tokens:
+                    used += tokens
+                    first, last = min(first, candidate), max(last, candidate)
+                    grown = True
+
+    return "".join(lines[first:last + 1])
+
+
+def ingest_text(data: bytes, charset: str, token_budget: int, question: str = "") -> str | None:
+    """
+    Decodes a text attachment to at most about token_budget tokens.
+
+    Files that fit are kept whole. Larger files keep their start and end,
+    plus the chunks that best match the keywords in the user's question,
+    in file order. Every part is sized in tokens against its share of the
+    budget, so punctuation-heavy text like logs keeps its end and its hits.
+    Only the kept chunks are held in memory while the rest is decoded and scored.
+
+    Returns None for binary content.
+    """
+    if looks_binary(data[:BINARY_SNIFF_BYTES], charset):
+        return None
+
+    keywords = extract_keywords(question)
+    marker_tokens = count_tokens(SKIPPED_MARKER)
+
+    # one marker between head and tail, matches pay for their own
+    available = max(token_budget - marker_tokens, 0)
+    if keywords:
+        head_tokens = int(available * HEAD_SHARE)
+        tail_tokens = int(available * TAIL_SHARE)
+    else:
+        head_tokens = available // 2
+        tail_tokens = available - head_tokens
+    match_tokens = available - head_tokens - tail_tokens
+
+    # (index, chunk, tokens)
+    head = []
+    head_used = 0
+    tail = deque()
+    tail_used = 0
+    # best keyword matches so far as (score, -index, chunk, tokens, cut down), lowest score on top
+    matches = []
+    match_used = 0
+    skipped = False
+
+    for index, chunk in enumerate(decode_chunks(data, charset)):
+        tokens = count_tokens(chunk)
+
+        if head_used < head_tokens:
+            head.append((index, chunk, tokens))
+            head_used += tokens
+            continue
+
+        tail.append((index, chunk, tokens))
+        tail_used += tokens
+
+        # keep just enough chunks to cover the tail share
+        while len(tail) > 1 and tail_used - tail[0][2] >= tail_tokens:
+            dropped_index, dropped, dropped_tokens = tail.popleft()
+            tail_used -= dropped_tokens
+            skipped = True
+
+            if not match_tokens or not score_chunk(dropped, keywords):
+                continue
+
+            focused = dropped_tokens + marker_tokens > match_tokens
+            if focused:
+                dropped = focus_chunk(dropped, keywords, match_tokens - marker_tokens)
+                dropped_tokens = count_tokens(dropped)
+
+            heapq.heappush(matches, (score_chunk(dropped, keywords), -dropped_index, dropped, dropped_tokens, focused))
+            match_used += dropped_tokens + marker_tokens
+            while match_used > match_tokens:
+                _, _, _, popped_tokens, _ = heapq.heappop(matches)
+                match_used -= popped_tokens + marker_tokens
+
+    # nothing was left out and it all fits, the file is kept whole
+    if not skipped and head_used + tail_used <= token_budget:
+        return "".join(chunk for _, chunk, _ in head) + "".join(chunk for _, chunk, _ in tail)
+
+    # parts as (first index, last index, text, cut short)
+    parts = []
+
+    if head:
+        head_text = "".join(chunk for _, chunk, _ in head)
+        cut_head = truncate_to_tokens(head_text, head_tokens, marker="")
+        parts.append((head[0][0], head[-1][0], cut_head, cut_head != head_text))
+
+    for _, negative_index, chunk, _, focused in matches:
+        parts.append((-negative_index, -negative_index, chunk, focused))
+
+    if tail:
+        tail_text = "".join(chunk for _, chunk, _ in tail)
+        cut_tail = keep_last_tokens(tail_text, tail_tokens)
+        parts.append((tail[0][0], tail[-1][0], cut_tail, cut_tail != tail_text))
+
+    parts.sort(key=lambda part: part[0])
+
+    output = []
+    previous_last = -1
+    previous_cut = False
+    for first, last, text, cut in parts:
+        if output or first > 0:
+            if first != previous_last + 1 or previous_cut or cut:
+                output.append(SKIPPED_MARKER)
+        output.append(text)
+        previous_last, previous_cut = last, cut
+
+    return "".join(output)
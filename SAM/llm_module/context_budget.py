@@ -0,0 +1,54 @@
+from llm_module.llm_create import LLM_CONFIG
+from llm_module.system_prompts import personality_system_prompt, chat_history_system_prompt
+from llm_module.token_counter import estimate_tokens, message_tokens, prompt_tokens
+
+CONFIG = LLM_CONFIG.SAM
+
+
+def history_token_budget() -> int:
+    """
+    Tokens a channel's cached history may take up, leaving room in num_ctx
+    for the system prompt, the history summary, the new message,
+    its attachments and the reply.
+    """
+    system_tokens = estimate_tokens(personality_system_prompt + "\n" + chat_history_system_prompt)
+
+    return (
+        CONFIG.DEFAULT_CONTEXT
+        - CONFIG.GENERATION_RESERVE
+        - CONFIG.ATTACHMENT_TOKEN_BUDGET
+        - CONFIG.NEW_MESSAGE_RESERVE
+        - CONFIG.SUMMARY_TOKEN_BUDGET
+        - system_tokens
+    )
+
+
+def fit_history(prompt_head: list, history, user_prompt: dict) -> list:
+    """
+    Returns the newest part of history that fits in num_ctx next to the
+    messages in front of it (system prompt, summary), the new message and the reply.
+
+    The channel cache already stays under history_token_budget,
+    this only cuts further for unusually large new messages.
+    """
+    available = (
+        CONFIG.DEFAULT_CONTEXT
+        - CONFIG.GENERATION_RESERVE
+        - prompt_tokens(prompt_head)
+        - message_tokens(user_prompt)
+    )
+
+    history = list(history)
+    if prompt_tokens(history) <= available:
+        return history
+
+    kept = []
+    used = 0
+    for message in reversed(history):
+        used += message_tokens(message)
+        if used > available:
+            break
+        kept.append(message)
+
+    kept.reverse()
+    return kept
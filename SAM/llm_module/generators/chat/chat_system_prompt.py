@@ -1,7 +1,11 @@
 import copy
 import re
 
+from llm_module.context_budget import fit_history
+from llm_module.llm_create import LLM_CONFIG
 from llm_module.system_prompts import personality_system_prompt, chat_history_system_prompt
+from llm_module.token_counter import truncate_to_tokens
+from memory_module.channel_summary import get_channel_summary
 from memory_module.process_message import process_message
 
 from utility_scripts.system_logging import setup_logger
@@ -9,6 +13,8 @@ from utility_scripts.system_logging import setup_logger
 # configure logging
 logger = setup_logger(__name__)
 
+CONFIG = LLM_CONFIG.SAM
+
 
 async def build_system_prompt(bot, message, prompt_data):
     message_cache = prompt_data["message_cache"]
@@ -41,15 +47,25 @@ async def build_system_prompt(bot, message, prompt_data):
     if audio_data:
         cached_user_message["content"] = audio_data
 
-    # File data
+    # File data, capped so a large file can't crowd out the history
     text_data = file_data["text"]
     if text_data:
+        text_data = truncate_to_tokens(text_data, CONFIG.ATTACHMENT_TOKEN_BUDGET)
         user_prompt["content"] += text_data
         cached_user_message["content"] += text_data
 
+    # pinned summary of history that was evicted from the cache
+    prompt_head = [system_prompt]
+    summary = get_channel_summary(message.channel.id)
+    if summary:
+        prompt_head.append({
+            "role": "system",
+            "content": "Summary of the earlier conversation:\n" + summary
+        })
+
     full_prompt = [
-        system_prompt,
-        *message_cache,
+        *prompt_head,
+        *fit_history(prompt_head, message_cache, user_prompt),
         user_prompt
     ]
 
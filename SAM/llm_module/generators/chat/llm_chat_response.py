@@ -1,10 +1,10 @@
-import asyncio
-
-from ollama import chat
+from ollama import Message
 
 from llm_module.generators.chat.chat_system_prompt import build_system_prompt
 from llm_module.llm_create import LLM_CONFIG
+from llm_module.ollama_client import ollama_chat
 from llm_module.process_response import process_response
+from llm_module.prompt_cache_metrics import measure_prefix_reuse
 from memory_module.message_history import get_channel_message_cache
 
 from utility_scripts.system_logging import setup_logger
@@ -16,7 +16,7 @@ CONFIG = LLM_CONFIG.SAM
 
 
 # Main entry point
-async def llm_generate_response(bot, message, attachments=None):
+async def llm_generate_response(bot, message, attachments=None, stream_reply=None):
     message_cache = await get_channel_message_cache(bot, message)
 
     prompt_info = {
@@ -31,10 +31,16 @@ async def llm_generate_response(bot, message, attachments=None):
     message_cache = prompt_data["message_cache"]
     cached_user_message = prompt_data["cached_user_message"]
 
-    response = await llm_generate_chat_response(full_prompt)
+    if stream_reply is not None:
+        response = await llm_generate_chat_response_stream(full_prompt, stream_reply.update)
+    else:
+        response = await llm_generate_chat_response(full_prompt)
     response_data = process_response(response, system_prompt, message_cache)
     response_data["user"] = cached_user_message
 
+    token_usage = response_data["token_usage"]
+    token_usage.update(measure_prefix_reuse(message.channel.id, full_prompt, token_usage))
+
     if attachments:
         response_data["file_txt"] = attachments["text"]
 
@@ -43,8 +49,7 @@ async def llm_generate_response(bot, message, attachments=None):
 
 async def llm_generate_chat_response(full_prompt):
 
-    response = await asyncio.to_thread(
-        chat,
+    response = await ollama_chat(
         model=CONFIG.MODEL_NAME,
         messages=full_prompt,
         options={
@@ -56,3 +61,44 @@ async def llm_generate_chat_response(full_prompt):
     )
 
     return response
+
+
+async def llm_generate_chat_response_stream(full_prompt, on_content):
+    """
+    Streams the chat response, calling on_content with the full
+    content generated so far each time new content arrives.
+
+    Returns the final chunk with the assembled message so it can be
+    handled exactly like a non streamed response.
+    """
+    content = ""
+    thinking = ""
+    final_chunk = None
+
+    stream = await ollama_chat(
+        model=CONFIG.MODEL_NAME,
+        messages=full_prompt,
+        options={
+            "num_ctx": CONFIG.DEFAULT_CONTEXT,
+            "temperature": CONFIG.DEFAULT_TEMPERATURE,
+            "think": True
+        },
+        stream=True
+    )
+
+    async for chunk in stream:
+        final_chunk = chunk
+
+        if chunk.message.thinking:
+            thinking += chunk.message.thinking
+
+        if chunk.message.content:
+            content += chunk.message.content
+            await on_content(content)
+
+    final_chunk.message = Message(
+        role="assistant",
+        content=content,
+        thinking=thinking or None
+    )
+    return final_chunk
@@ -1,10 +1,7 @@
-import asyncio
-
-from ollama import chat
-
-from discord_module.utilities.attachments.discord_attachments_manager import cleanup_image_file
+from llm_module.generators.vision.vision_result_cache import vision_cache_key, vision_result_cache
 from llm_module.generators.vision.vision_system_prompt import build_vision_system_prompt
 from llm_module.llm_create import LLM_CONFIG
+from llm_module.ollama_client import ollama_chat
 from llm_module.process_response import process_response
 from utility_scripts.system_logging import setup_logger
 
@@ -22,9 +19,21 @@ async def llm_generate_vision_response(bot, message, attachments=None):
     message_cache = prompt_data["message_cache"]
     cached_user_message = prompt_data["cached_user_message"]
 
-    response = await llm_vision_response(full_prompt)
+    cache_key = vision_cache_key(attachments["image_hashes"], full_prompt, CONFIG.VISION_MODEL)
+    response = vision_result_cache.get(cache_key)
+    cache_hit = response is not None
+
+    if not cache_hit:
+        response = await llm_vision_response(full_prompt)
+        vision_result_cache.put(cache_key, response)
+
     response_data = process_response(response, system_prompt, message_cache)
 
+    if cache_hit:
+        logger.info("Vision result cache hit")
+        # nothing was generated this time
+        response_data["token_usage"] = {}
+
     response_data["user"] = cached_user_message
     response_data["file_txt"] = attachments["text"]
 
@@ -33,8 +42,7 @@ async def llm_generate_vision_response(bot, message, attachments=None):
 
 async def llm_vision_response(full_prompt):
 
-    response = await asyncio.to_thread(
-        chat,
+    response = await ollama_chat(
         model=CONFIG.VISION_MODEL,
         messages=full_prompt,
         options={
@@ -45,8 +53,4 @@ async def llm_vision_response(full_prompt):
         stream=False
     )
 
-    # clean up image
-    user_prompt = full_prompt[-1]
-    cleanup_image_file(user_prompt["images"])
-
     return response
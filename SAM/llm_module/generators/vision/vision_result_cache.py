@@ -0,0 +1,81 @@
+import time
+
+from collections import OrderedDict
+
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+VISION_CACHE_SIZE = 256
+VISION_CACHE_TTL = 6 * 60 * 60
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def vision_cache_key(image_hashes: list, messages: list, model: str) -> tuple:
+    """
+    Everything the model sees: the images (by the sha256 stored with each
+    attachment), the text of every prompt message (system prompt, author
+    and channel context included) and the model.
+    """
+    text = tuple((m["role"], normalize_text(m.get("content") or "")) for m in messages)
+    return tuple(image_hashes), text, model
+
+
+class VisionResultCache:
+    """
+    Vision model responses by (image hashes, normalized prompt text, model),
+    so the same image and question from the same author in the same context
+    doesn't run the model again.
+    Entries expire after ttl_seconds, past max_size the least recently used go.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        # key -> [response, expires at]
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] < time.monotonic():
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, response):
+        self._entries[key] = [response, time.monotonic() + self.ttl_seconds]
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def purge(self) -> int:
+        count = len(self._entries)
+        self._entries.clear()
+        logger.info(f"Purged {count} cached vision results")
+        return count
+
+    def __len__(self):
+        return len(self._entries)
+
+
+vision_result_cache = VisionResultCache(VISION_CACHE_SIZE, VISION_CACHE_TTL)
+
+
+def get_vision_result_cache() -> VisionResultCache:
+    return vision_result_cache
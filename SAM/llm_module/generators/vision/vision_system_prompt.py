@@ -1,8 +1,12 @@
 import copy
 
+from llm_module.llm_create import LLM_CONFIG
 from llm_module.system_prompts import personality_system_prompt
+from llm_module.token_counter import truncate_to_tokens
 from memory_module.process_message import process_message
 
+CONFIG = LLM_CONFIG.SAM
+
 
 async def build_vision_system_prompt(bot, message, attachments):
     system_prompt = {"role": "system", "content": personality_system_prompt}
@@ -15,6 +19,7 @@ async def build_vision_system_prompt(bot, message, attachments):
     # File data
     text_data = attachments["text"]
     if text_data:
+        text_data = truncate_to_tokens(text_data, CONFIG.ATTACHMENT_TOKEN_BUDGET)
         user_prompt["content"] += text_data
         cached_user_message["content"] += text_data
 
@@ -23,7 +23,48 @@ llm_config = {
         "OLLAMA_MODEL": "huihui_ai/deepseek-r1-abliterated",
         "VISION_MODEL": "qwen3-vl:4b",
         "DEFAULT_CONTEXT": 16384,
-        "DEFAULT_TEMPERATURE": 0.6
+        "DEFAULT_TEMPERATURE": 0.6,
+        # tokens of DEFAULT_CONTEXT kept free for the reply (thinking included)
+        "GENERATION_RESERVE": int(os.getenv("GENERATION_RESERVE", 4096)),
+        # most tokens attached text files may add to a prompt
+        "ATTACHMENT_TOKEN_BUDGET": int(os.getenv("ATTACHMENT_TOKEN_BUDGET", 4096)),
+        # room kept for the new message itself
+        "NEW_MESSAGE_RESERVE": 512,
+        # model and size of the rolling summary of evicted channel history
+        "SUMMARY_MODEL": os.getenv("SUMMARY_MODEL", "huihui_ai/deepseek-r1-abliterated"),
+        "SUMMARY_TOKEN_BUDGET": int(os.getenv("SUMMARY_TOKEN_BUDGET", 512)),
+        # most evicted history one summary job reads, older messages past it are dropped
+        "SUMMARY_INPUT_TOKEN_BUDGET": int(os.getenv("SUMMARY_INPUT_TOKEN_BUDGET", 8192)),
+        # post chat replies while they are generated instead of all at once
+        "STREAM_RESPONSES": os.getenv("STREAM_RESPONSES", "true").lower() == "true",
+        # seconds between message edits while streaming (discord rate limits edits)
+        "STREAM_EDIT_INTERVAL": float(os.getenv("STREAM_EDIT_INTERVAL", 1.2)),
+    },
+    "OLLAMA": {
+        # comma separated list of Ollama hosts
+        "HOSTS": [
+            host.strip() for host in
+            os.getenv("OLLAMA_HOSTS", os.getenv("OLLAMA_HOST", "http://127.0.0.1:11434")).split(",")
+            if host.strip()
+        ],
+        "CONNECT_TIMEOUT": float(os.getenv("OLLAMA_CONNECT_TIMEOUT", 5)),
+        # generous, thinking models on CPU can take minutes
+        "REQUEST_TIMEOUT": float(os.getenv("OLLAMA_REQUEST_TIMEOUT", 600)),
+        "MAX_CONNECTIONS": int(os.getenv("OLLAMA_MAX_CONNECTIONS", 8)),
+        "KEEPALIVE_EXPIRY": float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY", 60)),
+        # seconds between health probes when more than one host is configured
+        "HEALTH_CHECK_INTERVAL": float(os.getenv("OLLAMA_HEALTH_CHECK_INTERVAL", 30)),
+        # errors in a row before a host is taken out of rotation
+        "MAX_FAILURES": int(os.getenv("OLLAMA_MAX_FAILURES", 2)),
+    },
+    "SCHEDULER": {
+        # generations running at once, size this to the Ollama backend
+        "MAX_CONCURRENT_REQUESTS": int(os.getenv("MAX_CONCURRENT_GENERATIONS", 2)),
+        # waiting requests before new ones get a busy reply
+        "MAX_QUEUED_REQUESTS": int(os.getenv("MAX_QUEUED_GENERATIONS", 16)),
+        "MAX_QUEUED_PER_USER": int(os.getenv("MAX_QUEUED_PER_USER", 3)),
+        # of those, background jobs (summaries), user requests shed them when the queue is full
+        "MAX_QUEUED_BACKGROUND": int(os.getenv("MAX_QUEUED_BACKGROUND", 4)),
     }
 }
 LLM_CONFIG = namespace(llm_config)
@@ -34,16 +75,19 @@ def get_llm_config():
 
 
 def llm_create():
+    # one-off startup call, requests at runtime go through the shared async client,
+    # so the sync clients are closed here instead of being returned
     try:
-        client = Client()
-        response = client.create(
-            model=LLM_CONFIG.SAM.MODEL_NAME,
-            from_=LLM_CONFIG.SAM.OLLAMA_MODEL,
-            system=personality_system_prompt,
-            stream=False,
-        )
-        logger.info(f"# Client Response: {response.status}")
-        return client
+        for host in LLM_CONFIG.OLLAMA.HOSTS:
+            # closes the client even when the create call fails
+            with Client(host=host) as client:
+                response = client.create(
+                    model=LLM_CONFIG.SAM.MODEL_NAME,
+                    from_=LLM_CONFIG.SAM.OLLAMA_MODEL,
+                    system=personality_system_prompt,
+                    stream=False,
+                )
+            logger.info(f"# Client Response ({host}): {response.status}")
 
     except ConnectionError as e:
         logger.error('Ollama is not running!')
@@ -51,5 +95,5 @@ def llm_create():
 
     except Exception as e:
         # Catches any other unexpected errors
-        logger.error("❌ An unexpected error occurred:", e)
+        logger.error(f"❌ An unexpected error occurred: {e}")
         sys.exit(1)
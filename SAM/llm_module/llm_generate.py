@@ -1,10 +1,9 @@
-import asyncio
 import copy
 
-from discord_module.utilities.attachments.discord_attachments_manager import digest_attachments, cleanup_image_file
+from discord_module.utilities.attachments.discord_attachments_manager import digest_attachments
 from discord_module.utilities.split_message import split_response
 from llm_module.llm_create import LLM_CONFIG
-from ollama import chat
+from llm_module.ollama_client import ollama_chat
 
 from llm_module.system_prompts import personality_system_prompt, chat_history_system_prompt
 from memory_module.message_history import get_channel_message_cache
@@ -92,8 +91,7 @@ async def llm_generate_chat_response(full_prompt, system_prompt, message_cache):
     if isinstance(user_prompt, dict) and "images" in user_prompt:
         llm_model = CONFIG.VISION_MODEL
 
-    response = await asyncio.to_thread(
-        chat,
+    response = await ollama_chat(
         model=llm_model,
         messages=full_prompt,
         options={
@@ -106,10 +104,6 @@ async def llm_generate_chat_response(full_prompt, system_prompt, message_cache):
 
     cleaned = response.message.content.replace("'", "\\'")
 
-    # clean up images
-    if llm_model == CONFIG.VISION_MODEL:
-        cleanup_image_file(user_prompt["images"])
-
     # Extract token usage from response
     token_usage = {
         "prompt_tokens": getattr(response, "prompt_eval_count", 0),
@@ -1,7 +1,10 @@
 from discord_module.utilities.discord_bot_users_ratelimit import bot_message_cooldown
+from llm_module.llm_create import LLM_CONFIG
+from llm_module.llm_scheduler import get_scheduler, PRIORITY_DIRECT
 from llm_module.pipeline.pl_generate_response import generate_response
 from llm_module.pipeline.pl_post_process import post_process
 from llm_module.pipeline.pl_send_response import send_response
+from llm_module.pipeline.pl_stream_response import StreamingReply
 
 
 from llm_module.tools.text_to_speech.tts_message_helpers import message_is_tts
@@ -11,11 +14,33 @@ from utility_scripts.system_logging import setup_logger
 
 logger = setup_logger(__name__)
 
+CONFIG = LLM_CONFIG.SAM
+
+BUSY_REPLY = "I'm a little swamped right now, try me again in a moment!"
+
 
 # ============================================================
 # PUBLIC ENTRY POINT
 # ============================================================
 
+async def schedule_llm_chat(bot, message, priority=PRIORITY_DIRECT):
+    """
+    Queues llm_chat on the LLM scheduler.
+    Replies with a busy message when the queue is full.
+    """
+    queued = await get_scheduler().submit(
+        llm_chat, bot, message,
+        priority=priority,
+        user_id=message.author.id,
+        channel_id=message.channel.id,
+    )
+
+    if not queued:
+        # don't get into busy-reply loops with other bots
+        if not message.author.bot:
+            await message.reply(BUSY_REPLY, mention_author=False)
+
+
 async def llm_chat(bot, message):
     """
     Main orchestration layer for AI responses.
@@ -43,12 +68,24 @@ async def llm_chat(bot, message):
     is_tts_message, message_content = message_is_tts(message)
 
     # --------------------------------------------------------
-    # 3. Generate AI response
+    # 3. Generate AI response (streamed to Discord if enabled)
     # --------------------------------------------------------
-    async with message.channel.typing():
-        response = await generate_response(bot, message, message_content)
+    stream_reply = None
+    if CONFIG.STREAM_RESPONSES:
+        stream_reply = StreamingReply(message, CONFIG.STREAM_EDIT_INTERVAL)
+
+    try:
+        async with message.channel.typing():
+            response = await generate_response(bot, message, message_content, stream_reply)
+    except Exception:
+        # don't leave a half written reply in the channel
+        if stream_reply is not None:
+            await stream_reply.abort()
+        raise
 
     if not response:
+        if stream_reply is not None:
+            await stream_reply.abort()
         return
 
     # --------------------------------------------------------
@@ -58,7 +95,8 @@ async def llm_chat(bot, message):
         bot=bot,
         message=message,
         response=response,
-        is_tts_message=is_tts_message
+        is_tts_message=is_tts_message,
+        stream_reply=stream_reply
     )
 
     # --------------------------------------------------------
@@ -0,0 +1,204 @@
+import asyncio
+import itertools
+
+from collections import Counter, deque
+
+from llm_module.llm_create import LLM_CONFIG
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+CONFIG = LLM_CONFIG.SCHEDULER
+
+# priority classes, lower runs first
+PRIORITY_DIRECT = 0     # DMs, mentions and replies to the bot
+PRIORITY_KEYWORD = 1    # keyword triggers ("sam")
+PRIORITY_BACKGROUND = 2  # housekeeping like history summaries, never ahead of a user
+
+
+class _Job:
+    __slots__ = ("priority", "user_rank", "seq", "channel_id", "user_id", "handler", "args", "on_shed")
+
+    def __init__(self, priority, user_rank, seq, channel_id, user_id, handler, args, on_shed):
+        self.priority = priority
+        self.user_rank = user_rank
+        self.seq = seq
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self.handler = handler
+        self.args = args
+        self.on_shed = on_shed
+
+
+class LLMScheduler:
+    """
+    Bounded priority queue in front of the LLM.
+
+    - A fixed pool of workers caps how many generations run at once
+    - Jobs for the same channel queue first in, first out and never run at the same time
+    - Between channels, lower priority classes run first,
+      then users with the least work ahead of them
+    - When the queue (or a single user's share of it) is full the job is refused
+    - Background jobs have their own smaller cap, and a user request arriving
+      at a full queue sheds the newest background job to make room
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, max_per_user: int, max_background: int = None):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(1, max_queue)
+        self.max_per_user = max(1, max_per_user)
+        if max_background is None:
+            max_background = self.max_queue // 4
+        self.max_background = max(1, min(max_background, self.max_queue))
+
+        # channel_id -> its queued jobs, oldest first
+        self._channels = {}
+        self._queued = 0
+        self._queued_background = 0
+        self._active_channels = set()
+        self._queued_per_user = Counter()
+        self._running_per_user = Counter()
+        self._seq = itertools.count()
+
+        self._condition = None
+        self._workers = []
+
+    # ---------------------------------
+    # Public
+    # ---------------------------------
+    def queued(self) -> int:
+        return self._queued
+
+    def running(self) -> int:
+        return sum(self._running_per_user.values())
+
+    async def submit(self, handler, *args, priority=PRIORITY_DIRECT, user_id=None, channel_id=None,
+                     on_shed=None) -> bool:
+        """
+        Queue handler(*args) to run on a worker.
+        Returns False without queueing when the request has to be shed.
+        on_shed() is called if the job is shed later on, to make room for a user.
+        """
+        self._ensure_workers()
+
+        async with self._condition:
+            if self._queued_per_user[user_id] >= self.max_per_user:
+                logger.warning(f"{user_id} already has {self._queued_per_user[user_id]} queued requests, shedding")
+                return False
+
+            background = priority >= PRIORITY_BACKGROUND
+            if background and self._queued_background >= self.max_background:
+                logger.warning(f"Background queue full ({self._queued_background}), shedding job for {channel_id}")
+                return False
+
+            if self._queued >= self.max_queue and (background or not self._shed_background()):
+                logger.warning(f"LLM queue full ({self._queued}), shedding request from {user_id}")
+                return False
+
+            self._channels.setdefault(channel_id, deque()).append(_Job(
+                priority=priority,
+                user_rank=self._queued_per_user[user_id],
+                seq=next(self._seq),
+                channel_id=channel_id,
+                user_id=user_id,
+                handler=handler,
+                args=args,
+                on_shed=on_shed,
+            ))
+            self._queued += 1
+            self._queued_background += background
+            self._queued_per_user[user_id] += 1
+            self._condition.notify()
+
+        logger.debug(f"Queued LLM request (priority={priority}, queued={self._queued})")
+        return True
+
+    # ---------------------------------
+    # Workers
+    # ---------------------------------
+    def _ensure_workers(self):
+        # created lazily so everything binds to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.max_workers:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    def _job_key(self, job):
+        return job.priority, self._running_per_user[job.user_id], job.user_rank, job.seq
+
+    def _next_job(self):
+        # only the oldest job of a channel can run, so a channel keeps its order
+        runnable = [jobs[0] for channel_id, jobs in self._channels.items() if channel_id not in self._active_channels]
+        if not runnable:
+            return None
+        return min(runnable, key=self._job_key)
+
+    def _dequeue(self, job):
+        jobs = self._channels[job.channel_id]
+        jobs.remove(job)
+        if not jobs:
+            del self._channels[job.channel_id]
+
+        self._queued -= 1
+        self._queued_background -= job.priority >= PRIORITY_BACKGROUND
+        self._queued_per_user[job.user_id] -= 1
+        if self._queued_per_user[job.user_id] <= 0:
+            del self._queued_per_user[job.user_id]
+
+    def _shed_background(self) -> bool:
+        """
+        Drops the newest queued background job. False if there is none.
+        """
+        background = [job for jobs in self._channels.values() for job in jobs if job.priority >= PRIORITY_BACKGROUND]
+        if not background:
+            return False
+
+        job = max(background, key=lambda j: j.seq)
+        self._dequeue(job)
+        logger.warning(f"LLM queue full, shed background job for {job.channel_id} to make room")
+
+        if job.on_shed is not None:
+            try:
+                job.on_shed()
+            except Exception as e:
+                logger.exception(f"on_shed failed: {e}")
+        return True
+
+    async def _worker(self):
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._next_job() is not None)
+
+                job = self._next_job()
+                self._dequeue(job)
+
+                self._active_channels.add(job.channel_id)
+                self._running_per_user[job.user_id] += 1
+
+            try:
+                await job.handler(*job.args)
+            except Exception as e:
+                logger.exception(f"LLM request failed: {e}")
+            finally:
+                async with self._condition:
+                    self._active_channels.discard(job.channel_id)
+                    self._running_per_user[job.user_id] -= 1
+                    if self._running_per_user[job.user_id] <= 0:
+                        del self._running_per_user[job.user_id]
+                    # a blocked channel may be runnable now
+                    self._condition.notify_all()
+
+
+scheduler = LLMScheduler(
+    max_workers=CONFIG.MAX_CONCURRENT_REQUESTS,
+    max_queue=CONFIG.MAX_QUEUED_REQUESTS,
+    max_per_user=CONFIG.MAX_QUEUED_PER_USER,
+    max_background=CONFIG.MAX_QUEUED_BACKGROUND,
+)
+
+
+def get_scheduler():
+    return scheduler
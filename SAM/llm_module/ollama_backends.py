@@ -0,0 +1,212 @@
+import asyncio
+
+import httpx
+
+from ollama import ResponseError
+
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# errors that mean the backend itself is in trouble, not the request
+BACKEND_ERRORS = (ConnectionError, httpx.TransportError)
+
+
+def normalize_model_name(model: str) -> str:
+    return model if ":" in model else f"{model}:latest"
+
+
+def is_backend_failure(error: Exception) -> bool:
+    if isinstance(error, BACKEND_ERRORS):
+        return True
+    if isinstance(error, ResponseError):
+        # 404 is "model not found" on that host, 5xx is the server failing
+        return error.status_code == 404 or error.status_code >= 500 or error.status_code == -1
+    return False
+
+
+class OllamaBackend:
+    def __init__(self, host: str, client):
+        self.host = host
+        self.client = client
+
+        self.healthy = True
+        self.in_flight = 0
+        self.failures = 0
+        # None until the first health probe tells us what the host has pulled
+        self.models = None
+
+    def has_model(self, model: str) -> bool:
+        return self.models is None or normalize_model_name(model) in self.models
+
+    def __repr__(self):
+        return f"OllamaBackend({self.host}, healthy={self.healthy}, in_flight={self.in_flight})"
+
+
+class OllamaBackendPool:
+    """
+    Spreads requests over several Ollama hosts.
+
+    - Each request goes to the healthy host with the model and the fewest requests in flight
+    - A host is marked unhealthy after max_failures errors in a row and skipped until
+      a health probe succeeds again
+    - A failed request is retried on the next best host before giving up
+    """
+
+    def __init__(self, hosts: list, client_factory, probe_interval: float = 30, max_failures: int = 2):
+        self.backends = [OllamaBackend(host, client_factory(host)) for host in hosts]
+        self.probe_interval = probe_interval
+        self.max_failures = max(1, max_failures)
+
+        self._health_task = None
+
+    # ---------------------------------
+    # Selection
+    # ---------------------------------
+    def pick(self, model: str, exclude=()) -> OllamaBackend | None:
+        candidates = [b for b in self.backends if b not in exclude and b.has_model(model)]
+        healthy = [b for b in candidates if b.healthy]
+
+        # if everything looks down, still try rather than fail outright
+        pool = healthy or candidates
+        if not pool:
+            return None
+
+        return min(pool, key=lambda b: b.in_flight)
+
+    def _record_success(self, backend):
+        backend.failures = 0
+        if not backend.healthy:
+            logger.info(f"Ollama backend {backend.host} is healthy again")
+        backend.healthy = True
+
+    def _record_failure(self, backend, error):
+        if isinstance(error, ResponseError) and error.status_code == 404:
+            # host is fine, it just doesn't have the model
+            logger.warning(f"Ollama backend {backend.host} is missing the model: {error}")
+            return
+
+        backend.failures += 1
+        logger.warning(f"Ollama backend {backend.host} failed ({backend.failures}): {error}")
+
+        if backend.failures >= self.max_failures and backend.healthy:
+            logger.error(f"Marking Ollama backend {backend.host} unhealthy")
+            backend.healthy = False
+
+    # ---------------------------------
+    # Requests
+    # ---------------------------------
+    async def chat(self, **kwargs):
+        """
+        Same arguments as ollama.AsyncClient.chat.
+        With stream=True this returns an async iterator of chunks.
+        """
+        self.start_health_checks()
+
+        if kwargs.get("stream"):
+            return self._chat_stream(**kwargs)
+
+        model = kwargs.get("model")
+        tried = []
+        last_error = None
+        while True:
+            backend = self._next_backend(model, tried, last_error)
+            tried.append(backend)
+
+            backend.in_flight += 1
+            try:
+                response = await backend.client.chat(**kwargs)
+            except Exception as e:
+                if not is_backend_failure(e):
+                    raise
+                self._record_failure(backend, e)
+                last_error = e
+                continue
+            finally:
+                backend.in_flight -= 1
+
+            self._record_success(backend)
+            return response
+
+    async def _chat_stream(self, **kwargs):
+        model = kwargs.get("model")
+        tried = []
+        last_error = None
+        while True:
+            backend = self._next_backend(model, tried, last_error)
+            tried.append(backend)
+
+            backend.in_flight += 1
+            try:
+                # only fail over before anything was handed to the caller
+                try:
+                    stream = await backend.client.chat(**kwargs)
+                    first_chunk = await anext(stream)
+                except StopAsyncIteration:
+                    self._record_success(backend)
+                    return
+                except Exception as e:
+                    if not is_backend_failure(e):
+                        raise
+                    self._record_failure(backend, e)
+                    last_error = e
+                    continue
+
+                self._record_success(backend)
+
+                yield first_chunk
+                async for chunk in stream:
+                    yield chunk
+                return
+            finally:
+                backend.in_flight -= 1
+
+    def _next_backend(self, model: str, tried: list, last_error: Exception | None) -> OllamaBackend:
+        backend = self.pick(model, exclude=tried)
+        if backend is not None:
+            return backend
+
+        # every host that could serve the model failed, the caller gets the real error
+        if last_error is not None:
+            raise last_error
+        raise ConnectionError(f"No Ollama backend available for {model}")
+
+    # ---------------------------------
+    # Health checks
+    # ---------------------------------
+    async def probe(self, backend: OllamaBackend):
+        try:
+            response = await backend.client.list()
+        except Exception as e:
+            if backend.healthy:
+                logger.error(f"Health probe failed for Ollama backend {backend.host}: {e}")
+            backend.healthy = False
+            return
+
+        backend.models = {normalize_model_name(m.model) for m in response.models if m.model}
+        self._record_success(backend)
+
+    async def probe_all(self):
+        await asyncio.gather(*(self.probe(backend) for backend in self.backends))
+
+    async def _health_loop(self):
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.probe_interval)
+
+    def start_health_checks(self):
+        # single host has nothing to fail over to, skip the probes
+        if len(self.backends) < 2:
+            return
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop_health_checks(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
@@ -0,0 +1,66 @@
+import httpx
+
+from ollama import AsyncClient
+
+from llm_module.llm_create import LLM_CONFIG
+from llm_module.ollama_backends import OllamaBackendPool
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+CONFIG = LLM_CONFIG.OLLAMA
+
+# host -> long-lived async client, shared by every generator
+_clients = {}
+
+
+def get_ollama_client(host: str = None) -> AsyncClient:
+    """
+    Returns the shared async client for a host (the first configured host by default).
+    Each client keeps its own keep-alive connection pool.
+    """
+    host = host or CONFIG.HOSTS[0]
+
+    client = _clients.get(host)
+    if client is None:
+        logger.info(f"Creating Ollama client for {host}")
+        client = AsyncClient(
+            host=host,
+            timeout=httpx.Timeout(CONFIG.REQUEST_TIMEOUT, connect=CONFIG.CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=CONFIG.MAX_CONNECTIONS,
+                max_keepalive_connections=CONFIG.MAX_CONNECTIONS,
+                keepalive_expiry=CONFIG.KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[host] = client
+
+    return client
+
+
+backend_pool = OllamaBackendPool(
+    CONFIG.HOSTS,
+    client_factory=get_ollama_client,
+    probe_interval=CONFIG.HEALTH_CHECK_INTERVAL,
+    max_failures=CONFIG.MAX_FAILURES,
+)
+
+
+def get_backend_pool() -> OllamaBackendPool:
+    return backend_pool
+
+
+async def ollama_chat(**kwargs):
+    """
+    ollama.chat routed to the least loaded healthy host.
+    With stream=True this returns an async iterator of chunks.
+    """
+    return await backend_pool.chat(**kwargs)
+
+
+async def close_ollama_clients():
+    await backend_pool.stop_health_checks()
+    for host, client in list(_clients.items()):
+        await client.close()
+        del _clients[host]
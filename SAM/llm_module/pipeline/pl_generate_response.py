@@ -1,5 +1,3 @@
-import asyncio
-
 from discord_module.utilities.attachments.discord_attachments_manager import download_attachments, get_message_attachments
 from llm_module.attachment_processing.sort_attachements import sort_attachments
 from llm_module.determine_request import classify_request
@@ -10,10 +8,13 @@ from utility_scripts.system_logging import setup_logger
 logger = setup_logger(__name__)
 
 
-async def generate_response(bot, message, message_content):
+async def generate_response(bot, message, message_content, stream_reply=None):
     """
     Determines which backend should handle the request
     and returns a standardized response object.
+
+    Chat responses are posted through stream_reply while they
+    generate when one is given.
     """
 
     # ---------------------------------
@@ -23,14 +24,9 @@ async def generate_response(bot, message, message_content):
     attachment_data = None
 
     if message_attachments:
-        loop = asyncio.get_event_loop()
-        gathered_attachments = await loop.run_in_executor(
-            None,
-            download_attachments,
-            message_attachments
-        )
+        gathered_attachments = await download_attachments(message_attachments)
 
-        attachment_data = await sort_attachments(gathered_attachments)
+        attachment_data = await sort_attachments(gathered_attachments, message_content)
 
     request_type = classify_request(message, message_content, attachment_data)
     logger.info(f"Classification={request_type}, Content={message_content}")
@@ -56,7 +52,7 @@ async def generate_response(bot, message, message_content):
         case "search":
             logger.info("Web search triggered")
             # return await llm_internet_search(bot, message)
-            return await llm_generate_response(bot, message, attachment_data)
+            return await llm_generate_response(bot, message, attachment_data, stream_reply)
 
         # ---------------------------------
         # weather
@@ -64,11 +60,11 @@ async def generate_response(bot, message, message_content):
         case "weather_search":
             logger.info("Weather search triggered")
             # return await weather_search(message_content)
-            return await llm_generate_response(bot, message, attachment_data)
+            return await llm_generate_response(bot, message, attachment_data, stream_reply)
 
         # ---------------------------------
         # default chat
         # ---------------------------------
         case _:
-            return await llm_generate_response(bot, message, attachment_data)
+            return await llm_generate_response(bot, message, attachment_data, stream_reply)
 
@@ -1,13 +1,31 @@
 from llm_module.tools.text_to_speech.tts_message_helpers import send_tts
 
 
-async def send_response(bot, message, response, is_tts_message):
+async def send_response(bot, message, response, is_tts_message, stream_reply=None):
     """
     Handles sending multipart responses to Discord.
+    Responses that were streamed while generating only get their final edits.
     """
 
     response_content = response["content"]
 
+    if stream_reply is not None and stream_reply.started:
+        sent_message = await stream_reply.finish(response_content)
+    else:
+        sent_message = await send_parts(message, response_content)
+
+    # TTS handling (first part only)
+    if is_tts_message and response_content:
+        await send_tts(
+            message,
+            response_content[0],
+            reply_target=sent_message
+        )
+
+    return sent_message
+
+
+async def send_parts(message, response_content):
     sent_message = None
 
     for i, part in enumerate(response_content):
@@ -32,12 +50,4 @@ async def send_response(bot, message, response, is_tts_message):
                     suppress_embeds=True
                 )
 
-    # TTS handling (first part only)
-    if is_tts_message and response_content:
-        await send_tts(
-            message,
-            response_content[0],
-            reply_target=sent_message
-        )
-
     return sent_message
@@ -0,0 +1,125 @@
+import time
+
+from discord_module.utilities.split_message import split_response
+from llm_module.process_response import clean_response_text
+from utility_scripts.system_logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# what a partly streamed reply is turned into when generating fails
+STREAM_FAILED_NOTICE = "Sorry, something went wrong while I was answering."
+
+
+def close_open_code_block(text: str) -> str:
+    """
+    Closes a code block that is still being generated so
+    partial messages render properly while streaming.
+    """
+    fences = sum(1 for line in text.splitlines() if line.strip().startswith("```"))
+    if fences % 2 == 1:
+        return text + "\n```"
+    return text
+
+
+class StreamingReply:
+    """
+    Posts a response to Discord while it is still being generated.
+
+    The first part is sent as soon as the first content token arrives,
+    after that the sent messages are edited (at most once per edit_interval)
+    and new messages are added once the text passes Discord's character limit.
+    """
+
+    def __init__(self, message, edit_interval: float):
+        self.message = message
+        self.edit_interval = edit_interval
+
+        self.sent_messages = []
+        self.sent_parts = []
+        self._last_flush = 0.0
+
+    @property
+    def started(self) -> bool:
+        return len(self.sent_messages) > 0
+
+    @property
+    def first_message(self):
+        return self.sent_messages[0] if self.sent_messages else None
+
+    async def update(self, text: str):
+        """
+        Called with the full response text generated so far.
+        """
+        if not text.strip():
+            return
+
+        now = time.monotonic()
+        if self.started and now - self._last_flush < self.edit_interval:
+            return
+
+        self._last_flush = now
+        parts = split_response(close_open_code_block(clean_response_text(text)))
+        await self._sync_parts(parts)
+
+    async def finish(self, parts: list):
+        """
+        Brings the sent messages in line with the final response parts.
+        Returns the first sent message.
+        """
+        await self._sync_parts(parts)
+
+        # the final split can come out shorter than a partial one
+        while len(self.sent_messages) > max(len(parts), 1):
+            extra = self.sent_messages.pop()
+            self.sent_parts.pop()
+            await extra.delete()
+
+        return self.first_message
+
+    async def abort(self, notice: str = STREAM_FAILED_NOTICE):
+        """
+        Generating failed partway: the first sent message becomes notice
+        and the rest of the partial reply is deleted.
+        Never raises, it runs while another error is being handled.
+        """
+        if not self.started:
+            return
+
+        try:
+            while len(self.sent_messages) > 1:
+                extra = self.sent_messages.pop()
+                self.sent_parts.pop()
+                await extra.delete()
+
+            await self.sent_messages[0].edit(content=notice, suppress=True)
+            self.sent_parts[0] = notice
+        except Exception as e:
+            logger.error(f"Failed to clean up a partly streamed reply: {e}")
+
+    async def _sync_parts(self, parts: list):
+        for i, part in enumerate(parts):
+            if not part.strip():
+                continue
+
+            if i < len(self.sent_messages):
+                if self.sent_parts[i] != part:
+                    await self.sent_messages[i].edit(content=part, suppress=True)
+                    self.sent_parts[i] = part
+                continue
+
+            self.sent_messages.append(await self._send_part(part))
+            self.sent_parts.append(part)
+
+    async def _send_part(self, part: str):
+        # First message reply behavior, same as pl_send_response
+        if not self.sent_messages and not self.message.author.bot:
+            return await self.message.reply(
+                part,
+                suppress_embeds=True,
+                mention_author=False
+            )
+
+        return await self.message.channel.send(
+            part,
+            suppress_embeds=True
+        )
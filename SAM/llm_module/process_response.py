@@ -1,9 +1,13 @@
 from discord_module.utilities.split_message import split_response
 
 
+def clean_response_text(text: str) -> str:
+    return text.replace("'", "\\'")
+
+
 def process_response(response, system_prompt, message_cache):
 
-    cleaned = response.message.content.replace("'", "\\'")
+    cleaned = clean_response_text(response.message.content)
 
     # Extract token usage from response
     token_usage = {
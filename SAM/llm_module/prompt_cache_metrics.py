@@ -0,0 +1,70 @@
+from llm_module.token_counter import prompt_tokens
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# channel_id -> (role, content) of every message in the last prompt sent for that channel
+_last_prompts = {}
+
+
+def _prompt_key(full_prompt) -> list:
+    return [(m.get("role"), m.get("content")) for m in full_prompt]
+
+
+def shared_prefix_length(previous: list, current: list) -> int:
+    """
+    Number of leading messages that are identical in both prompts.
+    """
+    shared = 0
+    for old, new in zip(previous, current):
+        if old != new:
+            break
+        shared += 1
+    return shared
+
+
+def measure_prefix_reuse(channel_id, full_prompt, token_usage: dict) -> dict:
+    """
+    Reports how much of the prompt Ollama served from its prompt prefix cache.
+
+    prompt_eval_count (token_usage["prompt_tokens"]) only counts the tokens the
+    server actually evaluated, so reused = prompt tokens - evaluated, with the
+    prompt size from the local estimate. When the server didn't report a count
+    the reused side falls back to the estimated size of the message prefix
+    shared with the previous prompt of the channel, labelled "estimate".
+    """
+    current = _prompt_key(full_prompt)
+    previous = _last_prompts.get(channel_id, [])
+    _last_prompts[channel_id] = current
+
+    shared = shared_prefix_length(previous, current)
+    total = prompt_tokens(full_prompt)
+    evaluated = token_usage.get("prompt_tokens")
+
+    # the server always evaluates at least one token, 0 or None means no count
+    if isinstance(evaluated, int) and evaluated > 0:
+        reused = max(total - evaluated, 0)
+        source = "server"
+    else:
+        evaluated = 0
+        reused = prompt_tokens(full_prompt[:shared])
+        source = "estimate"
+
+    stats = {
+        "prompt_messages_reused": shared,
+        "prompt_tokens_total": total,
+        "prompt_tokens_reused": reused,
+        "prompt_tokens_evaluated": evaluated,
+        "prompt_reuse_source": source,
+    }
+
+    logger.info(
+        f"Prompt prefix: ~{reused}/{total} tokens reused ({source}), "
+        f"{evaluated} tokens evaluated, {shared}/{len(current)} messages unchanged"
+    )
+    return stats
+
+
+def forget_channel(channel_id):
+    _last_prompts.pop(channel_id, None)
@@ -73,3 +73,25 @@ Before returning your response:
 - Ensure it does not repeat a previous assistant message.
 - Ensure it responds directly to the Message To Respond To.
 """
+
+summary_system_prompt = """
+You maintain a running summary of a Discord conversation that SAM (the assistant) takes part in.
+
+Input:
+- The current summary (may be empty)
+- Older messages that are being removed from the chat history
+
+Task:
+Rewrite the summary so it also covers the older messages.
+
+Keep:
+- Who said what that still matters (use usernames)
+- Ongoing topics, open questions, decisions, and facts users shared about themselves
+- Anything SAM promised or was asked to remember
+
+Drop:
+- Greetings, small talk, and details nobody will need again
+
+Output:
+Return ONLY the updated summary as plain sentences, at most 200 words.
+"""
@@ -0,0 +1,70 @@
+import math
+import re
+
+from functools import lru_cache
+
+# words and single punctuation marks, roughly how BPE tokenizers split text
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# chat template overhead per message (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+CHARS_PER_TOKEN = 4
+
+
+def count_tokens(text: str) -> int:
+    """
+    Fast token estimate without loading a tokenizer.
+
+    Long words split into several tokens, so each word counts
+    one token per 4 characters, punctuation counts one each.
+    """
+    if not text:
+        return 0
+    return sum(math.ceil(len(piece) / CHARS_PER_TOKEN) for piece in TOKEN_PATTERN.findall(text))
+
+
+@lru_cache(maxsize=8192)
+def estimate_tokens(text: str) -> int:
+    """
+    count_tokens, cached because history messages are re-counted every turn.
+    Text seen only once (like file chunks) should use count_tokens.
+    """
+    return count_tokens(text)
+
+
+def message_tokens(message: dict) -> int:
+    return estimate_tokens(message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS
+
+
+def prompt_tokens(messages) -> int:
+    return sum(message_tokens(m) for m in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = "\n[...truncated...]") -> str:
+    """
+    Cuts text down to about max_tokens, keeping the start.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    # start from the character estimate and shrink until it fits
+    cut = max_tokens * CHARS_PER_TOKEN
+    while cut > 0 and count_tokens(text[:cut]) > max_tokens:
+        cut = int(cut * 0.9)
+
+    return text[:cut] + marker
+
+
+def keep_last_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cuts text down to about max_tokens, keeping the end.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    cut = max_tokens * CHARS_PER_TOKEN
+    while cut > 0 and count_tokens(text[-cut:]) > max_tokens:
+        cut = int(cut * 0.9)
+
+    return text[-cut:] if cut > 0 else ""
@@ -1,11 +1,11 @@
 import asyncio
 import os
-import re
 
 from dotenv import load_dotenv
 from elevenlabs.client import ElevenLabs
 from elevenlabs import VoiceSettings
-from elevenlabs.core.api_error import ApiError
+from llm_module.tools.text_to_speech.mp3_concat import concat_mp3
+from llm_module.tools.text_to_speech.tts_backends import TTSBackend
 from utility_scripts.system_logging import setup_logger
 
 # configure logging
@@ -27,70 +27,69 @@ voices_dict = {
 }
 VOICES = voices_dict["VOICES"]
 
-client = ElevenLabs(
-    api_key=f"{API_KEY}"
+MODEL_ID = "eleven_v3"
+OUTPUT_FORMAT = "mp3_44100_128"
+VOICE_SETTINGS = VoiceSettings(
+    stability=0.5,
+    use_speaker_boost=False,
+    similarity_boost=0.5,
+    style=0.5,
+    speed=1.0,
 )
 
 
-def clean_text(text: str) -> str:
-    # Remove *...* and [...] including the markers
-    cleaned = re.sub(r"(\*.*?\*|\[.*?\])", "", text)
-    # Remove specific symbols
-    cleaned = re.sub(r"[!?\@$%^&\";:]", "", cleaned)
-    # Remove extra spaces
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
-    # Limit to at most 10 characters
-    if cleaned == "":
-        cleaned = 'text_to_speech'
-    return cleaned[:14]
-
-
-async def text_to_speech(text: str, file_name='text_to_speech', voice="default"):
-    logger.info("Starting TTS Message")
-
+def voice_id_for(voice) -> str:
     if voice is not None:
-        voice_id = VOICES.get(voice.upper(), VOICES["DEFAULT"])
-    else:
-        voice_id = VOICES["DEFAULT"]
-
-    def _blocking_tts():
-        try:
-            audio = client.text_to_speech.convert(
-                text=text,
-                voice_id=voice_id,
-                model_id="eleven_v3",
-                output_format="mp3_44100_128",
-                voice_settings=VoiceSettings(
-                    stability=0.5,
-                    use_speaker_boost=False,
-                    similarity_boost=0.5,
-                    style=0.5,
-                    speed=1.0,
-                ),
-            )
-
-            # Collect into bytes
-            audio_bytes = b"".join(audio)
-
-            # Save to file
-            file_path = f"{clean_text(file_name)}.mp3"
-            with open(file_path, "wb") as f:
-                f.write(audio_bytes)
-
-            logger.debug(f"✅ Audio saved as {os.path.abspath(file_path)}")
-            return os.path.abspath(file_path)
-
-        except ApiError as e:
-            logger.error(
-                f"API Error while generating TTS: {e}\n"
-                f"Status code: {e.status_code}\n"
-                f"Response body: {e.body}"
-            )
-            return None
-        except Exception as e:
-            logger.exception(f"Unexpected error during TTS: {e}")
-            return None
-
-    # Run the blocking code in a separate thread
-    file_path = await asyncio.to_thread(_blocking_tts)
-    return file_path
+        return VOICES.get(voice.upper(), VOICES["DEFAULT"])
+    return VOICES["DEFAULT"]
+
+
+class ElevenLabsBackend(TTSBackend):
+    """
+    ElevenLabs API, MP3 output. The client is only created on first use.
+    """
+
+    name = "elevenlabs"
+    file_extension = "mp3"
+    remote = True
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self) -> ElevenLabs:
+        if self._client is None:
+            self._client = ElevenLabs(api_key=f"{API_KEY}")
+        return self._client
+
+    def available(self) -> bool:
+        return bool(API_KEY)
+
+    def cache_fields(self, voice: str) -> dict:
+        return {
+            "voice_id": voice_id_for(voice),
+            "model_id": MODEL_ID,
+            "voice_settings": VOICE_SETTINGS.model_dump(),
+            "output_format": OUTPUT_FORMAT,
+        }
+
+    def convert_chunk(self, text: str, voice_id: str, previous_text=None, next_text=None) -> bytes:
+        audio = self.client.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=MODEL_ID,
+            output_format=OUTPUT_FORMAT,
+            voice_settings=VOICE_SETTINGS,
+            previous_text=previous_text,
+            next_text=next_text,
+        )
+
+        # Collect into bytes
+        return b"".join(audio)
+
+    async def synthesize_chunk(self, text: str, voice: str, previous_text=None, next_text=None) -> bytes:
+        # Run the blocking call in a separate thread
+        return await asyncio.to_thread(self.convert_chunk, text, voice_id_for(voice), previous_text, next_text)
+
+    def join(self, clips: list) -> bytes:
+        return concat_mp3(clips)
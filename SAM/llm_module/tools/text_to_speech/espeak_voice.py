@@ -0,0 +1,61 @@
+import asyncio
+import os
+import shutil
+
+from dotenv import load_dotenv
+
+from llm_module.tools.text_to_speech.tts_backends import TTSBackend, join_wav
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# Load Env
+load_dotenv()
+
+ESPEAK_VOICE = os.getenv("ESPEAK_VOICE", "en-us")
+ESPEAK_SPEED = int(os.getenv("ESPEAK_SPEED", 165))
+ESPEAK_TIMEOUT = 30
+
+
+class EspeakBackend(TTSBackend):
+    """
+    Local CPU speech through espeak-ng (or espeak), WAV output.
+    Every voice name maps to ESPEAK_VOICE.
+    """
+
+    name = "espeak"
+    file_extension = "wav"
+
+    def __init__(self):
+        self.executable = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self) -> bool:
+        return self.executable is not None
+
+    def cache_fields(self, voice: str) -> dict:
+        return {"voice": ESPEAK_VOICE, "speed": ESPEAK_SPEED}
+
+    async def synthesize_chunk(self, text: str, voice: str, previous_text=None, next_text=None) -> bytes:
+        process = await asyncio.create_subprocess_exec(
+            self.executable, "--stdout", "--stdin", "-v", ESPEAK_VOICE, "-s", str(ESPEAK_SPEED),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        try:
+            audio, errors = await asyncio.wait_for(process.communicate(text.encode("utf-8")), ESPEAK_TIMEOUT)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+
+        if process.returncode != 0 or not audio:
+            raise RuntimeError(f"{self.executable} exited with {process.returncode}: {errors.decode(errors='replace')}")
+
+        # streamed WAVs carry placeholder sizes, write a proper header
+        return join_wav([audio])
+
+    def join(self, clips: list) -> bytes:
+        return join_wav(clips)
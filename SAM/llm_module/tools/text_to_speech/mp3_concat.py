@@ -0,0 +1,143 @@
+# Frame-accurate joining of MP3 clips.
+#
+# Each clip from the TTS API is a complete file: an ID3v2 tag, a Xing/Info
+# frame describing that clip's length, the audio frames and maybe an ID3v1
+# tag. Gluing files together byte for byte leaves those headers in the middle
+# of the stream and players stop or seek wrong at the first clip's length,
+# so only the audio frames of every clip are kept.
+
+# kbps by bitrate index, per (MPEG version, layer)
+BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+# Hz by sample rate index, per MPEG version (2.5 shares the MPEG 2 bitrates)
+SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    2.5: [11025, 12000, 8000],
+}
+
+VERSIONS = {0b00: 2.5, 0b10: 2, 0b11: 1}
+LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+
+ID3V2_HEADER_SIZE = 10
+ID3V1_SIZE = 128
+
+
+def parse_frame_header(data, offset: int):
+    """
+    (frame length, header fields) for a frame starting at offset, or None.
+    """
+    if offset + 4 > len(data):
+        return None
+
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = VERSIONS.get((b1 >> 3) & 0b11)
+    layer = LAYERS.get((b1 >> 1) & 0b11)
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0b11
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    padding = (b2 >> 1) & 1
+
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 3 and version != 1:
+        length = 72 * bitrate // sample_rate + padding
+    else:
+        length = 144 * bitrate // sample_rate + padding
+
+    return length, {
+        "version": version,
+        "layer": layer,
+        "crc": not (b1 & 1),
+        "mono": (b3 >> 6) == 0b11,
+    }
+
+
+def audio_bounds(data) -> tuple:
+    """
+    (start, end) of the data between a leading ID3v2 tag and a trailing ID3v1 tag.
+    """
+    start = 0
+    while data[start:start + 3] == b"ID3" and len(data) >= start + ID3V2_HEADER_SIZE:
+        flags = data[start + 5]
+        # sizes in ID3v2 are syncsafe, 7 bits per byte
+        size = 0
+        for byte in data[start + 6:start + 10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = ID3V2_HEADER_SIZE if flags & 0x10 else 0
+        start += ID3V2_HEADER_SIZE + size + footer
+
+    end = len(data)
+    if end - start >= ID3V1_SIZE and data[end - ID3V1_SIZE:end - ID3V1_SIZE + 3] == b"TAG":
+        end -= ID3V1_SIZE
+
+    return start, end
+
+
+def is_info_frame(data, offset: int, header: dict) -> bool:
+    """
+    True for the Xing/Info/VBRI frame encoders put first, which holds no audio.
+    """
+    if header["layer"] != 3:
+        return False
+
+    if header["version"] == 1:
+        side_info = 17 if header["mono"] else 32
+    else:
+        side_info = 9 if header["mono"] else 17
+
+    tag_offset = offset + 4 + (2 if header["crc"] else 0) + side_info
+    if data[tag_offset:tag_offset + 4] in (b"Xing", b"Info"):
+        return True
+
+    return data[offset + 36:offset + 40] == b"VBRI"
+
+
+def audio_frames(data: bytes) -> list:
+    """
+    The audio frames of one MP3 file, without tags or the info frame.
+    Bytes that aren't a frame are skipped until the next frame sync,
+    a cut off last frame is dropped.
+    """
+    view = memoryview(data)
+    offset, end = audio_bounds(view)
+
+    frames = []
+    first = True
+    while offset < end:
+        parsed = parse_frame_header(view, offset)
+        if parsed is None or parsed[0] <= 4:
+            offset += 1
+            continue
+
+        length, header = parsed
+        if offset + length > end:
+            break
+
+        if not (first and is_info_frame(view, offset, header)):
+            frames.append(view[offset:offset + length])
+        first = False
+        offset += length
+
+    return frames
+
+
+def concat_mp3(parts: list) -> bytes:
+    """
+    Joins MP3 files into one stream of their audio frames, in order.
+    """
+    return b"".join(frame for part in parts for frame in audio_frames(part))
@@ -0,0 +1,63 @@
+import io
+import wave
+
+from abc import ABC, abstractmethod
+
+
+class TTSBackend(ABC):
+    """
+    One way of turning text into audio.
+
+    The TTS service splits text into chunks and calls synthesize_chunk for
+    each of them (several at once), then join() to stitch the clips together.
+    cache_fields() lists everything besides the text that changes the audio,
+    it becomes part of the cache key.
+    """
+
+    name = "base"
+    file_extension = "mp3"
+    # remote backends get a latency budget before the next backend is tried
+    remote = False
+
+    def available(self) -> bool:
+        return True
+
+    def cache_fields(self, voice: str) -> dict:
+        return {}
+
+    @abstractmethod
+    async def synthesize_chunk(self, text: str, voice: str, previous_text=None, next_text=None) -> bytes:
+        ...
+
+    @abstractmethod
+    def join(self, clips: list) -> bytes:
+        ...
+
+
+def join_wav(clips: list) -> bytes:
+    """
+    Joins WAV clips with the same format into one WAV file.
+    Also rewrites a single clip, fixing the placeholder sizes
+    engines write to their header when streaming to stdout.
+    """
+    params = None
+    frames = []
+
+    for clip in clips:
+        with wave.open(io.BytesIO(clip), "rb") as reader:
+            clip_params = (reader.getnchannels(), reader.getsampwidth(), reader.getframerate())
+            if params is None:
+                params = clip_params
+            elif clip_params != params:
+                raise ValueError(f"Can't join WAV clips of different formats: {params} and {clip_params}")
+            frames.append(reader.readframes(reader.getnframes()))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(params[0])
+        writer.setsampwidth(params[1])
+        writer.setframerate(params[2])
+        writer.writeframes(b"".join(frames))
+
+    return buffer.getvalue()
+
@@ -0,0 +1,54 @@
+import asyncio
+import json
+import os
+
+from pathlib import Path
+
+from utility_scripts.disk_lru_cache import DiskLRUCache
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / "tts_cache"
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+
+tts_cache = DiskLRUCache(os.getenv("TTS_CACHE_DIR", DEFAULT_CACHE_DIR), TTS_CACHE_MAX_BYTES)
+
+
+def get_tts_cache() -> DiskLRUCache:
+    return tts_cache
+
+
+def normalize_text(text: str | None) -> str:
+    # spacing doesn't change the audio, wording and case can
+    return " ".join(text.split()) if text else ""
+
+
+def tts_cache_key(text: str, backend_fields: dict, previous_text: str = None, next_text: str = None) -> str:
+    """
+    Everything that changes the synthesized audio of one chunk: the text,
+    the backend's voice, model, settings and output format, and the
+    neighbouring text the chunk was voiced with.
+    """
+    return json.dumps({
+        "text": normalize_text(text),
+        "backend": backend_fields,
+        "previous_text": normalize_text(previous_text),
+        "next_text": normalize_text(next_text),
+    }, sort_keys=True)
+
+
+async def load_audio(key: str) -> bytes | None:
+    try:
+        return await asyncio.to_thread(tts_cache.get, key)
+    except OSError as e:
+        logger.warning(f"TTS cache read failed: {e}")
+        return None
+
+
+async def store_audio(key: str, audio: bytes):
+    try:
+        await asyncio.to_thread(tts_cache.put, key, audio)
+    except OSError as e:
+        logger.warning(f"TTS cache write failed: {e}")
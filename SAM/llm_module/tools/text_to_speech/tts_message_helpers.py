@@ -1,8 +1,8 @@
-import os
+import io
 import re
 import discord
 
-from llm_module.tools.text_to_speech.elevenlabs_voice import text_to_speech
+from llm_module.tools.text_to_speech.tts_service import text_to_speech
 from utility_scripts.system_logging import setup_logger
 
 # configure logging
@@ -21,19 +21,23 @@ def message_is_tts(message):
     return is_tts_message, message_content
 
 
+def audio_file(tts_audio) -> discord.File:
+    audio_bytes, filename = tts_audio
+    return discord.File(io.BytesIO(audio_bytes), filename=filename)
+
+
 async def send_tts(interaction_or_message, text, reply_target=None):
     text_filtered = re.sub(r"\*(.*?)\*", r"[\1]", text)
-    tts_file = await text_to_speech(text_filtered)
-    if not tts_file:
+    tts_audio = await text_to_speech(text_filtered)
+    if not tts_audio:
         logger.error('TTS Error')
         await (interaction_or_message.followup.send if hasattr(interaction_or_message, "followup")
                else interaction_or_message.channel.send)("Error making TTS.")
         return
     if reply_target:
-        await reply_target.reply(file=discord.File(tts_file))
+        await reply_target.reply(file=audio_file(tts_audio))
     else:
         if hasattr(interaction_or_message, "followup"):
-            await interaction_or_message.followup.send(file=discord.File(tts_file))
+            await interaction_or_message.followup.send(file=audio_file(tts_audio))
         else:
-            await interaction_or_message.channel.send(file=discord.File(tts_file))
-    os.remove(tts_file)
+            await interaction_or_message.channel.send(file=audio_file(tts_audio))
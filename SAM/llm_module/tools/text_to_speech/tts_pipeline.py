@@ -0,0 +1,126 @@
+import asyncio
+import re
+
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# text per synthesis request, whole sentences are grouped up to this
+MAX_CHUNK_CHARS = 400
+# chunks being synthesized at once for one clip
+MAX_CONCURRENT_CHUNKS = 3
+
+# a sentence runs up to end punctuation (and any closing quotes) followed by
+# whitespace or the end of the text, or up to a line break. Decimals, domains
+# and versions have no space after their dots so they stay whole. Every piece
+# keeps the whitespace after it so the pieces join back into the original text.
+SENTENCE_PATTERN = re.compile(r"\S.*?(?:[.!?…]+[\"')\]]*(?:\s+|$)|\n\s*|$)", re.DOTALL)
+WORD_PATTERN = re.compile(r"\S+\s*")
+
+# a sentence ending in one of these carries on into the next one
+ABBREVIATIONS = frozenset({
+    "e.g.", "i.e.", "etc.", "vs.", "approx.", "mr.", "mrs.", "ms.", "dr.", "prof.", "st.", "no.",
+})
+
+
+def sentence_pieces(text: str) -> list:
+    """
+    The sentences of text, each with the whitespace that follows it.
+    """
+    pieces = []
+    for piece in SENTENCE_PATTERN.findall(text):
+        if pieces and pieces[-1].split()[-1].lower() in ABBREVIATIONS and not pieces[-1].endswith("\n"):
+            pieces[-1] += piece
+        else:
+            pieces.append(piece)
+    return pieces
+
+
+def split_sentences(text: str) -> list:
+    return [piece.strip() for piece in sentence_pieces(text)]
+
+
+def split_long_sentence(sentence: str, max_chars: int) -> list:
+    # no sentence breaks to use, fall back to word boundaries
+    pieces = []
+    current = ""
+    for word in WORD_PATTERN.findall(sentence):
+        if current and len(current + word.rstrip()) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current += word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_text(text: str, max_chars: int = MAX_CHUNK_CHARS) -> list:
+    """
+    Groups whole sentences into chunks of at most max_chars.
+    Within a chunk the text is exactly as given, only the chunk ends are stripped.
+    """
+    chunks = []
+    current = ""
+
+    for piece in sentence_pieces(text):
+        if len(piece.strip()) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(split_long_sentence(piece, max_chars))
+            continue
+
+        if current and len(current + piece.rstrip()) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current += piece
+
+    if current:
+        chunks.append(current)
+
+    return [chunk.strip() for chunk in chunks if chunk.strip()]
+
+
+async def synthesize_chunks(chunks: list, synthesize_chunk, max_concurrent: int = MAX_CONCURRENT_CHUNKS) -> list:
+    """
+    Runs synthesize_chunk(text, previous_text, next_text) for every chunk,
+    at most max_concurrent at once, and returns the audio in chunk order.
+    The neighbouring text keeps the intonation flowing across chunk edges.
+
+    The first failure cancels the chunks still waiting and is raised.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def _synthesize(index):
+        async with semaphore:
+            previous_text = chunks[index - 1] if index > 0 else None
+            next_text = chunks[index + 1] if index + 1 < len(chunks) else None
+            return await synthesize_chunk(chunks[index], previous_text, next_text)
+
+    tasks = [asyncio.ensure_future(_synthesize(index)) for index in range(len(chunks))]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def synthesize_text(text: str, synthesize_chunk, join, max_chars: int = MAX_CHUNK_CHARS) -> bytes | None:
+    """
+    Splits text by sentence, synthesizes the chunks concurrently
+    and joins the audio with join(list of clips).
+    """
+    chunks = chunk_text(text, max_chars)
+    if not chunks:
+        return None
+
+    logger.debug(f"TTS: {len(chunks)} chunks for {len(text)} characters")
+    clips = await synthesize_chunks(chunks, synthesize_chunk)
+
+    if len(clips) == 1:
+        return clips[0]
+    return join(clips)
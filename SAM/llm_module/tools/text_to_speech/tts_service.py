@@ -0,0 +1,167 @@
+import asyncio
+import os
+import re
+import uuid
+
+from dotenv import load_dotenv
+from elevenlabs.core.api_error import ApiError
+
+from llm_module.tools.text_to_speech.elevenlabs_voice import ElevenLabsBackend
+from llm_module.tools.text_to_speech.espeak_voice import EspeakBackend
+from llm_module.tools.text_to_speech.tts_cache import load_audio, store_audio, tts_cache_key
+from llm_module.tools.text_to_speech.tts_pipeline import synthesize_text
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+# Load Env
+load_dotenv()
+
+BACKEND_TYPES = {
+    "elevenlabs": ElevenLabsBackend,
+    "espeak": EspeakBackend,
+}
+
+# tried in this order, the next one takes over when one fails
+TTS_BACKENDS = [name.strip() for name in os.getenv("TTS_BACKENDS", "elevenlabs,espeak").split(",") if name.strip()]
+# seconds a remote backend gets before falling back, when there is a backend to fall back to
+TTS_LATENCY_BUDGET = float(os.getenv("TTS_LATENCY_BUDGET", 45))
+
+_backends = None
+# remote chunk requests left running after their caller gave up
+_detached_chunks = set()
+
+
+def get_backends() -> list:
+    global _backends
+    if _backends is None:
+        _backends = []
+        for name in TTS_BACKENDS:
+            backend_type = BACKEND_TYPES.get(name)
+            if backend_type is None:
+                logger.warning(f"Unknown TTS backend: {name}")
+                continue
+
+            backend = backend_type()
+            if not backend.available():
+                logger.warning(f"TTS backend {name} is not available, skipping")
+                continue
+
+            _backends.append(backend)
+
+        logger.info(f"TTS backends: {[b.name for b in _backends]}")
+    return _backends
+
+
+def clean_text(text: str) -> str:
+    # Remove *...* and [...] including the markers
+    cleaned = re.sub(r"(\*.*?\*|\[.*?\])", "", text)
+    # Remove specific symbols
+    cleaned = re.sub(r"[!?\@$%^&\";:]", "", cleaned)
+    # Remove extra spaces
+    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    # Limit to at most 14 characters
+    if cleaned == "":
+        cleaned = 'text_to_speech'
+    return cleaned[:14]
+
+
+def _detached_done(task):
+    _detached_chunks.discard(task)
+    # nobody may be waiting any more, retrieve the error so it isn't reported as lost
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Detached TTS chunk failed: {task.exception()}")
+
+
+def run_detached(coro):
+    """
+    Runs coro as its own task and waits for it. If the waiter is cancelled
+    (the latency budget ran out) the task keeps going, so a request that is
+    already being paid for still finishes and lands in the cache.
+    """
+    task = asyncio.ensure_future(coro)
+    _detached_chunks.add(task)
+    task.add_done_callback(_detached_done)
+    return asyncio.shield(task)
+
+
+async def synthesize_with(backend, text: str, voice) -> bytes | None:
+    cache_fields = {"backend": backend.name, **backend.cache_fields(voice)}
+
+    async def _convert(chunk, previous_text, next_text, cache_key):
+        audio = await backend.synthesize_chunk(chunk, voice, previous_text, next_text)
+        await store_audio(cache_key, audio)
+        return audio
+
+    async def _synthesize_chunk(chunk, previous_text, next_text):
+        cache_key = tts_cache_key(chunk, cache_fields, previous_text, next_text)
+        audio = await load_audio(cache_key)
+        if audio is not None:
+            logger.debug("TTS cache hit")
+            return audio
+
+        # remote calls run in threads that can't be cancelled, let them finish
+        # into the cache; chunks that haven't started yet are still cancelled
+        if backend.remote:
+            return await run_detached(_convert(chunk, previous_text, next_text, cache_key))
+        return await _convert(chunk, previous_text, next_text, cache_key)
+
+    return await synthesize_text(text, _synthesize_chunk, backend.join)
+
+
+async def synthesize_speech(text: str, voice="default", backends=None):
+    """
+    (audio bytes, backend that made them), or None when every backend failed.
+    """
+    if backends is None:
+        backends = get_backends()
+
+    for i, backend in enumerate(backends):
+        has_fallback = i + 1 < len(backends)
+
+        try:
+            if backend.remote and has_fallback:
+                audio = await asyncio.wait_for(synthesize_with(backend, text, voice), TTS_LATENCY_BUDGET)
+            else:
+                audio = await synthesize_with(backend, text, voice)
+
+        except asyncio.TimeoutError:
+            logger.error(f"TTS backend {backend.name} took over {TTS_LATENCY_BUDGET}s")
+            continue
+        except ApiError as e:
+            logger.error(
+                f"API Error while generating TTS: {e}\n"
+                f"Status code: {e.status_code}\n"
+                f"Response body: {e.body}"
+            )
+            continue
+        except Exception as e:
+            logger.exception(f"Unexpected error during TTS with {backend.name}: {e}")
+            continue
+
+        if audio:
+            return audio, backend
+
+    return None
+
+
+def audio_filename(file_name: str, extension: str) -> str:
+    # readable prefix, random suffix so concurrent clips never share a name
+    return f"{clean_text(file_name)}_{uuid.uuid4().hex[:8]}.{extension}"
+
+
+async def text_to_speech(text: str, file_name='text_to_speech', voice="default"):
+    """
+    (audio bytes, unique file name) or None. Nothing is written to disk.
+    """
+    logger.info("Starting TTS Message")
+
+    result = await synthesize_speech(text, voice)
+    if result is None:
+        return None
+    audio_bytes, backend = result
+
+    filename = audio_filename(file_name, backend.file_extension)
+    logger.debug(f"✅ Audio ready as {filename} ({len(audio_bytes)} bytes)")
+    return audio_bytes, filename
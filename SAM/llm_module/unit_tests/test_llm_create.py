@@ -0,0 +1,32 @@
+import pytest
+
+from llm_module import llm_create as llm_create_module
+
+
+class FakeClient:
+    instances = []
+
+    def __init__(self, host=None):
+        self.host = host
+        self.closed = False
+        FakeClient.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+    def create(self, **kwargs):
+        raise RuntimeError("warm-up failed")
+
+
+def test_failed_warm_up_still_closes_the_client(monkeypatch):
+    FakeClient.instances = []
+    monkeypatch.setattr(llm_create_module, "Client", FakeClient)
+
+    with pytest.raises(SystemExit):
+        llm_create_module.llm_create()
+
+    assert FakeClient.instances
+    assert all(client.closed for client in FakeClient.instances)
@@ -0,0 +1,140 @@
+import asyncio
+
+from llm_module.llm_scheduler import LLMScheduler, PRIORITY_BACKGROUND, PRIORITY_DIRECT, PRIORITY_KEYWORD
+
+
+async def drain(scheduler):
+    while scheduler.queued() or scheduler.running():
+        await asyncio.sleep(0.005)
+
+
+def test_direct_requests_run_before_keyword_triggers():
+    order = []
+
+    async def handler(label):
+        order.append(label)
+        await asyncio.sleep(0.005)
+
+    async def main():
+        scheduler = LLMScheduler(max_workers=1, max_queue=10, max_per_user=10)
+        # the first job occupies the only worker while the rest queue up
+        await scheduler.submit(handler, "first", priority=PRIORITY_KEYWORD, user_id=1, channel_id=1)
+        await asyncio.sleep(0)
+        await scheduler.submit(handler, "keyword", priority=PRIORITY_KEYWORD, user_id=2, channel_id=2)
+        await scheduler.submit(handler, "direct", priority=PRIORITY_DIRECT, user_id=3, channel_id=3)
+        await drain(scheduler)
+
+    asyncio.run(main())
+    assert order == ["first", "direct", "keyword"]
+
+
+def test_same_channel_never_runs_concurrently():
+    running = {"now": 0, "peak": 0}
+
+    async def handler():
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+
+    async def main():
+        scheduler = LLMScheduler(max_workers=4, max_queue=10, max_per_user=10)
+        for user_id in range(4):
+            await scheduler.submit(handler, user_id=user_id, channel_id=1)
+        await drain(scheduler)
+
+    asyncio.run(main())
+    assert running["peak"] == 1
+
+
+def test_users_are_interleaved_fairly():
+    order = []
+
+    async def handler(label):
+        order.append(label)
+        await asyncio.sleep(0.005)
+
+    async def main():
+        scheduler = LLMScheduler(max_workers=1, max_queue=10, max_per_user=10)
+        await scheduler.submit(handler, "blocker", user_id=0, channel_id=0)
+        await asyncio.sleep(0)
+        for label in ("a1", "a2", "a3"):
+            await scheduler.submit(handler, label, user_id="a", channel_id=1)
+        await scheduler.submit(handler, "b1", user_id="b", channel_id=2)
+        await drain(scheduler)
+
+    asyncio.run(main())
+    assert order == ["blocker", "a1", "b1", "a2", "a3"]
+
+
+def test_channel_keeps_its_order_across_users():
+    order = []
+
+    async def handler(label):
+        order.append(label)
+        await asyncio.sleep(0.005)
+
+    async def main():
+        scheduler = LLMScheduler(max_workers=1, max_queue=10, max_per_user=10)
+        await scheduler.submit(handler, "blocker", user_id=0, channel_id=0)
+        await asyncio.sleep(0)
+        # x already has work queued, so fairness alone would put y's message first
+        await scheduler.submit(handler, "x-elsewhere", user_id="x", channel_id=2)
+        await scheduler.submit(handler, "x1", user_id="x", channel_id=1)
+        await scheduler.submit(handler, "y1", user_id="y", channel_id=1)
+        await drain(scheduler)
+
+    asyncio.run(main())
+    assert order.index("x1") < order.index("y1")
+
+
+def test_requests_are_shed_when_queue_is_full():
+    async def handler():
+        await asyncio.sleep(0.01)
+
+    async def main():
+        scheduler = LLMScheduler(max_workers=1, max_queue=2, max_per_user=2)
+        results = [
+            await scheduler.submit(handler, user_id=1, channel_id=1),
+            await scheduler.submit(handler, user_id=1, channel_id=1),
+            # per user limit
+            await scheduler.submit(handler, user_id=1, channel_id=1),
+            # global limit
+            await scheduler.submit(handler, user_id=2, channel_id=2),
+        ]
+        await drain(scheduler)
+        return results
+
+    assert asyncio.run(main()) == [True, True, False, False]
+
+
+def test_background_jobs_have_their_own_cap_and_make_room_for_users():
+    shed = []
+
+    async def handler():
+        await asyncio.sleep(0.01)
+
+    async def main():
+        scheduler = LLMScheduler(max_workers=1, max_queue=3, max_per_user=5, max_background=2)
+        await scheduler.submit(handler, user_id=0, channel_id=0)
+        await asyncio.sleep(0)
+
+        results = [
+            await scheduler.submit(handler, priority=PRIORITY_BACKGROUND, user_id="bg", channel_id="s1",
+                                   on_shed=lambda: shed.append("s1")),
+            await scheduler.submit(handler, priority=PRIORITY_BACKGROUND, user_id="bg", channel_id="s2",
+                                   on_shed=lambda: shed.append("s2")),
+            # background cap
+            await scheduler.submit(handler, priority=PRIORITY_BACKGROUND, user_id="bg", channel_id="s3"),
+            await scheduler.submit(handler, user_id=1, channel_id=1),
+            # queue full, background jobs make room, newest first
+            await scheduler.submit(handler, user_id=2, channel_id=2),
+            await scheduler.submit(handler, user_id=3, channel_id=3),
+            # no background job left to shed
+            await scheduler.submit(handler, user_id=4, channel_id=4),
+        ]
+        await drain(scheduler)
+        return results
+
+    assert asyncio.run(main()) == [True, True, False, True, True, True, False]
+    assert shed == ["s2", "s1"]
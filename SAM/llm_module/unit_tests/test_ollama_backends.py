@@ -0,0 +1,203 @@
+import asyncio
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ollama import AsyncClient, ResponseError
+
+from llm_module.ollama_backends import OllamaBackendPool
+
+
+class FakeOllama:
+    """
+    Minimal local Ollama HTTP server, enough for /api/tags and /api/chat.
+    """
+
+    def __init__(self, name, models=("SAM:latest",), broken=False):
+        self.name = name
+        self.models = list(models)
+        self.broken = broken
+        self.chat_requests = 0
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type="application/json"):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if fake.broken:
+                    return self._send(500, json.dumps({"error": "down"}))
+                models = [{"model": m, "name": m} for m in fake.models]
+                self._send(200, json.dumps({"models": models}))
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.chat_requests += 1
+
+                if fake.broken:
+                    return self._send(500, json.dumps({"error": "down"}))
+
+                message = {"role": "assistant", "content": f"hello from {fake.name}"}
+                if request.get("stream"):
+                    lines = [
+                        json.dumps({"model": request["model"], "message": message, "done": False}),
+                        json.dumps({"model": request["model"], "message": {"role": "assistant", "content": ""},
+                                    "done": True, "eval_count": 3}),
+                    ]
+                    return self._send(200, "\n".join(lines) + "\n", "application/x-ndjson")
+
+                self._send(200, json.dumps({"model": request["model"], "message": message, "done": True}))
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.host = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_hosts():
+    hosts = []
+    yield hosts
+    for host in hosts:
+        host.close()
+
+
+def make_pool(*fakes):
+    return OllamaBackendPool([fake.host for fake in fakes], client_factory=lambda host: AsyncClient(host=host))
+
+
+def chat_kwargs(model="SAM", **extra):
+    return {"model": model, "messages": [{"role": "user", "content": "hi"}], **extra}
+
+
+def test_fails_over_to_healthy_backend(fake_hosts):
+    broken = FakeOllama("broken", broken=True)
+    working = FakeOllama("working")
+    fake_hosts.extend([broken, working])
+
+    async def main():
+        pool = make_pool(broken, working)
+        responses = [await pool.chat(**chat_kwargs()) for _ in range(3)]
+        await pool.stop_health_checks()
+        return pool, responses
+
+    pool, responses = asyncio.run(main())
+
+    assert all(r.message.content == "hello from working" for r in responses)
+    assert not pool.backends[0].healthy
+    # once unhealthy (errors or a failed probe) the broken host is no longer tried first
+    assert 1 <= broken.chat_requests < 3
+
+
+def test_routes_by_model_after_probe(fake_hosts):
+    chat_host = FakeOllama("chat", models=("SAM:latest",))
+    vision_host = FakeOllama("vision", models=("qwen3-vl:4b",))
+    fake_hosts.extend([chat_host, vision_host])
+
+    async def main():
+        pool = make_pool(chat_host, vision_host)
+        await pool.probe_all()
+        chat = await pool.chat(**chat_kwargs("SAM"))
+        vision = await pool.chat(**chat_kwargs("qwen3-vl:4b"))
+        await pool.stop_health_checks()
+        return chat, vision
+
+    chat, vision = asyncio.run(main())
+    assert chat.message.content == "hello from chat"
+    assert vision.message.content == "hello from vision"
+
+
+def test_picks_least_loaded_backend(fake_hosts):
+    first = FakeOllama("first")
+    second = FakeOllama("second")
+    fake_hosts.extend([first, second])
+
+    pool = make_pool(first, second)
+    pool.backends[0].in_flight = 3
+
+    assert pool.pick("SAM") is pool.backends[1]
+
+
+def test_stream_fails_over_before_first_chunk(fake_hosts):
+    broken = FakeOllama("broken", broken=True)
+    working = FakeOllama("working")
+    fake_hosts.extend([broken, working])
+
+    async def main():
+        pool = make_pool(broken, working)
+        chunks = [chunk async for chunk in await pool.chat(**chat_kwargs(stream=True))]
+        await pool.stop_health_checks()
+        return pool, chunks
+
+    pool, chunks = asyncio.run(main())
+    assert chunks[0].message.content == "hello from working"
+    assert chunks[-1].done
+    assert all(backend.in_flight == 0 for backend in pool.backends)
+
+
+class ScriptedClient:
+    """
+    Stand-in client whose chat() raises error (before a stream is opened) or answers.
+    """
+
+    def __init__(self, error=None, answer=None):
+        self.error = error
+        self.answer = answer
+
+    async def chat(self, **kwargs):
+        if self.error is not None:
+            raise self.error
+
+        async def stream():
+            yield self.answer
+
+        return stream() if kwargs.get("stream") else self.answer
+
+
+def scripted_pool(*clients):
+    by_host = {f"host{i}": client for i, client in enumerate(clients)}
+    return OllamaBackendPool(list(by_host), client_factory=by_host.__getitem__)
+
+
+def test_last_backend_error_is_raised_when_no_host_is_left():
+    failing = ScriptedClient(error=ResponseError("server exploded", 500))
+    pool = scripted_pool(failing, ScriptedClient(answer="unused"))
+    # the second host doesn't have the model, so only the first can be tried
+    pool.backends[1].models = {"other:latest"}
+
+    async def main():
+        try:
+            await pool.chat(**chat_kwargs())
+        finally:
+            await pool.stop_health_checks()
+
+    with pytest.raises(ResponseError, match="server exploded"):
+        asyncio.run(main())
+
+
+def test_stream_fails_over_when_opening_the_stream_fails():
+    pool = scripted_pool(ScriptedClient(error=ConnectionError("refused")), ScriptedClient(answer="hello"))
+
+    async def main():
+        chunks = [chunk async for chunk in await pool.chat(**chat_kwargs(stream=True))]
+        await pool.stop_health_checks()
+        return chunks
+
+    assert asyncio.run(main()) == ["hello"]
+    assert pool.backends[0].failures == 1
+    assert all(backend.in_flight == 0 for backend in pool.backends)
@@ -0,0 +1,36 @@
+from llm_module import prompt_cache_metrics
+from llm_module.prompt_cache_metrics import measure_prefix_reuse
+from llm_module.token_counter import prompt_tokens
+
+
+def prompt(*contents):
+    return [{"role": "user", "content": content} for content in contents]
+
+
+def test_reuse_comes_from_the_server_count(monkeypatch):
+    monkeypatch.setattr(prompt_cache_metrics, "_last_prompts", {})
+    full_prompt = prompt("system prompt " * 50, "old message " * 20, "new message")
+    total = prompt_tokens(full_prompt)
+
+    stats = measure_prefix_reuse(1, full_prompt, {"prompt_tokens": 12})
+
+    assert stats["prompt_reuse_source"] == "server"
+    assert stats["prompt_tokens_total"] == total
+    assert stats["prompt_tokens_reused"] == total - 12
+    assert stats["prompt_tokens_evaluated"] == 12
+
+    # nothing reused when the server evaluated everything (or more)
+    assert measure_prefix_reuse(2, full_prompt, {"prompt_tokens": total + 5})["prompt_tokens_reused"] == 0
+
+
+def test_missing_server_count_falls_back_to_the_shared_prefix(monkeypatch):
+    monkeypatch.setattr(prompt_cache_metrics, "_last_prompts", {})
+    first = prompt("system prompt", "message one")
+    second = prompt("system prompt", "message one", "message two")
+
+    measure_prefix_reuse(1, first, {"prompt_tokens": None})
+    stats = measure_prefix_reuse(1, second, {})
+
+    assert stats["prompt_reuse_source"] == "estimate"
+    assert stats["prompt_messages_reused"] == 2
+    assert stats["prompt_tokens_reused"] == prompt_tokens(first)
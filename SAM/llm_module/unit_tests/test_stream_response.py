@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from llm_module import llm_pipeline
+from discord_module.utilities.split_message import split_response
+from llm_module.pipeline.pl_stream_response import STREAM_FAILED_NOTICE, StreamingReply, close_open_code_block
+
+
+class FakeSentMessage:
+    def __init__(self, channel, content):
+        self.channel = channel
+        self.content = content
+
+    async def edit(self, content, suppress=False):
+        self.content = content
+        self.channel.edits += 1
+
+    async def delete(self):
+        self.channel.sent.remove(self)
+
+
+class FakeTyping:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+        self.edits = 0
+
+    def typing(self):
+        return FakeTyping()
+
+    async def send(self, content, **kwargs):
+        sent = FakeSentMessage(self, content)
+        self.sent.append(sent)
+        return sent
+
+
+class FakeAuthor:
+    bot = False
+    name = "user"
+
+
+class FakeMessage:
+    def __init__(self):
+        self.author = FakeAuthor()
+        self.channel = FakeChannel()
+        self.clean_content = "hi"
+
+    async def reply(self, content, **kwargs):
+        return await self.channel.send(content)
+
+
+def test_close_open_code_block():
+    assert close_open_code_block("```py\nprint(1)") == "```py\nprint(1)\n```"
+    assert close_open_code_block("```py\nprint(1)\n```") == "```py\nprint(1)\n```"
+
+
+def test_first_content_is_posted_immediately_then_edited():
+    message = FakeMessage()
+
+    async def main():
+        reply = StreamingReply(message, edit_interval=0)
+        await reply.update("")
+        assert not reply.started
+
+        await reply.update("Hello")
+        assert [m.content for m in message.channel.sent] == ["Hello"]
+
+        await reply.update("Hello there")
+        return await reply.finish(["Hello there friend"])
+
+    first = asyncio.run(main())
+    assert first.content == "Hello there friend"
+    assert len(message.channel.sent) == 1
+    assert message.channel.edits == 2
+
+
+def test_long_stream_spills_into_new_messages():
+    message = FakeMessage()
+    text = ("word " * 600).strip()
+
+    async def main():
+        reply = StreamingReply(message, edit_interval=0)
+        await reply.update(text[:1000])
+        await reply.update(text)
+        await reply.finish(split_response(text))
+
+    asyncio.run(main())
+    assert len(message.channel.sent) == 2
+    assert all(len(m.content) <= 2000 for m in message.channel.sent)
+
+
+def test_failed_stream_leaves_only_an_error_notice(monkeypatch):
+    message = FakeMessage()
+    text = ("word " * 600).strip()
+
+    async def failing_generate(bot, message, message_content, stream_reply):
+        await stream_reply.update(text)
+        raise ConnectionError("stream dropped")
+
+    monkeypatch.setattr(llm_pipeline.CONFIG, "STREAM_RESPONSES", True)
+    monkeypatch.setattr(llm_pipeline.CONFIG, "STREAM_EDIT_INTERVAL", 0)
+    monkeypatch.setattr(llm_pipeline, "generate_response", failing_generate)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(llm_pipeline.llm_chat(None, message))
+
+    assert [m.content for m in message.channel.sent] == [STREAM_FAILED_NOTICE]
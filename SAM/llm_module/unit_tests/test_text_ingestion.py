@@ -0,0 +1,78 @@
+from llm_module.attachment_processing import text_ingestion
+from llm_module.attachment_processing.text_ingestion import (
+    SKIPPED_MARKER, decode_chunks, extract_keywords, ingest_text, looks_binary
+)
+from llm_module.token_counter import estimate_tokens
+
+
+def make_log(lines: int, special_line: int = None) -> bytes:
+    rows = []
+    for i in range(lines):
+        if i == special_line:
+            rows.append(f"line {i:06d} ERROR disk quota exceeded on volume")
+        else:
+            rows.append(f"line {i:06d} all systems nominal")
+    return ("\n".join(rows) + "\n").encode("utf-8")
+
+
+def test_small_files_are_kept_whole():
+    data = "hello\nworld\n".encode("utf-8")
+    assert ingest_text(data, "utf-8", token_budget=100) == "hello\nworld\n"
+
+
+def test_binary_content_is_refused():
+    assert looks_binary(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR")
+    assert ingest_text(b"\x00\x01\x02" * 1000, "utf-8", token_budget=100) is None
+    assert not looks_binary("plain text".encode("utf-16"), "utf-16")
+
+
+def test_multibyte_characters_survive_chunk_edges(monkeypatch):
+    monkeypatch.setattr(text_ingestion, "DECODE_STEP", 7)
+    text = "héllo wörld ünïcode ✓\n" * 20
+    assert "".join(decode_chunks(text.encode("utf-8"), "utf-8", chunk_chars=16)) == text
+
+
+def test_large_files_keep_head_tail_and_keyword_hits():
+    data = make_log(50_000, special_line=25_000)
+
+    content = ingest_text(data, "utf-8", token_budget=2000, question="why is the disk quota exceeded?")
+
+    assert estimate_tokens(content) <= 2000
+    assert content.startswith("line 000000")
+    assert "line 049999" in content
+    assert "ERROR disk quota exceeded" in content
+    assert SKIPPED_MARKER in content
+
+
+def test_keywords_skip_short_and_stop_words():
+    assert extract_keywords("What is in this DISK log? disk!") == ["disk"]
+
+
+def make_timestamped_log(lines: int, special_line: int = None) -> bytes:
+    rows = []
+    for i in range(lines):
+        level = "ERROR" if i == special_line else "INFO"
+        rows.append(f"2024-05-01T12:{i // 60 % 60:02d}:{i % 60:02d}.{i % 1000:03d}Z [{level}] svc.api: req=/v1/items?id={i} status=200 t=0.{i % 97:02d}s id={i}")
+    return ("\n".join(rows) + "\n").encode("utf-8")
+
+
+def test_punctuation_heavy_logs_keep_tail_and_keyword_hits():
+    data = make_timestamped_log(50_000, special_line=25_000)
+
+    content = ingest_text(data, "utf-8", token_budget=2000, question="what caused the ERROR?")
+
+    assert estimate_tokens(content) <= 2000
+    assert content.startswith("2024-05-01T12:00:00.000Z")
+    assert content.rstrip().endswith("id=49999")
+    assert "[ERROR]" in content
+    assert "truncated" not in content
+
+
+def test_punctuation_heavy_logs_without_question_keep_tail():
+    data = make_timestamped_log(5_000)
+
+    content = ingest_text(data, "utf-8", token_budget=500)
+
+    assert estimate_tokens(content) <= 500
+    assert content.rstrip().endswith("id=4999")
+    assert SKIPPED_MARKER in content
@@ -0,0 +1,22 @@
+from llm_module.token_counter import estimate_tokens, prompt_tokens, truncate_to_tokens
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("hi you") == 2
+    assert estimate_tokens("hello, world!") == 6
+    assert estimate_tokens("a" * 40) == 10
+
+
+def test_prompt_tokens_counts_message_overhead():
+    messages = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": ""}]
+    assert prompt_tokens(messages) == 1 + 4 + 4
+
+
+def test_truncate_to_tokens():
+    text = "word " * 1000
+    truncated = truncate_to_tokens(text, 100, marker="")
+
+    assert estimate_tokens(truncated) <= 100
+    assert text.startswith(truncated)
+    assert truncate_to_tokens("short", 100) == "short"
@@ -0,0 +1,99 @@
+import asyncio
+
+from llm_module.tools.text_to_speech.mp3_concat import audio_frames, concat_mp3
+from llm_module.tools.text_to_speech.tts_cache import tts_cache_key
+from llm_module.tools.text_to_speech.tts_pipeline import chunk_text, split_sentences, synthesize_chunks
+
+# MPEG 1 layer III, 128 kbps, 44.1 kHz, stereo, no padding: 417 byte frames
+FRAME_HEADER = b"\xff\xfb\x90\x00"
+FRAME_LENGTH = 417
+
+
+def frame(fill: bytes) -> bytes:
+    return FRAME_HEADER + fill * (FRAME_LENGTH - 4)
+
+
+def info_frame() -> bytes:
+    body = bytearray(FRAME_LENGTH - 4)
+    body[32:36] = b"Info"
+    return FRAME_HEADER + bytes(body)
+
+
+def mp3_file(*fills) -> bytes:
+    id3v2 = b"ID3\x04\x00\x00" + b"\x00\x00\x00\x0a" + b"\x00" * 10
+    id3v1 = b"TAG" + b"\x00" * 125
+    return id3v2 + info_frame() + b"".join(frame(f) for f in fills) + id3v1
+
+
+def test_concat_keeps_only_audio_frames_in_order():
+    joined = concat_mp3([mp3_file(b"a", b"b"), mp3_file(b"c")])
+
+    assert len(joined) == 3 * FRAME_LENGTH
+    assert joined == frame(b"a") + frame(b"b") + frame(b"c")
+
+
+def test_cut_off_last_frame_is_dropped():
+    data = mp3_file(b"a") + frame(b"b")[:100]
+    assert [bytes(f) for f in audio_frames(data)] == [frame(b"a")]
+
+
+def test_sentences_are_grouped_into_chunks():
+    text = "Hello there. How are you? I am fine!\nNew line here"
+    assert split_sentences(text) == ["Hello there.", "How are you?", "I am fine!", "New line here"]
+    assert chunk_text(text, max_chars=30) == ["Hello there. How are you?", "I am fine!\nNew line here"]
+
+
+def test_short_text_is_sent_unchanged():
+    text = "Pi is 3.14 and visit example.com, e.g. now. Version 2.0.1 ok"
+    assert chunk_text(text) == [text]
+
+
+def test_dots_without_a_space_after_do_not_end_sentences():
+    assert split_sentences("Pi is 3.14 today. Go to example.com now.") == ["Pi is 3.14 today.", "Go to example.com now."]
+    assert split_sentences("Update to 2.0.1 first! Then restart.") == ["Update to 2.0.1 first!", "Then restart."]
+
+
+def test_abbreviations_do_not_end_sentences():
+    assert split_sentences("Bring fruit, e.g. apples. Ask Dr. Smith.") == ["Bring fruit, e.g. apples.", "Ask Dr. Smith."]
+
+
+def test_chunks_keep_the_original_separators():
+    text = "First one.  Second one?\n\nThird one."
+    assert "".join(chunk_text(text, max_chars=1000)) == text.strip()
+    assert chunk_text(text, max_chars=25) == ["First one.  Second one?", "Third one."]
+
+
+def test_long_sentences_split_on_words():
+    assert chunk_text("one two three four five", max_chars=9) == ["one two", "three", "four five"]
+
+
+def test_chunks_run_concurrently_and_come_back_in_order():
+    running = {"now": 0, "peak": 0}
+    calls = []
+
+    async def synthesize_chunk(text, previous_text, next_text):
+        calls.append((text, previous_text, next_text))
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01 * (5 - int(text)))
+        running["now"] -= 1
+        return text.encode()
+
+    chunks = ["1", "2", "3", "4"]
+    clips = asyncio.run(synthesize_chunks(chunks, synthesize_chunk, max_concurrent=2))
+
+    assert clips == [b"1", b"2", b"3", b"4"]
+    assert running["peak"] == 2
+    assert ("1", None, "2") in calls
+    assert ("4", "3", None) in calls
+
+
+def test_tts_cache_key_ignores_spacing_only():
+    fields = {"voice_id": "voice", "model_id": "model", "voice_settings": {"stability": 0.5, "speed": 1.0}}
+    key = tts_cache_key("Hello  there.", fields)
+
+    assert key == tts_cache_key(" Hello there. ", dict(reversed(fields.items())))
+    assert key != tts_cache_key("hello there.", fields)
+    assert key != tts_cache_key("Hello there.", {**fields, "voice_id": "other voice"})
+    assert key != tts_cache_key("Hello there.", {**fields, "voice_settings": {"stability": 0.5, "speed": 1.2}})
+    assert key != tts_cache_key("Hello there.", fields, next_text="Bye.")
@@ -0,0 +1,154 @@
+import asyncio
+import io
+import wave
+
+import pytest
+
+from llm_module.tools.text_to_speech import tts_cache, tts_service
+from llm_module.tools.text_to_speech.tts_backends import TTSBackend, join_wav
+from llm_module.tools.text_to_speech.tts_service import synthesize_speech
+from utility_scripts.disk_lru_cache import DiskLRUCache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(tts_cache, "tts_cache", DiskLRUCache(tmp_path / "tts", 1024 * 1024))
+
+
+class StubBackend(TTSBackend):
+    """
+    Offline backend: a short silent WAV per chunk.
+    """
+
+    name = "stub"
+    file_extension = "wav"
+
+    SAMPLE_RATE = 8000
+    # silence per character of text
+    FRAMES_PER_CHAR = 80
+
+    def __init__(self):
+        self.calls = []
+
+    async def synthesize_chunk(self, text: str, voice: str, previous_text=None, next_text=None) -> bytes:
+        self.calls.append(text)
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(self.SAMPLE_RATE)
+            writer.writeframes(b"\x00\x00" * self.FRAMES_PER_CHAR * len(text))
+
+        return buffer.getvalue()
+
+    def join(self, clips: list) -> bytes:
+        return join_wav(clips)
+
+
+class RemoteBackend(TTSBackend):
+    remote = True
+
+    def join(self, clips: list) -> bytes:
+        return b"".join(clips)
+
+
+class FailingBackend(RemoteBackend):
+    name = "failing"
+
+    async def synthesize_chunk(self, text, voice, previous_text=None, next_text=None):
+        raise RuntimeError("out of cash")
+
+
+class SlowBackend(RemoteBackend):
+    name = "slow"
+
+    async def synthesize_chunk(self, text, voice, previous_text=None, next_text=None):
+        await asyncio.sleep(10)
+
+
+class LateBackend(RemoteBackend):
+    name = "late"
+
+    async def synthesize_chunk(self, text, voice, previous_text=None, next_text=None):
+        await asyncio.sleep(0.2)
+        return b"late audio"
+
+
+def wav_frames(audio: bytes) -> int:
+    with wave.open(io.BytesIO(audio), "rb") as reader:
+        return reader.getnframes()
+
+
+def test_chunks_are_joined_into_one_clip():
+    stub = StubBackend()
+    text = "First sentence here. " * 30
+
+    audio, backend = asyncio.run(synthesize_speech(text, backends=[stub]))
+
+    assert backend is stub
+    assert len(stub.calls) > 1
+    assert wav_frames(audio) == StubBackend.FRAMES_PER_CHAR * sum(len(c) for c in stub.calls)
+
+
+def test_failures_fall_back_to_the_next_backend():
+    stub = StubBackend()
+    audio, backend = asyncio.run(synthesize_speech("Hello there.", backends=[FailingBackend(), stub]))
+
+    assert backend is stub
+    assert stub.calls == ["Hello there."]
+
+
+def test_slow_remote_backends_fall_back_after_the_latency_budget(monkeypatch):
+    monkeypatch.setattr(tts_service, "TTS_LATENCY_BUDGET", 0.05)
+    stub = StubBackend()
+
+    audio, backend = asyncio.run(synthesize_speech("Hello there.", backends=[SlowBackend(), stub]))
+    assert backend is stub
+
+
+def test_remote_chunks_over_the_budget_still_finish_into_the_cache(monkeypatch):
+    monkeypatch.setattr(tts_service, "TTS_LATENCY_BUDGET", 0.05)
+    stub = StubBackend()
+
+    async def main():
+        result = await synthesize_speech("Hello there.", backends=[LateBackend(), stub])
+        await asyncio.gather(*tts_service._detached_chunks)
+        return result
+
+    audio, backend = asyncio.run(main())
+    assert backend is stub
+
+    key = tts_cache.tts_cache_key("Hello there.", {"backend": "late"})
+    assert tts_cache.tts_cache.get(key) == b"late audio"
+
+
+def test_all_backends_failing_returns_none():
+    assert asyncio.run(synthesize_speech("Hello there.", backends=[FailingBackend()])) is None
+
+
+def test_repeated_text_comes_from_the_cache():
+    stub = StubBackend()
+    first = asyncio.run(synthesize_speech("Hello there.", backends=[stub]))
+    again = asyncio.run(synthesize_speech("Hello there.", backends=[stub]))
+
+    assert stub.calls == ["Hello there."]
+    assert first[0] == again[0]
+
+
+def test_clips_stay_in_memory_with_unique_names(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tts_service, "get_backends", lambda: [StubBackend()])
+
+    async def main():
+        return await asyncio.gather(*(
+            tts_service.text_to_speech("Same words", file_name="Same words") for _ in range(3)
+        ))
+
+    clips = asyncio.run(main())
+    filenames = [filename for _, filename in clips]
+
+    assert len(set(filenames)) == 3
+    assert all(name.startswith("Same words_") and name.endswith(".wav") for name in filenames)
+    # nothing written to the working directory
+    assert not list(tmp_path.glob("*.wav"))
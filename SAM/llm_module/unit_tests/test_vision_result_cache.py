@@ -0,0 +1,35 @@
+from llm_module.generators.vision.vision_result_cache import VisionResultCache, vision_cache_key
+
+
+def prompt(content, system="system prompt"):
+    return [{"role": "system", "content": system}, {"role": "user", "content": content, "images": [b"image"]}]
+
+
+def test_key_ignores_case_and_spacing_but_not_images_or_model():
+    key = vision_cache_key(["hash"], prompt("alice: What  is THIS?"), "vision")
+
+    assert key == vision_cache_key(["hash"], prompt(" alice: what is this? "), "vision")
+    assert key != vision_cache_key(["other hash"], prompt("alice: what is this?"), "vision")
+    assert key != vision_cache_key(["hash"], prompt("alice: what is this?"), "other model")
+
+
+def test_key_covers_the_author_and_the_rest_of_the_prompt():
+    key = vision_cache_key(["hash"], prompt("alice: what is this?"), "vision")
+
+    assert key != vision_cache_key(["hash"], prompt("bob: what is this?"), "vision")
+    assert key != vision_cache_key(["hash"], prompt("alice: what is this?", system="other channel"), "vision")
+
+
+def test_entries_expire_and_purge():
+    cache = VisionResultCache(max_size=2, ttl_seconds=0)
+    cache.put("a", "response")
+    assert cache.get("a") is None
+
+    cache.ttl_seconds = 60
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+    assert cache.purge() == 2
+    assert len(cache) == 0
@@ -0,0 +1,124 @@
+import time
+
+from collections import OrderedDict
+
+from utility_scripts.system_logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ChannelCacheManager:
+    """
+    Keeps the per-channel histories in memory within limits.
+
+    - Channels idle for longer than ttl_seconds are dropped
+    - Past max_channels or max_bytes the least recently used channels are dropped
+    - Dropped channels are only unloaded, they come back from the memory store on next use
+
+    create(channel_id) builds (and restores) a channel's history on a miss,
+    on_unload(channel_id) lets other per-channel state go with it.
+    The byte total is kept up to date through the histories' on_resize,
+    so limits also apply when a loaded channel grows.
+    """
+
+    def __init__(self, create, max_channels: int, max_bytes: int, ttl_seconds: float, on_unload=None):
+        self.create = create
+        self.max_channels = max_channels
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.on_unload = on_unload
+
+        # channel_id -> [history, last used]
+        self._channels = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, channel_id):
+        now = time.monotonic()
+        self._expire(now)
+
+        entry = self._channels.get(channel_id)
+        if entry is not None:
+            self.hits += 1
+            entry[1] = now
+            self._channels.move_to_end(channel_id)
+            return entry[0]
+
+        self.misses += 1
+        history = self.create(channel_id)
+        history.on_resize = lambda delta: self._resized(channel_id, history, delta)
+        self._channels[channel_id] = [history, now]
+        self._bytes += history.nbytes
+        self._enforce_limits(keep=channel_id)
+        return history
+
+    def peek(self, channel_id):
+        """
+        The channel's history if it is loaded, without counting a hit.
+        """
+        entry = self._channels.get(channel_id)
+        return entry[0] if entry is not None else None
+
+    def discard(self, channel_id):
+        entry = self._channels.pop(channel_id, None)
+        if entry is None:
+            return
+
+        history = entry[0]
+        history.on_resize = None
+        self._bytes -= history.nbytes
+
+        if self.on_unload is not None:
+            self.on_unload(channel_id)
+
+    def resident_bytes(self) -> int:
+        return self._bytes
+
+    def _resized(self, channel_id, history, delta: int):
+        # an unloaded history someone still holds doesn't count
+        entry = self._channels.get(channel_id)
+        if entry is None or entry[0] is not history:
+            return
+
+        self._bytes += delta
+        if delta > 0:
+            self._enforce_limits(keep=channel_id)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "channels": len(self._channels),
+            "max_channels": self.max_channels,
+            "resident_bytes": self.resident_bytes(),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _expire(self, now: float):
+        # oldest first, stop at the first channel that is still fresh
+        while self._channels:
+            channel_id, (_, last_used) = next(iter(self._channels.items()))
+            if now - last_used <= self.ttl_seconds:
+                break
+            self.expirations += 1
+            logger.debug(f"Channel cache {channel_id} expired")
+            self.discard(channel_id)
+
+    def _enforce_limits(self, keep):
+        while len(self._channels) > 1 and (
+                len(self._channels) > self.max_channels
+                or self._bytes > self.max_bytes
+        ):
+            # least recently used first, the channel being loaded or grown stays
+            channel_id = next(c for c in self._channels if c != keep)
+            self.evictions += 1
+            logger.debug(f"Channel cache {channel_id} evicted (LRU)")
+            self.discard(channel_id)
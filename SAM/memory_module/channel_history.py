@@ -0,0 +1,125 @@
+from llm_module.token_counter import message_tokens
+
+
+def message_bytes(message: dict) -> int:
+    return len(message.get("content") or "") + len(message.get("role") or "")
+
+
+class ChannelHistory:
+    """
+    Message window for a channel that evicts in blocks.
+
+    A deque with maxlen drops the oldest message on every append, which shifts
+    the start of the prompt each turn and throws away Ollama's prompt prefix cache.
+    Here nothing is dropped until the window is over max_size messages or max_tokens,
+    and then a whole block goes at once, so the prompt prefix stays byte-identical
+    for several turns.
+
+    on_append and on_evict, if given, are called with the list of
+    messages added / dropped, in that order. on_resize, if given, is called
+    with the change in nbytes after every change.
+    """
+
+    def __init__(self, max_size: int, evict_block: int, max_tokens: int = None, on_append=None, on_evict=None,
+                 on_resize=None):
+        self.max_size = max_size
+        self.evict_block = max(1, min(evict_block, max_size))
+        self.max_tokens = max_tokens
+        self.on_append = on_append
+        self.on_evict = on_evict
+        self.on_resize = on_resize
+        self._messages = []
+        self._tokens = 0
+        self._bytes = 0
+
+    @property
+    def tokens(self) -> int:
+        return self._tokens
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the message contents.
+        """
+        return self._bytes
+
+    def append(self, message: dict):
+        self.extend([message])
+
+    def extend(self, messages):
+        messages = list(messages)
+        before = self._bytes
+        self._add(messages)
+
+        if self.on_append is not None and messages:
+            self.on_append(messages)
+
+        self._trim()
+        self._resized(before)
+
+    def load(self, messages):
+        """
+        Restores previously saved messages without reporting them as new.
+        """
+        before = self._bytes
+        self._add(messages)
+        self._trim()
+        self._resized(before)
+
+    def _resized(self, before: int):
+        if self.on_resize is not None and self._bytes != before:
+            self.on_resize(self._bytes - before)
+
+    def _add(self, messages):
+        for message in messages:
+            self._messages.append(message)
+            self._tokens += message_tokens(message)
+            self._bytes += message_bytes(message)
+
+    def clear(self):
+        before = self._bytes
+        self._messages.clear()
+        self._tokens = 0
+        self._bytes = 0
+        self._resized(before)
+
+    def _over_limit(self) -> bool:
+        if len(self._messages) > self.max_size:
+            return True
+        return self.max_tokens is not None and self._tokens > self.max_tokens
+
+    def _trim(self):
+        if not self._over_limit():
+            return
+
+        # evict down to a block below the limits so the next few turns fit without evicting
+        count_target = self.max_size - self.evict_block
+        token_target = None
+        if self.max_tokens is not None:
+            token_target = self.max_tokens - self.max_tokens // 4
+
+        drop = 0
+        remaining = len(self._messages)
+        while remaining > 0 and (
+                remaining > count_target
+                or (token_target is not None and self._tokens > token_target)
+        ):
+            self._tokens -= message_tokens(self._messages[drop])
+            self._bytes -= message_bytes(self._messages[drop])
+            drop += 1
+            remaining -= 1
+
+        evicted = self._messages[:drop]
+        del self._messages[:drop]
+
+        if self.on_evict is not None and evicted:
+            self.on_evict(evicted)
+
+    def __iter__(self):
+        return iter(self._messages)
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __getitem__(self, index):
+        return self._messages[index]
@@ -0,0 +1,160 @@
+import asyncio
+import re
+
+from llm_module.llm_create import LLM_CONFIG
+from llm_module.llm_scheduler import get_scheduler, PRIORITY_BACKGROUND
+from llm_module.ollama_client import ollama_chat
+from llm_module.system_prompts import summary_system_prompt
+from llm_module.token_counter import keep_last_tokens, message_tokens, truncate_to_tokens
+from memory_module.memory_store import get_memory_store
+from utility_scripts.system_logging import setup_logger
+
+logger = setup_logger(__name__)
+
+CONFIG = LLM_CONFIG.SAM
+
+THINK_PATTERN = re.compile(r"<think>.*?</think>", re.DOTALL)
+
+# channel_id -> running summary of messages evicted from the channel cache
+channel_summaries = {}
+
+# channel_id -> evicted messages waiting to be folded into the summary,
+# capped at SUMMARY_INPUT_TOKEN_BUDGET so a backlog can't outgrow the summary prompt
+_pending_evictions = {}
+_scheduled = set()
+_submit_tasks = set()
+
+# channel_id -> times the summary was cleared, so a running job can tell it is stale
+_clear_counts = {}
+
+
+def get_channel_summary(channel_id) -> str | None:
+    return channel_summaries.get(channel_id)
+
+
+def restore_channel_summary(channel_id, summary: str):
+    channel_summaries[channel_id] = summary
+
+
+def unload_channel_summary(channel_id):
+    # memory only, the saved summary is restored with the channel
+    channel_summaries.pop(channel_id, None)
+
+
+def clear_channel_summary(channel_id):
+    channel_summaries.pop(channel_id, None)
+    _pending_evictions.pop(channel_id, None)
+    _clear_counts[channel_id] = _clear_counts.get(channel_id, 0) + 1
+
+
+def add_pending(channel_id, messages: list, before: bool = False):
+    pending = _pending_evictions.setdefault(channel_id, [])
+    if before:
+        pending[:0] = messages
+    else:
+        pending.extend(messages)
+
+    # the oldest messages go first when the backlog is over budget
+    total = sum(message_tokens(m) for m in pending)
+    dropped = 0
+    while len(pending) > 1 and total > CONFIG.SUMMARY_INPUT_TOKEN_BUDGET:
+        total -= message_tokens(pending.pop(0))
+        dropped += 1
+
+    if dropped:
+        logger.warning(f"Summary backlog for channel {channel_id} over budget, dropped {dropped} oldest messages")
+
+
+def queue_summary(channel_id, evicted: list):
+    """
+    Queues evicted messages to be folded into the channel summary
+    as a low priority job, so it never delays a reply.
+    Safe to call from sync code running on the event loop.
+    """
+    if not evicted:
+        return
+
+    add_pending(channel_id, evicted)
+
+    # one job per channel picks up everything evicted until it runs
+    if channel_id in _scheduled:
+        return
+    _scheduled.add(channel_id)
+
+    task = asyncio.get_running_loop().create_task(_submit_summary(channel_id))
+    _submit_tasks.add(task)
+    task.add_done_callback(_submit_tasks.discard)
+
+
+async def _submit_summary(channel_id):
+    queued = await get_scheduler().submit(
+        _summarize_channel, channel_id,
+        priority=PRIORITY_BACKGROUND,
+        user_id=("summary", channel_id),
+        channel_id=("summary", channel_id),
+        on_shed=lambda: _summary_shed(channel_id),
+    )
+
+    if not queued:
+        _summary_shed(channel_id)
+
+
+def _summary_shed(channel_id):
+    # stays pending and is retried with the next eviction
+    _scheduled.discard(channel_id)
+    pending = len(_pending_evictions.get(channel_id, []))
+    logger.warning(f"Summary for channel {channel_id} shed, {pending} messages pending")
+
+
+def format_messages(messages: list, max_tokens: int) -> str:
+    # the newest messages are kept if it still doesn't fit
+    text = "\n".join(f'{m["role"]}: {m["content"]}' for m in messages)
+    return keep_last_tokens(text, max_tokens)
+
+
+async def _summarize_channel(channel_id):
+    _scheduled.discard(channel_id)
+
+    evicted = _pending_evictions.pop(channel_id, [])
+    if not evicted:
+        return
+
+    # the channel may have been unloaded, its saved summary still has to be kept
+    previous_summary = channel_summaries.get(channel_id)
+    if previous_summary is None:
+        previous_summary = get_memory_store().load_summary(channel_id) or ""
+    clear_count = _clear_counts.get(channel_id, 0)
+
+    try:
+        response = await ollama_chat(
+            model=CONFIG.SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": summary_system_prompt},
+                {"role": "user", "content": (
+                    f"Current summary:\n{previous_summary or '(empty)'}\n\n"
+                    f"Older messages:\n{format_messages(evicted, CONFIG.SUMMARY_INPUT_TOKEN_BUDGET)}"
+                )},
+            ],
+            options={
+                "num_ctx": CONFIG.DEFAULT_CONTEXT,
+                "temperature": 0.3,
+            },
+            think=False,
+        )
+    except Exception:
+        # put them back so the next run still covers them, unless neuralized meanwhile
+        if _clear_counts.get(channel_id, 0) == clear_count:
+            add_pending(channel_id, evicted, before=True)
+        raise
+
+    summary = THINK_PATTERN.sub("", response.message.content).strip()
+    if not summary:
+        return
+
+    # neuralized while the summary was generating
+    if _clear_counts.get(channel_id, 0) != clear_count:
+        return
+
+    channel_summaries[channel_id] = truncate_to_tokens(summary, CONFIG.SUMMARY_TOKEN_BUDGET)
+    get_memory_store().save_summary(channel_id, channel_summaries[channel_id])
+    logger.info(f"Updated summary for channel {channel_id} with {len(evicted)} evicted messages")
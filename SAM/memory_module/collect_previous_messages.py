@@ -1,12 +1,14 @@
 import discord
 
-from discord_module.message_filters import bots_blacklist, message_is_slash_reply
+from discord_module.message_filters import is_slash_command_response
+from discord_module.utilities.access_control import access_control
+from discord_module.utilities.message_references import reference_id, resolve_references
 from memory_module.process_message import process_message
 
 
 # filters message based on rules
-async def skip_message(message):
-    if message.author.id in bots_blacklist:
+def skip_message(message, referenced=None):
+    if message.author.id in access_control.bots_blacklist:
         # todo -- remove messages from users that are replies to / mention, banned bots
         return True
 
@@ -14,7 +16,7 @@ async def skip_message(message):
     if message.content == "" and len(message.embeds) == 0:
         return True
 
-    if await message_is_slash_reply(message):
+    if message.type == discord.MessageType.reply and is_slash_command_response(referenced):
         return True
 
     if message.type in {discord.MessageType.chat_input_command, discord.MessageType.thread_created}:
@@ -26,14 +28,20 @@ async def skip_message(message):
 async def gather_past_messages(bot, message, amount=20):
     channel = message.channel
 
+    history = [past_message async for past_message in channel.history(limit=amount, before=message)]
+
+    # every reply target in the page at once instead of one fetch per message
+    references = await resolve_references(bot, history)
+
     messages = []
-    async for past_message in channel.history(limit=amount, before=message):
+    for past_message in history:
+        referenced = references.get(reference_id(past_message))
 
         # filter past messages
-        if await skip_message(past_message):
+        if skip_message(past_message, referenced):
             continue
 
-        messages.append(await process_message(bot, past_message))
+        messages.append(await process_message(bot, past_message, referenced))
 
     messages.reverse()
 
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+
+from pathlib import Path
+
+from utility_scripts.system_logging import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / "memory_store" / "channel_memory.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel_id INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_channel ON messages (channel_id, id);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    channel_id INTEGER PRIMARY KEY,
+    summary TEXT NOT NULL
+);
+"""
+
+
+class MemoryStore:
+    """
+    SQLite copy of the processed {role, content} channel history and summaries,
+    so a restart can warm the channel caches without asking Discord again.
+
+    Rows mirror the in-memory ChannelHistory: appends add to the end,
+    evictions remove the oldest rows. Writes are tiny and go through WAL,
+    so they are done inline.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            logger.info(f"Opened memory store {self.path}")
+        return self._conn
+
+    def load_channel(self, channel_id) -> list:
+        rows = self._connection().execute(
+            "SELECT role, content FROM messages WHERE channel_id = ? ORDER BY id",
+            (channel_id,)
+        ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def append_messages(self, channel_id, messages: list):
+        self._connection().executemany(
+            "INSERT INTO messages (channel_id, role, content) VALUES (?, ?, ?)",
+            [(channel_id, m["role"], m["content"]) for m in messages]
+        )
+
+    def evict_oldest(self, channel_id, count: int):
+        self._connection().execute(
+            "DELETE FROM messages WHERE id IN "
+            "(SELECT id FROM messages WHERE channel_id = ? ORDER BY id LIMIT ?)",
+            (channel_id, count)
+        )
+
+    def load_summary(self, channel_id) -> str | None:
+        row = self._connection().execute(
+            "SELECT summary FROM summaries WHERE channel_id = ?",
+            (channel_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def save_summary(self, channel_id, summary: str):
+        self._connection().execute(
+            "INSERT INTO summaries (channel_id, summary) VALUES (?, ?) "
+            "ON CONFLICT(channel_id) DO UPDATE SET summary = excluded.summary",
+            (channel_id, summary)
+        )
+
+    def clear_channel(self, channel_id):
+        conn = self._connection()
+        conn.execute("DELETE FROM messages WHERE channel_id = ?", (channel_id,))
+        conn.execute("DELETE FROM summaries WHERE channel_id = ?", (channel_id,))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+memory_store = MemoryStore(os.getenv("MEMORY_DB_PATH", DEFAULT_DB_PATH))
+
+
+def get_memory_store() -> MemoryStore:
+    return memory_store
@@ -1,29 +1,95 @@
-from collections import deque
-
+from llm_module.context_budget import history_token_budget
+from llm_module.prompt_cache_metrics import forget_channel
+from memory_module.channel_cache_manager import ChannelCacheManager
+from memory_module.channel_history import ChannelHistory
+from memory_module.channel_summary import (
+    queue_summary, clear_channel_summary, restore_channel_summary, unload_channel_summary
+)
 from memory_module.collect_previous_messages import gather_past_messages
+from memory_module.memory_store import get_memory_store
 from utility_scripts.system_logging import setup_logger
 
 
 logger = setup_logger(__name__)
 
-channels_dict = {}
-MAX_CACHE_SIZE = 20
+# the token budget is the real limit, this only caps very chatty channels of short messages
+MAX_CACHE_SIZE = 50
+# messages dropped at once when the cache is full, keeps the prompt prefix stable between evictions
+EVICTION_BLOCK = 16
+# past messages fetched when a channel cache is cold
+HISTORY_FETCH_LIMIT = 50
+HISTORY_TOKEN_BUDGET = history_token_budget()
+
+# limits for all channel caches together, unloaded channels come back from the memory store
+MAX_CACHED_CHANNELS = 500
+MAX_CACHED_BYTES = 64 * 1024 * 1024
+CHANNEL_IDLE_TTL = 6 * 60 * 60
 
 
 # for neuralize command
 def clear_channel_cache(channel_id):
-    if channel_id in channels_dict:
-        channels_dict[channel_id].clear()
+    channel_cache = channels_cache.peek(channel_id)
+    if channel_cache is not None:
+        channel_cache.clear()
+    clear_channel_summary(channel_id)
+    get_memory_store().clear_channel(channel_id)
+
+
+def _on_evict(channel_id, evicted):
+    get_memory_store().evict_oldest(channel_id, len(evicted))
+    # evicted messages are folded into the channel's running summary
+    queue_summary(channel_id, evicted)
+
+
+# builds the cache for a channel, restored from the memory store
+def _create_channel_cache(channel_id) -> ChannelHistory:
+    store = get_memory_store()
+
+    channel_cache = ChannelHistory(
+        MAX_CACHE_SIZE,
+        EVICTION_BLOCK,
+        HISTORY_TOKEN_BUDGET,
+        on_append=lambda messages: store.append_messages(channel_id, messages),
+        on_evict=lambda evicted: _on_evict(channel_id, evicted)
+    )
+
+    saved_summary = store.load_summary(channel_id)
+    if saved_summary:
+        restore_channel_summary(channel_id, saved_summary)
+
+    saved_messages = store.load_channel(channel_id)
+    if saved_messages:
+        logger.info(f'Restored {len(saved_messages)} messages for {channel_id} from the memory store')
+        channel_cache.load(saved_messages)
+
+    return channel_cache
+
+
+def _unload_channel(channel_id):
+    unload_channel_summary(channel_id)
+    forget_channel(channel_id)
+
+
+channels_cache = ChannelCacheManager(
+    create=_create_channel_cache,
+    max_channels=MAX_CACHED_CHANNELS,
+    max_bytes=MAX_CACHED_BYTES,
+    ttl_seconds=CHANNEL_IDLE_TTL,
+    on_unload=_unload_channel,
+)
+
+
+# creates/gets the cache for the channel
+def get_channel_cache(channel_id) -> ChannelHistory:
+    return channels_cache.get(channel_id)
 
 
-# creates/gets the section in the dict for the channel
-def get_channel_cache(channel_id) -> list:
-    if channel_id not in channels_dict:
-        channels_dict[channel_id] = deque(maxlen=MAX_CACHE_SIZE)
-    return channels_dict[channel_id]
+# for the memory stats command
+def get_channel_cache_stats() -> dict:
+    return channels_cache.stats()
 
 
-async def get_channel_message_cache(bot, message, amount=20) -> list:
+async def get_channel_message_cache(bot, message, amount=HISTORY_FETCH_LIMIT) -> ChannelHistory:
     channel_name = getattr(message.channel, "name", None)
 
     if channel_name is None:
@@ -40,6 +106,9 @@ async def get_channel_message_cache(bot, message, amount=20) -> list:
 
         channel_message_cache.extend(past_messages)
 
-    logger.info(f'Channel Cache Complete, Gathered {len(channel_message_cache)} Messages')
+    logger.info(
+        f'Channel Cache Complete, Gathered {len(channel_message_cache)} Messages '
+        f'(~{channel_message_cache.tokens}/{HISTORY_TOKEN_BUDGET} tokens)'
+    )
     return channel_message_cache
 
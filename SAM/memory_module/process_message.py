@@ -1,21 +1,22 @@
 import re
 
-import discord
+from discord_module.utilities.message_references import get_referenced
 
 TTS_PATTERN = re.compile(r"\(tts\)", re.IGNORECASE)
 
+# referenced message not looked up by the caller yet
+UNRESOLVED = object()
 
-async def get_replied_to_author_name(bot, message):
+
+async def get_replied_to_author_name(bot, message, referenced=UNRESOLVED):
     if message.reference is None:
         return None
 
-    referenced = message.reference.resolved
+    if referenced is UNRESOLVED:
+        referenced = await get_referenced(message)
 
     if referenced is None:
-        try:
-            referenced = await message.channel.fetch_message(message.reference.message_id)
-        except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-            return None
+        return None
 
     if referenced.author.id == bot.user.id:
         return None
@@ -23,7 +24,7 @@ async def get_replied_to_author_name(bot, message):
     return referenced.author.name
 
 
-async def process_message(bot, message):
+async def process_message(bot, message, referenced=UNRESOLVED):
     author = message.author
     content = message.clean_content
 
@@ -36,7 +37,7 @@ async def process_message(bot, message):
         return {'role': 'assistant', 'content': content}
 
     # Message is a reply
-    reply_target_author = await get_replied_to_author_name(bot, message)
+    reply_target_author = await get_replied_to_author_name(bot, message, referenced)
 
     if reply_target_author:
         return {
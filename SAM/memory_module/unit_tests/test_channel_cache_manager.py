@@ -0,0 +1,92 @@
+import time
+
+from memory_module.channel_cache_manager import ChannelCacheManager
+from memory_module.channel_history import ChannelHistory
+
+
+def make_manager(**limits):
+    unloaded = []
+    settings = {"max_channels": 10, "max_bytes": 10_000, "ttl_seconds": 60}
+    settings.update(limits)
+    manager = ChannelCacheManager(
+        create=lambda channel_id: ChannelHistory(max_size=50, evict_block=10),
+        on_unload=unloaded.append,
+        **settings,
+    )
+    return manager, unloaded
+
+
+def test_hits_and_misses():
+    manager, _ = make_manager()
+    first = manager.get(1)
+
+    assert manager.get(1) is first
+    assert manager.stats()["hits"] == 1
+    assert manager.stats()["misses"] == 1
+
+
+def test_least_recently_used_channel_is_evicted():
+    manager, unloaded = make_manager(max_channels=2)
+    manager.get(1)
+    manager.get(2)
+    manager.get(1)
+    manager.get(3)
+
+    assert unloaded == [2]
+    assert manager.peek(2) is None
+    assert manager.stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_channels():
+    manager, unloaded = make_manager(max_bytes=1000)
+    manager.get(1).append({"role": "user", "content": "x" * 900})
+    manager.get(2).append({"role": "user", "content": "x" * 900})
+    manager.get(3)
+
+    assert unloaded == [1]
+    assert manager.resident_bytes() <= 1000
+
+
+def test_idle_channels_expire():
+    manager, unloaded = make_manager(ttl_seconds=0.01)
+    manager.get(1)
+    time.sleep(0.02)
+    manager.get(2)
+
+    assert unloaded == [1]
+    assert manager.stats()["expirations"] == 1
+
+
+def test_byte_budget_applies_when_loaded_channels_grow():
+    manager, unloaded = make_manager(max_bytes=1000)
+    first = manager.get(1)
+    second = manager.get(2)
+
+    first.append({"role": "user", "content": "x" * 400})
+    second.append({"role": "user", "content": "x" * 400})
+    assert unloaded == []
+
+    # no new channel, the growing one pushes the least recently used out
+    second.append({"role": "user", "content": "x" * 400})
+
+    assert unloaded == [1]
+    assert manager.resident_bytes() == second.nbytes
+    assert manager.peek(2) is second
+
+
+def test_byte_total_follows_appends_evictions_and_clears():
+    manager, _ = make_manager()
+    history = manager.get(1)
+
+    for i in range(60):
+        history.append({"role": "user", "content": f"message {i}"})
+    assert manager.resident_bytes() == history.nbytes
+
+    history.clear()
+    assert manager.resident_bytes() == 0
+
+    # an unloaded history no longer counts, even if it is still used
+    history.append({"role": "user", "content": "late"})
+    manager.discard(1)
+    history.append({"role": "user", "content": "later"})
+    assert manager.resident_bytes() == 0
@@ -0,0 +1,52 @@
+from memory_module.channel_history import ChannelHistory
+from llm_module.prompt_cache_metrics import shared_prefix_length
+
+
+def msg(i):
+    return {"role": "user", "content": f"message {i}"}
+
+
+def test_nothing_is_dropped_until_full():
+    history = ChannelHistory(max_size=5, evict_block=2)
+    history.extend([msg(i) for i in range(5)])
+
+    assert len(history) == 5
+    assert history[0] == msg(0)
+
+
+def test_evicts_a_whole_block_at_once():
+    history = ChannelHistory(max_size=5, evict_block=2)
+    history.extend([msg(i) for i in range(5)])
+    history.append(msg(5))
+
+    assert [m["content"] for m in history] == ["message 3", "message 4", "message 5"]
+
+
+def test_prefix_stays_stable_between_evictions():
+    history = ChannelHistory(max_size=10, evict_block=4)
+    history.extend([msg(i) for i in range(10)])
+    history.append(msg(10))
+
+    before = list(history)
+    for i in range(11, 14):
+        history.append(msg(i))
+        assert shared_prefix_length(before, list(history)) == len(before)
+
+
+def test_shared_prefix_length():
+    assert shared_prefix_length([1, 2, 3], [1, 2, 4]) == 2
+    assert shared_prefix_length([], [1]) == 0
+    assert shared_prefix_length([1, 2], [1, 2, 3]) == 2
+
+
+def test_evicts_by_token_budget():
+    long_message = {"role": "user", "content": "word " * 100}
+    history = ChannelHistory(max_size=50, evict_block=10, max_tokens=500)
+    history.extend([long_message] * 4)
+    assert len(history) == 4
+
+    history.append(long_message)
+
+    # trimmed to 75% of the budget, not just under it
+    assert history.tokens <= 375
+    assert len(history) == 3
@@ -0,0 +1,41 @@
+import asyncio
+
+from types import SimpleNamespace
+
+from memory_module import channel_summary
+from memory_module.memory_store import MemoryStore
+
+
+def msg(i, words=1):
+    return {"role": "user", "content": " ".join(f"word{i}" for _ in range(words))}
+
+
+def test_pending_backlog_is_capped_keeping_the_newest(monkeypatch):
+    monkeypatch.setattr(channel_summary.CONFIG, "SUMMARY_INPUT_TOKEN_BUDGET", 100)
+    monkeypatch.setattr(channel_summary, "_pending_evictions", {})
+
+    channel_summary.add_pending(1, [msg(i, words=10) for i in range(20)])
+    pending = channel_summary._pending_evictions[1]
+
+    assert sum(channel_summary.message_tokens(m) for m in pending) <= 100
+    assert pending[-1] == msg(19, words=10)
+
+
+def test_summary_of_unloaded_channel_builds_on_the_saved_one(monkeypatch, tmp_path):
+    store = MemoryStore(tmp_path / "memory.sqlite3")
+    store.save_summary(1, "saved summary")
+    prompts = []
+
+    async def fake_chat(**kwargs):
+        prompts.append(kwargs["messages"][-1]["content"])
+        return SimpleNamespace(message=SimpleNamespace(content="new summary"))
+
+    monkeypatch.setattr(channel_summary, "get_memory_store", lambda: store)
+    monkeypatch.setattr(channel_summary, "ollama_chat", fake_chat)
+    monkeypatch.setattr(channel_summary, "channel_summaries", {})
+    monkeypatch.setattr(channel_summary, "_pending_evictions", {1: [msg(1)]})
+
+    asyncio.run(channel_summary._summarize_channel(1))
+
+    assert "saved summary" in prompts[0]
+    assert store.load_summary(1) == "new summary"
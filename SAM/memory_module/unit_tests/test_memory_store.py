@@ -0,0 +1,55 @@
+from memory_module.channel_history import ChannelHistory
+from memory_module.memory_store import MemoryStore
+
+
+def msg(i):
+    return {"role": "user", "content": f"message {i}"}
+
+
+def make_history(store, channel_id):
+    return ChannelHistory(
+        max_size=5,
+        evict_block=2,
+        on_append=lambda messages: store.append_messages(channel_id, messages),
+        on_evict=lambda evicted: store.evict_oldest(channel_id, len(evicted)),
+    )
+
+
+def test_store_mirrors_channel_history(tmp_path):
+    store = MemoryStore(tmp_path / "memory.sqlite3")
+    history = make_history(store, 1)
+
+    for i in range(7):
+        history.append(msg(i))
+
+    assert store.load_channel(1) == list(history)
+    assert store.load_channel(2) == []
+
+
+def test_restart_restores_history_and_summary(tmp_path):
+    path = tmp_path / "memory.sqlite3"
+    store = MemoryStore(path)
+    history = make_history(store, 1)
+    history.extend([msg(0), msg(1)])
+    store.save_summary(1, "old summary")
+    store.save_summary(1, "new summary")
+    store.close()
+
+    restarted = MemoryStore(path)
+    restored = make_history(restarted, 1)
+    restored.load(restarted.load_channel(1))
+
+    assert list(restored) == [msg(0), msg(1)]
+    assert restarted.load_summary(1) == "new summary"
+    # loading doesn't write the messages a second time
+    assert len(restarted.load_channel(1)) == 2
+
+
+def test_clear_channel(tmp_path):
+    store = MemoryStore(tmp_path / "memory.sqlite3")
+    store.append_messages(1, [msg(0)])
+    store.save_summary(1, "summary")
+    store.clear_channel(1)
+
+    assert store.load_channel(1) == []
+    assert store.load_summary(1) is None
@@ -1,14 +1,19 @@
-from pathlib import Path
+import os
+
 from datetime import datetime
+from dotenv import load_dotenv
 
+from message_logs.log_writer import DEFAULT_LOG_DIR, InteractionLogWriter
 from utility_scripts.system_logging import setup_logger
 
 # configure logging
 logger = setup_logger(__name__)
 
+# Load Env
+load_dotenv()
 
-def get_timestamp() -> str:
-    return datetime.now().strftime("%m-%d__%H_%M_%S")
+# also keep a daily Markdown file for reading the logs by hand
+RENDER_MARKDOWN = os.getenv("INTERACTION_LOG_MARKDOWN", "true").lower() == "true"
 
 
 def format_details(summary: str, content: str) -> str:
@@ -33,92 +38,111 @@ def format_details(summary: str, content: str) -> str:
     )
 
 
-async def log_message(response: dict, sent_message, user_message: dict, full_history: dict) -> None:
-    # noinspection GrazieInspection
+def build_record(response: dict, sent_message, user_message: dict, full_history) -> dict:
+    """
+    Collect everything worth keeping about one message interaction.
+
+    Only references and small copies are taken here, so building a
+    record is cheap enough to do on the reply path. Formatting and
+    writing happen later in the log writer.
+
+    Args:
+        response (dict):
+            Response payload returned from the model handler.
+            May include keys such as:
+                "prompt"       -> system prompt dictionary
+                "message"      -> model message object
+                "file_txt"     -> extracted file text
+                "token_usage"  -> token statistics
+
+        sent_message:
+            The final message object sent by the system (must contain
+            `id` and `content` attributes).
+
+        user_message (dict):
+            Dictionary describing the user message.
+            Expected fields:
+                "id"
+                "name"
+                "content"
+
+        full_history:
+            Iterable containing the full conversation history where each
+            item has:
+                {
+                    "role": str,
+                    "content": str
+                }
+
+    Returns:
+        dict: JSON serializable record of the interaction.
+    """
+    # Extract optional internal reasoning from the response message.
+    msg = response.get("message")
+    thinking = getattr(msg, "thinking", "No Thinking")
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "user_message": user_message,
+        "message_id": sent_message.id,
+        "response": sent_message.content,
+        "thinking": thinking,
+        "file_txt": response.get("file_txt"),
+        "token_usage": response.get("token_usage"),
+        "system_prompt": response.get("prompt"),
+        # copied, the channel history keeps changing after this
+        "history": list(full_history),
+    }
+
+
+def render_markdown(record: dict) -> str:
+    """
+    Render an interaction record as Markdown for reading by hand.
+
+    The layout matches the per-message log files that were written
+    before the JSONL log, with collapsible sections for the long parts:
+        - User metadata
+        - User message content
+        - Optional file text data
+        - Token usage statistics
+        - Internal reasoning ("thinking") if present
+        - Assistant response
+        - Complete chat history
+        - The system prompt used for the request
+
+    Args:
+        record (dict): Record produced by build_record.
+
+    Returns:
+        str: Markdown text for the interaction.
     """
-        Write a Markdown log file capturing a full message interaction.
-
-        The log includes:
-            - User metadata
-            - User message content
-            - Assistant response
-            - Optional file text data
-            - Token usage statistics
-            - Internal reasoning ("thinking") if present
-            - Complete chat history
-            - The system prompt used for the request
-
-        A unique filename is generated using a timestamp and the
-        message ID of the sent response.
-
-        Args:
-            response (dict):
-                Response payload returned from the model handler.
-                May include keys such as:
-                    "prompt"       -> system prompt dictionary
-                    "message"      -> model message object
-                    "file_txt"     -> extracted file text
-                    "token_usage"  -> token statistics
-
-            sent_message:
-                The final message object sent by the system (must contain
-                `id` and `content` attributes).
-
-            user_message (dict):
-                Dictionary describing the user message.
-                Expected fields:
-                    "id"
-                    "name"
-                    "content"
-
-            full_history (dict):
-                Iterable containing the full conversation history where each
-                item has:
-                    {
-                        "role": str,
-                        "content": str
-                    }
-
-        Returns:
-            None
-        """
-
-    # Ensure the log directory exists relative to this module.
-    save_dir = Path(__file__).resolve().parent / "logs"
-    save_dir.mkdir(exist_ok=True)
-
-    # Construct the output log file path.
-    path = save_dir / f"{get_timestamp()}__{sent_message.id}.md"
+    user_message = record["user_message"]
 
     # Flatten the full conversation history into a readable text block.
     full_chat_history = "\n".join(
-        f'{m["role"]}: {m["content"]}\n' for m in full_history
+        f'{m["role"]}: {m["content"]}\n' for m in record["history"]
     )
 
-    # Extract the system prompt used for the model request.
-    system_prompt = response.get("prompt")
+    # The system prompt used for the model request.
+    system_prompt = record["system_prompt"]
     sys_prompt_string = (
         "role: " + system_prompt["role"] + "\n"
         "content:\n" + system_prompt["content"]
     )
 
-    # Extract optional internal reasoning from the response message.
-    msg = response.get("message")
-    thinking = getattr(msg, "thinking", "No Thinking")
-
     # --------------------------------------------
     # Optional Sections
     # --------------------------------------------
 
     # Attachment data (e.g., extracted text from uploaded files).
     attachment_section = ""
-    text_data = response.get("file_txt")
+    text_data = record.get("file_txt")
     if text_data:
         attachment_section = f"{format_details('File Text Data', text_data)}\n"
 
     # Token usage information returned by the model API.
     token_section = ""
-    token_usage = response.get("token_usage")
+    token_usage = record.get("token_usage")
     if token_usage:
         prompt_tokens = token_usage.get("prompt_tokens", 0)
         tokens_generated = token_usage.get("tokens_generated", 0)
@@ -128,10 +152,20 @@ async def log_message(response: dict, sent_message, user_message: dict, full_his
         generation_time = token_usage.get("generation_time", 0)
         total_duration = token_usage.get("total_duration", 0)
 
+        # only known for chat responses
+        prefix_reuse_text = ""
+        if "prompt_tokens_reused" in token_usage:
+            prefix_reuse_text = (
+                f"Prompt Messages Reused: {token_usage.get('prompt_messages_reused', 0)}<br>"
+                f"Prompt Tokens Reused ({token_usage.get('prompt_reuse_source', 'estimate')}): "
+                f"{token_usage.get('prompt_tokens_reused', 0)}<br>"
+            )
+
         token_text = (
             f"Tokens in Prompt: {prompt_tokens}<br>"
             f"Tokens Generated: {tokens_generated}<br>"
             f"Total Tokens: {total_tokens}<br>"
+            f"{prefix_reuse_text}"
             # Timing in nanoseconds to seconds
             f"Model Load Time: {model_load_time / 1e9:.2f}<br>"
             f"Prompt Process Time: {prompt_processing_time / 1e9:.2f}<br>"
@@ -145,7 +179,9 @@ async def log_message(response: dict, sent_message, user_message: dict, full_his
     # Final Log Output
     # --------------------------------------------
 
-    output = (
+    return (
+        f"Time:    {record['timestamp']}  "
+        "\n"
         f"User Message ID:    {user_message['id']}  "
         "\n"
         f"User:    {user_message['name']}  "
@@ -154,18 +190,44 @@ async def log_message(response: dict, sent_message, user_message: dict, full_his
         "\n"
         f"{attachment_section}"
         f"{token_section}"
-        f"Message ID:    {sent_message.id}  "
-        f"{format_details('Thinking', thinking)}"
+        f"Message ID:    {record['message_id']}  "
+        f"{format_details('Thinking', record['thinking'])}"
         "\n"
-        f"{format_details('Response', sent_message.content)}"
+        f"{format_details('Response', record['response'])}"
         "\n"
         f"{format_details('Full History', full_chat_history)}"
         "\n"
         f"{format_details('Full Prompt', sys_prompt_string)}"
     )
 
-    # Write the formatted log file to disk.
-    path.write_text(output, encoding="utf-8")
 
-    # Record the logging event in the application logger.
-    logger.info(f"Logged: {sent_message.id}")
\ No newline at end of file
+log_writer = InteractionLogWriter(
+    os.getenv("INTERACTION_LOG_DIR", DEFAULT_LOG_DIR),
+    render=render_markdown if RENDER_MARKDOWN else None
+)
+
+
+def get_log_writer() -> InteractionLogWriter:
+    return log_writer
+
+
+async def log_message(response: dict, sent_message, user_message: dict, full_history) -> None:
+    """
+    Queue a message interaction for the interaction log.
+
+    Returns right away, the record is written to the daily JSONL
+    file (and Markdown file, if enabled) by the background log writer.
+    See build_record for the arguments.
+
+    Returns:
+        None
+    """
+    record = build_record(response, sent_message, user_message, full_history)
+
+    if log_writer.submit(record):
+        # Record the logging event in the application logger.
+        logger.info(f"Logged: {sent_message.id}")
+
+
+async def close_interaction_log():
+    await log_writer.close()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+from datetime import datetime
+from pathlib import Path
+
+from utility_scripts.system_logging import setup_logger
+
+# configure logging
+logger = setup_logger(__name__)
+
+DEFAULT_LOG_DIR = Path(__file__).resolve().parent / "logs"
+
+LOG_QUEUE_SIZE = 1000
+LOG_BATCH_SIZE = 64
+FSYNC_INTERVAL = 5.0
+
+
+class InteractionLogWriter:
+    """
+    Appends interaction records to one JSONL file per day from a background task.
+
+    - submit() never waits, records go into a bounded queue
+      and are dropped (and counted) when it is full
+    - the task writes whatever is queued in one batch, in a worker thread
+    - files are fsynced at most every fsync_interval seconds, and on close
+    - render, if given, turns a record into Markdown for a readable
+      daily .md file next to the JSONL
+    """
+
+    def __init__(self, directory, max_queue: int = LOG_QUEUE_SIZE, batch_size: int = LOG_BATCH_SIZE,
+                 fsync_interval: float = FSYNC_INTERVAL, render=None):
+        self.directory = Path(directory)
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.fsync_interval = fsync_interval
+        self.render = render
+
+        self._queue = None
+        self._task = None
+
+        # files of the current day, guarded since writes run in worker threads
+        self._lock = threading.Lock()
+        self._day = None
+        self._files = []
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+
+        self.written = 0
+        self.dropped = 0
+
+    def submit(self, record: dict) -> bool:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Interaction log queue full, dropped {self.dropped} records so far")
+            return False
+
+    async def _run(self):
+        while True:
+            try:
+                record = await asyncio.wait_for(self._queue.get(), timeout=self.fsync_interval)
+            except asyncio.TimeoutError:
+                # quiet period, make what was written durable
+                if self._dirty:
+                    try:
+                        await asyncio.to_thread(self._sync)
+                    except Exception as e:
+                        logger.error(f"Failed to sync interaction logs: {e}")
+                continue
+
+            batch = [record]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} interaction log records: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _open_files(self):
+        day = datetime.now().strftime("%Y-%m-%d")
+        if day == self._day:
+            return
+
+        self._close_files()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._files = [open(self.directory / f"interactions_{day}.jsonl", "a", encoding="utf-8")]
+        if self.render is not None:
+            self._files.append(open(self.directory / f"interactions_{day}.md", "a", encoding="utf-8"))
+        self._day = day
+
+    def _write_batch(self, batch: list):
+        with self._lock:
+            self._write_batch_locked(batch)
+
+    def _write_batch_locked(self, batch: list):
+        self._open_files()
+
+        jsonl = self._files[0]
+        jsonl.write("".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in batch))
+
+        if self.render is not None:
+            self._files[1].write("".join(self.render(record) + "\n\n---\n\n" for record in batch))
+
+        for file in self._files:
+            file.flush()
+        self._dirty = True
+        self.written += len(batch)
+
+        if time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self._sync_locked()
+
+    def _sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        for file in self._files:
+            os.fsync(file.fileno())
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+
+    def _close(self):
+        with self._lock:
+            self._close_files()
+
+    def _close_files(self):
+        if self._dirty:
+            self._sync_locked()
+        for file in self._files:
+            file.close()
+        self._files = []
+        self._day = None
+
+    async def _drain(self):
+        """
+        Writes what is left in the queue when the task is no longer running.
+        """
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if not batch:
+            return
+
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} interaction log records: {e}")
+
+    async def close(self):
+        """
+        Writes everything still queued, then syncs and closes the files.
+        """
+        if self._task is not None:
+            # wait for the queue, unless the task dies before emptying it
+            joined = asyncio.ensure_future(self._queue.join())
+            await asyncio.wait({joined, self._task}, return_when=asyncio.FIRST_COMPLETED)
+            joined.cancel()
+
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Interaction log task died: {e}")
+            self._task = None
+
+            await self._drain()
+
+        await asyncio.to_thread(self._close)
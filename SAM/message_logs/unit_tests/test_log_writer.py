@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+from types import SimpleNamespace
+
+from message_logs.log_message import build_record, render_markdown
+from message_logs.log_writer import InteractionLogWriter
+
+
+def make_record(message_id, history):
+    response = {
+        "prompt": {"role": "system", "content": "be nice"},
+        "message": SimpleNamespace(thinking="hmm"),
+        "file_txt": None,
+        "token_usage": {"prompt_tokens": 10, "tokens_generated": 5, "total_tokens": 15},
+    }
+    sent_message = SimpleNamespace(id=message_id, content=f"reply {message_id}")
+    user_message = {"id": message_id - 1, "name": "user", "content": "hello"}
+    return build_record(response, sent_message, user_message, history)
+
+
+def test_records_are_batched_into_one_jsonl_file(tmp_path):
+    writer = InteractionLogWriter(tmp_path, batch_size=8, fsync_interval=60, render=render_markdown)
+
+    async def main():
+        for message_id in range(1, 21):
+            assert writer.submit(make_record(message_id, []))
+        await writer.close()
+
+    asyncio.run(main())
+
+    jsonl = list(tmp_path.glob("*.jsonl"))
+    assert len(jsonl) == 1
+    records = [json.loads(line) for line in jsonl[0].read_text(encoding="utf-8").splitlines()]
+    assert [r["message_id"] for r in records] == list(range(1, 21))
+    assert writer.written == 20
+
+    markdown = next(tmp_path.glob("*.md")).read_text(encoding="utf-8")
+    assert markdown.count("<summary>Response</summary>") == 20
+    assert "Tokens in Prompt: 10" in markdown
+
+
+def test_full_queue_drops_instead_of_waiting(tmp_path):
+    writer = InteractionLogWriter(tmp_path, max_queue=2)
+
+    async def main():
+        results = [writer.submit(make_record(message_id, [])) for message_id in range(1, 5)]
+        await writer.close()
+        return results
+
+    assert asyncio.run(main()) == [True, True, False, False]
+    assert writer.dropped == 2
+
+
+def test_history_is_copied_when_the_record_is_built():
+    history = [{"role": "user", "content": "first"}]
+    record = make_record(1, history)
+    history.append({"role": "assistant", "content": "later"})
+
+    assert record["history"] == [{"role": "user", "content": "first"}]
+
+
+def test_failed_sync_keeps_the_task_alive(tmp_path, monkeypatch):
+    writer = InteractionLogWriter(tmp_path, fsync_interval=0.01)
+
+    def broken_sync():
+        raise OSError("disk gone")
+
+    monkeypatch.setattr(writer, "_sync", broken_sync)
+
+    async def main():
+        writer.submit(make_record(1, []))
+        await asyncio.sleep(0.05)
+        alive = not writer._task.done()
+        writer.submit(make_record(2, []))
+        await writer.close()
+        return alive
+
+    assert asyncio.run(main())
+    assert writer.written == 2
+
+
+def test_close_writes_the_queue_when_the_task_died(tmp_path):
+    writer = InteractionLogWriter(tmp_path, fsync_interval=60)
+
+    async def dead():
+        raise RuntimeError("boom")
+
+    async def main():
+        writer.submit(make_record(1, []))
+        writer._task.cancel()
+        writer._task = asyncio.get_running_loop().create_task(dead())
+        writer.submit(make_record(2, []))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(writer.close(), timeout=2)
+
+    asyncio.run(main())
+
+    records = [json.loads(line) for line in next(tmp_path.glob("*.jsonl")).read_text(encoding="utf-8").splitlines()]
+    assert [r["message_id"] for r in records] == [1, 2]
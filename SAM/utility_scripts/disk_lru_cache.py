@@ -0,0 +1,133 @@
+import hashlib
+import os
+import threading
+
+from collections import OrderedDict
+from pathlib import Path
+
+from utility_scripts.system_logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class DiskLRUCache:
+    """
+    Size-bounded cache of byte blobs in a directory.
+
+    - Each entry is one file named by the sha256 of its key
+    - Recency is the file's mtime, so the LRU order survives restarts
+    - Past max_bytes the least recently used files are deleted
+    - Writes go through a temp file and a rename, readers never see half a file
+
+    Blocking file I/O, call it from a worker thread on the event loop.
+    """
+
+    def __init__(self, directory, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # file name -> size, least recently used first
+        self._index = None
+        self._total = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _entries(self) -> OrderedDict:
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            files = []
+            for path in self.directory.iterdir():
+                if path.suffix == ".tmp":
+                    path.unlink(missing_ok=True)  # left over from a crash mid-write
+                    continue
+                stat = path.stat()
+                files.append((stat.st_mtime, path.name, stat.st_size))
+
+            self._index = OrderedDict((name, size) for _, name, size in sorted(files))
+            self._total = sum(self._index.values())
+            logger.info(f"Disk cache {self.directory}: {len(self._index)} entries, {self._total} bytes")
+
+        return self._index
+
+    def get(self, key: str) -> bytes | None:
+        name = self._name(key)
+        path = self.directory / name
+
+        with self._lock:
+            entries = self._entries()
+            if name not in entries:
+                self.misses += 1
+                return None
+
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except FileNotFoundError:
+                self._total -= entries.pop(name)
+                self.misses += 1
+                return None
+
+            entries.move_to_end(name)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+
+        name = self._name(key)
+        path = self.directory / name
+        temp_path = path.with_suffix(".tmp")
+
+        with self._lock:
+            entries = self._entries()
+
+            temp_path.write_bytes(data)
+            os.replace(temp_path, path)
+
+            self._total += len(data) - entries.pop(name, 0)
+            entries[name] = len(data)
+
+            while self._total > self.max_bytes:
+                oldest, size = entries.popitem(last=False)
+                (self.directory / oldest).unlink(missing_ok=True)
+                self._total -= size
+                self.evictions += 1
+
+    def discard(self, key: str):
+        name = self._name(key)
+        with self._lock:
+            entries = self._entries()
+            if name in entries:
+                self._total -= entries.pop(name)
+                (self.directory / name).unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        with self._lock:
+            entries = self._entries()
+            count = len(entries)
+            for name in entries:
+                (self.directory / name).unlink(missing_ok=True)
+            entries.clear()
+            self._total = 0
+            return count
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._entries()
+            return {
+                "entries": len(entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,46 @@
+import os
+
+from utility_scripts.disk_lru_cache import DiskLRUCache
+
+
+def test_round_trip_and_miss(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=100)
+    cache.put("a", b"hello")
+
+    assert cache.get("a") == b"hello"
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_is_evicted_past_max_bytes(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=25)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"x" * 10)
+    cache.get("a")
+    cache.put("c", b"x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["bytes"] == 20
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_oversized_entries_are_not_stored(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=5)
+    cache.put("a", b"x" * 10)
+    assert cache.get("a") is None
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=100)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"y" * 10)
+    (tmp_path / "half_written.tmp").write_bytes(b"junk")
+
+    reopened = DiskLRUCache(tmp_path, max_bytes=100)
+    assert reopened.stats()["entries"] == 2
+    assert reopened.stats()["bytes"] == 20
+    assert reopened.get("b") == b"y" * 10
+    assert not (tmp_path / "half_written.tmp").exists()